@@ -2,6 +2,14 @@ import pygame
 
 import pygame
 from camera import Camera
+from cycles import CycleDetector
+from engines import make_engine
+from grid import Grid, line_cells
+from history import History
+from profiler import Profiler, PHASES
+from render import GridRenderer, DirtyTracker
+from scheduler import Scheduler
+from world import World
 
 class Button:
     """
@@ -40,158 +48,70 @@ class Button:
         Utile pour détecter les clics.
         """
         return self.rect.collidepoint(pos)
-    
-class Grid:
-    """
-    Classe qui gère la grille du Jeu de la vie de Conway.
-    Chaque cellule peut être vivante (1) ou morte (0).
-    """
-
-    def __init__(self, rows, cols):
-        """
-        Initialise la grille avec le nombre de lignes et de colonnes donné.
-        Toutes les cellules sont mortes au départ.
-        """
-        self.rows = rows
-        self.cols = cols
-        self.reset()  # Crée la grille vide
-
-    def reset(self):
-        """
-        Remet toutes les cellules à zéro (mortes).
-        """
-        self.cells = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-
-    def randomize(self, prob=0.2):
-        """
-        Remplit la grille avec des cellules vivantes aléatoirement.
-        prob : probabilité qu'une cellule soit vivante (entre 0 et 1).
-        """
-        from random import random
-        self.cells = [[1 if random() < prob else 0 for _ in range(self.cols)] for _ in range(self.rows)]
-
-    def count_neighbors(self, r, c):
-        """
-        Compte le nombre de cellules vivantes autour de la cellule (r, c).
-        Les voisins sont les 8 cellules autour (haut, bas, gauche, droite, diagonales).
-        """
-        count = 0
-        for i in range(r-1, r+2):      # Parcourt les lignes voisines
-            for j in range(c-1, c+2):  # Parcourt les colonnes voisines
-                # Ignore la cellule centrale et les indices hors grille
-                if (i == r and j == c) or i < 0 or j < 0 or i >= self.rows or j >= self.cols:
-                    continue
-                count += self.cells[i][j]  # Ajoute 1 si la cellule est vivante
-        return count
-
-    def next_generation(self):
-        """
-        Calcule la prochaine génération selon les règles du Jeu de la vie :
-        - Une cellule vivante avec 2 ou 3 voisins survit.
-        - Une cellule morte avec exactement 3 voisins devient vivante.
-        - Sinon, la cellule meurt ou reste morte.
-        """
-        new = [[0] * self.cols for _ in range(self.rows)]  # Nouvelle grille
-        for r in range(self.rows):
-            for c in range(self.cols):
-                n = self.count_neighbors(r, c)
-                if self.cells[r][c] == 1 and n in (2, 3):
-                    new[r][c] = 1  # Survie
-                elif self.cells[r][c] == 0 and n == 3:
-                    new[r][c] = 1  # Naissance
-                # Sinon, reste morte (0)
-        self.cells = new  # Met à jour la grille
-
-    def toggle(self, r, c, value=None):
-        """
-        Change l'état d'une cellule (vivante/morte).
-        - Si value est None : inverse l'état (vivant <-> mort).
-        - Si value vaut 0 ou 1 : force la cellule à cette valeur.
-        """
-        if 0 <= r < self.rows and 0 <= c < self.cols:
-            if value is None:
-                self.cells[r][c] = 1 - self.cells[r][c]
-            else:
-                self.cells[r][c] = value
-
-class Camera:
-    """
-    La classe Camera permet de "déplacer" la vue sur une grande grille.
-    Elle gère le zoom (taille des cellules) et le déplacement (x, y) de la fenêtre d'affichage.
-    """
-    def __init__(self, world_width, world_height, view_width, view_height, cell_size):
-        """
-        Initialise la caméra.
-        - world_width, world_height : dimensions de la grille (en nombre de cellules)
-        - view_width, view_height : dimensions de la fenêtre d'affichage (en pixels)
-        - cell_size : taille d'une cellule (en pixels)
-        """
-        self.world_width = world_width
-        self.world_height = world_height
-        self.view_width = view_width
-        self.view_height = view_height
-        self.cell_size = cell_size
-        self.x = 0
-        self.y = 0
-
-    def move(self, dx, dy):
-        """
-        Déplace la caméra de dx pixels horizontalement et dy pixels verticalement.
-        Empêche la caméra de sortir des limites de la grille.
-        """
-        self.x = min(max(self.x + dx, 0), self.world_width * self.cell_size - self.view_width)
-        self.y = min(max(self.y + dy, 0), self.world_height * self.cell_size - self.view_height)
-
-    def apply(self, col, row):
-        """
-        Convertit les coordonnées (colonne, ligne) d'une cellule en coordonnées (x, y) à l'écran,
-        en tenant compte du zoom et du déplacement de la caméra.
-        Retourne les coordonnées en pixels pour dessiner la cellule.
-        """
-        px = col * self.cell_size - self.x
-        py = row * self.cell_size - self.y
-        return px, py
-    
 
 
 # --- Paramètres de la fenêtre et de la grille ---
 CELL_SIZE = 20      # Taille d'une cellule en pixels
 COLS = 100          # Nombre de colonnes dans la grille
 ROWS = 100          # Nombre de lignes dans la grille
+UNBOUNDED = True    # Monde sans bords (ROWS et COLS ne servent alors pas)
+MIN_CELL_SIZE = 2 ** -12  # Zoom arrière maximal : 1 pixel pour 4096 x 4096 cellules
 WIDTH = 800         # Largeur de la fenêtre d'affichage
 HEIGHT = 600        # Hauteur de la fenêtre d'affichage
 BUTTON_PANEL_HEIGHT = 50  # Hauteur de la zone des boutons
 SCREEN_HEIGHT = HEIGHT + BUTTON_PANEL_HEIGHT  # Hauteur totale
+ENGINE = "numpy"    # Moteur de calcul des générations ("python" ou "numpy")
+RULE = "B3/S23"     # Règle de l'automate (Conway) ; ex : "B36/S23" = HighLife
+JUMP_GENERATIONS = 1 << 20  # Nombre de générations sautées par le bouton Jump
+FPS = 60            # Nombre d'images par seconde visé
+SPEED = 10          # Nombre de générations par seconde au démarrage
+STATS_X = 720       # Position horizontale des mesures (gen/s, durée d'image) dans la zone des boutons
+AUTO_PAUSE = True   # Mettre en pause quand la grille est vide, stable ou oscille
+MAX_PERIOD = 64     # Période maximale des oscillateurs détectés
+PROFILE_FILE = None # Fichier .csv ou .jsonl où enregistrer la durée des phases de chaque image
+PROFILE_RECT = pygame.Rect(0, 0, 260, 14 * (len(PHASES) + 2) + 8)  # Zone des mesures par phase (touche F3)
 
 # --- Variables globales de simulation ---
 running = False     # Indique si la simulation est en cours
 step_flag = False   # Indique si on doit avancer d'une génération
-grid_obj = Grid(ROWS, COLS)  # La grille du jeu
+grid_obj = World(RULE) if UNBOUNDED else Grid(ROWS, COLS, ENGINE, RULE)  # La grille du jeu
 
-def bresenham_line(x0, y0, x1, y1):
+def in_world(row, col):
     """
-    Algorithme de Bresenham pour dessiner une ligne entre deux points sur une grille.
-    Retourne la liste des coordonnées (row, col) de toutes les cellules traversées.
-    Utile pour dessiner en glissant la souris rapidement.
+    Vérifie si la cellule (row, col) existe : toujours vrai dans un monde sans bords.
     """
-    points = []
-    delta_x = abs(x1 - x0)
-    delta_y = abs(y1 - y0)
-    step_x = 1 if x0 < x1 else -1
-    step_y = 1 if y0 < y1 else -1
-    error = delta_x - delta_y
-    while True:
-        points.append((y0, x0))
-        if x0 == x1 and y0 == y1:
-            break
-        error2 = 2 * error
-        if error2 > -delta_y:
-            error -= delta_y
-            x0 += step_x
-        if error2 < delta_x:
-            error += delta_x
-            y0 += step_y
-    return points
+    return not grid_obj.bounded or (0 <= row < ROWS and 0 <= col < COLS)
+
+def draw_stats(surface, font, sched):
+    """
+    Affiche la vitesse visée, la vitesse mesurée et la durée d'une image dans la zone des boutons.
+    Retourne le rectangle de l'écran qui a été redessiné.
+    """
+    rect = pygame.Rect(STATS_X, HEIGHT, WIDTH - STATS_X, BUTTON_PANEL_HEIGHT)
+    surface.fill((0, 0, 0), rect)
+    lines = [f"cible {sched.speed}/s",
+             f"{sched.measured_speed:.0f} gen/s",
+             f"{sched.frame_time * 1000:.1f} ms"]
+    for i, line in enumerate(lines):
+        surface.blit(font.render(line, True, (255, 255, 255)), (rect.x, rect.y + 4 + i * 14))
+    return rect
+
+def draw_profile(surface, font, prof):
+    """
+    Affiche la durée de chaque phase d'une image (médiane, 95e centile, maximum)
+    en haut à gauche de la grille. Retourne le rectangle de l'écran qui a été redessiné.
+    """
+    surface.fill((40, 40, 40), PROFILE_RECT)
+    values = prof.percentiles((50, 95, 100))
+    rows = [("ms", "p50", "p95", "max")]
+    for name in (*PHASES, "total"):
+        if name in values:
+            rows.append((name, *(f"{v:.2f}" for v in values[name])))
+    for i, row in enumerate(rows):
+        # Une colonne par valeur, à position fixe (la police n'est pas à chasse fixe)
+        for x, text in zip((4, 80, 140, 200), row):
+            surface.blit(font.render(text, True, (255, 255, 0)), (PROFILE_RECT.x + x, PROFILE_RECT.y + 4 + i * 14))
+    return PROFILE_RECT
 
 def game_loop():
     """
@@ -205,10 +125,23 @@ def game_loop():
     screen = pygame.display.set_mode((WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Jeu de la vie")
     clock = pygame.time.Clock()
+    jumper = make_engine("hashlife", rule=RULE)  # Moteur HashLife gardé pour réutiliser son cache
 
     # Caméra pour déplacer et zoomer sur la grille
-    cam = Camera(COLS, ROWS, WIDTH, HEIGHT, CELL_SIZE)
+    if UNBOUNDED:
+        cam = Camera(None, None, WIDTH, HEIGHT, CELL_SIZE)
+    else:
+        cam = Camera(COLS, ROWS, WIDTH, HEIGHT, CELL_SIZE)
     cell_size = CELL_SIZE
+    renderer = GridRenderer()  # Affichage de la partie visible de la grille
+    tracker = DirtyTracker(grid_obj)  # Zones de l'écran à redessiner
+    sched = Scheduler(FPS, SPEED)     # Rythme des images et des générations
+    stats_dirty = True                # Les mesures affichées doivent être redessinées
+    detector = CycleDetector(grid_obj, MAX_PERIOD)  # Détection des fins de partie
+    history = History(grid_obj)       # Retour en arrière et annulation
+    cycle_seen = None                 # Génération du dernier cycle signalé
+    prof = Profiler(path=PROFILE_FILE)  # Durée de chaque phase d'une image
+    overlay = False                   # Affichage des durées par phase (touche F3)
 
     # Variables pour le dessin en glissé
     drawing = False      # True si on est en train de dessiner avec la souris
@@ -218,18 +151,27 @@ def game_loop():
     # Préparer la police et les boutons
     font = pygame.font.SysFont(None, 24)
     btn_w, btn_h, spacing = 80, 30, 10
-    names = ['Start', 'Stop', 'Step', 'Randomize', 'Clear', 'Quit']
+    names = ['Start', 'Stop', 'Step', 'Jump', 'Randomize', 'Clear', 'Quit']
     buttons = {}
     for i, name in enumerate(names):
         x = spacing + i * (btn_w + spacing)
         y = HEIGHT + 10
         rect = pygame.Rect(x, y, btn_w, btn_h)
         buttons[name] = Button(rect, name, font)
+    # Boutons de réglage de la vitesse, plus petits
+    x = spacing + len(names) * (btn_w + spacing)
+    for name in ['-', '+']:
+        buttons[name] = Button(pygame.Rect(x, HEIGHT + 10, btn_h, btn_h), name, font)
+        x += btn_h + spacing
+    small_font = pygame.font.SysFont(None, 18)
 
     while True:
+        sched.start_frame()
+        prof.start_frame()
         # --- Gestion des événements clavier/souris ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                prof.close()
                 pygame.quit()
                 return
 
@@ -240,17 +182,53 @@ def game_loop():
 
             # Gestion des touches clavier
             elif event.type == pygame.KEYDOWN:
+                history.begin_stroke()     # Chaque action s'annule séparément
                 if event.key == pygame.K_ESCAPE:
+                    prof.close()
                     pygame.quit()
                     return
                 elif event.key == pygame.K_SPACE:
                     running = not running  # Pause ou reprise
                 elif event.key == pygame.K_RETURN:
                     step_flag = True       # Avancer d'une génération
+                elif event.key == pygame.K_BACKSPACE:
+                    running = False
+                    history.step_back()    # Reculer d'une génération
+                elif event.key == pygame.K_z:
+                    running = False
+                    history.undo()         # Annuler le dernier trait (ou la dernière génération)
+                elif event.key == pygame.K_y:
+                    history.redo()         # Rétablir ce qui a été annulé
+                elif event.key == pygame.K_h:
+                    # Centrer la caméra sur les cellules vivantes
+                    box = grid_obj.bounding_box()
+                    if box is not None:
+                        top, left, bottom, right = box
+                        cam.x = (left + right) / 2 * cell_size - WIDTH / 2
+                        cam.y = (top + bottom) / 2 * cell_size - HEIGHT / 2
+                        cam.clamp()
+                elif event.key == pygame.K_f:
+                    # Zoomer pour voir toute la grille (ou toutes les cellules vivantes d'un monde sans bords)
+                    box = (0, 0, ROWS, COLS) if grid_obj.bounded else grid_obj.bounding_box()
+                    if box is not None:
+                        cell_size = cam.fit(*box, min_size=MIN_CELL_SIZE)
+                elif event.key == pygame.K_F3:
+                    overlay = not overlay  # Afficher ou cacher les durées par phase
+                    prof.enable(overlay or PROFILE_FILE is not None)
+                    stats_dirty = True
+                    tracker.invalidate()
+                elif event.key == pygame.K_j:
+                    grid_obj.advance(JUMP_GENERATIONS, jumper)  # Sauter de nombreuses générations
                 elif event.key == pygame.K_r:
                     grid_obj.randomize()   # Remplir la grille aléatoirement
                 elif event.key == pygame.K_c:
                     grid_obj.reset()       # Vider la grille
+                elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS):
+                    sched.faster()         # Accélérer la simulation
+                    stats_dirty = True
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    sched.slower()         # Ralentir la simulation
+                    stats_dirty = True
 
             # Zoom avec la molette de la souris
             elif event.type == pygame.MOUSEWHEEL:
@@ -265,34 +243,34 @@ def game_loop():
                 world_cx = (cam.x + center_x) / old_size
                 world_cy = (cam.y + center_y) / old_size
                 
-                # Ajuster la taille des cellules
+                # Ajuster la taille des cellules : de 2 en 2 pixels, puis de moitié en moitié
+                # en dessous de 2 pixels (vue dézoomée, un pixel par bloc de cellules)
                 if event.y > 0:
-                    cell_size = min(cell_size + 2, 200)
+                    cell_size = min(cell_size + 2, 200) if cell_size >= 2 else cell_size * 2
                 elif event.y < 0:
-                    min_size = max(WIDTH // COLS, HEIGHT // ROWS)
-                    cell_size = max(cell_size - 2, min_size)
-                    
+                    cell_size = cell_size - 2 if cell_size > 2 else max(cell_size / 2, MIN_CELL_SIZE)
+
                 cam.cell_size = cell_size  # Mettre à jour la caméra
                 # Recentrer la caméra pour garder le même centre
                 cam.x = world_cx * cell_size - center_x
                 cam.y = world_cy * cell_size - center_y
                 # Empêcher la caméra de sortir des limites
-                cam.x = min(max(cam.x, 0), COLS * cell_size - WIDTH)
-                cam.y = min(max(cam.y, 0), ROWS * cell_size - HEIGHT)
+                cam.clamp()
 
             # Clic souris : soit dessiner une cellule, soit cliquer un bouton
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                history.begin_stroke()  # Un trait de souris s'annule d'un coup
                 x, y = event.pos
                 if y < HEIGHT:
                     # Clic sur la grille : début du dessin
                     col = int((x + cam.x) // cell_size)
                     row = int((y + cam.y) // cell_size)
                     
-                    if 0 <= row < ROWS and 0 <= col < COLS:
+                    if in_world(row, col):
                         drawing = True
                         
                         # On choisit la couleur selon la cellule cliquée
-                        draw_value = 1 if grid_obj.cells[row][col] == 0 else 0
+                        draw_value = 1 if grid_obj.get(row, col) == 0 else 0
                         grid_obj.toggle(row, col, draw_value)
                         last_cell = (row, col)
                 else:
@@ -302,9 +280,14 @@ def game_loop():
                             if name == 'Start': running = True
                             elif name == 'Stop': running = False
                             elif name == 'Step': step_flag = True
+                            elif name == 'Jump': grid_obj.advance(JUMP_GENERATIONS, jumper)
                             elif name == 'Randomize': grid_obj.randomize()
                             elif name == 'Clear': grid_obj.reset()
-                            elif name == 'Quit': pygame.quit(); return
+                            elif name == 'Quit': prof.close(); pygame.quit(); return
+                            elif name == '+': sched.faster(); stats_dirty = True
+                            elif name == '-': sched.slower(); stats_dirty = True
+
+        prof.mark("events")
 
         # --- Dessin en glissé (maintenir le bouton souris) ---
         if drawing:
@@ -313,48 +296,92 @@ def game_loop():
                 c = int((mx + cam.x) // cell_size)
                 r = int((my + cam.y) // cell_size)
                 
-                if 0 <= r < ROWS and 0 <= c < COLS:
-                    # Tracer une ligne entre la dernière cellule et la nouvelle
-                    if last_cell is not None:
+                if in_world(r, c):
+                    # Tracer une ligne entre la dernière cellule et la nouvelle, en une seule opération
+                    if last_cell is not None and last_cell != (r, c):
                         r0, c0 = last_cell
-                        for rr, cc in bresenham_line(c0, r0, c, r):
-                            grid_obj.toggle(rr, cc, draw_value)
-                            last_cell = (rr, cc)
+                        grid_obj.paint(*line_cells(r0, c0, r, c), draw_value)
                     
                     # Mettre à jour la dernière cellule
                     last_cell = (r, c)
 
+        prof.mark("paint")
+
         # --- Simulation du jeu de la vie ---
         if step_flag:
             grid_obj.next_generation()  # Avancer d'une génération
             step_flag = False
-        if running:
-            grid_obj.next_generation()  # Avancer automatiquement
-
-        # --- Affichage ---
-        screen.fill((0, 0, 0))  # Fond noir
+        # Avancer automatiquement : autant de générations que la vitesse et le temps le permettent
+        done = sched.run(grid_obj, running)
+
+        # Fin de partie (grille vide, stable ou qui oscille) : pause automatique, une seule fois
+        if detector.since != cycle_seen:
+            cycle_seen = detector.since
+            if detector.found is None:
+                pygame.display.set_caption("Jeu de la vie")
+            else:
+                if AUTO_PAUSE:
+                    running = False
+                names = {"extinction": "grille vide", "still": "figure stable", "oscillator": "oscillateur"}
+                caption = f"Jeu de la vie - {names[detector.found[0]]}"
+                if detector.found[0] == "oscillator":
+                    caption += f" de période {detector.period}"
+                pygame.display.set_caption(f"{caption} (génération {cycle_seen})")
 
-        # Dessiner la grille (uniquement les cellules vivantes)
-        for r in range(ROWS):
-            for c in range(COLS):
-                if grid_obj.cells[r][c] == 1:
-                    px, py = cam.apply(c, r)
-                    # On ne dessine que si la cellule est visible à l'écran
-                    if 0 <= px < WIDTH and 0 <= py < HEIGHT:
-                        pygame.draw.rect(screen, (0,255,0),(px,py,cell_size-1,cell_size-1))
+        prof.mark("step")
 
-        # Dessiner les boutons
-        for btn in buttons.values():
-            btn.draw(screen)
+        # --- Affichage ---
+        # On ne redessine que les zones qui ont changé (ou tout l'écran si nécessaire)
+        rects = tracker.collect(grid_obj, cam)
+        if rects is None:
+            screen.fill((0, 0, 0))  # Fond noir
+
+            # Dessiner la partie visible de la grille
+            renderer.draw(screen, grid_obj, cam)
+            prof.mark("draw")
+
+            # Dessiner les boutons et les mesures
+            for btn in buttons.values():
+                btn.draw(screen)
+            draw_stats(screen, small_font, sched)
+        else:
+            if rects:
+                for rect in rects:
+                    screen.fill((0, 0, 0), rect)
+                renderer.draw(screen, grid_obj, cam, rects)
+            prof.mark("draw")
+            if stats_dirty:
+                rects.append(draw_stats(screen, small_font, sched))
+        # Durées par phase par-dessus la grille, mises à jour avec les mesures ou si la grille dessous a changé
+        if overlay and (rects is None or stats_dirty or PROFILE_RECT.collidelist(rects) >= 0):
+            if rects is not None:
+                screen.fill((0, 0, 0), PROFILE_RECT)
+                renderer.draw(screen, grid_obj, cam, [PROFILE_RECT])
+                rects.append(PROFILE_RECT)
+            draw_profile(screen, small_font, prof)
+        stats_dirty = False
+        prof.mark("ui")
 
         # Déplacement continu de la caméra avec les flèches du clavier
         keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]: cam.move(-cell_size,0)
-        if keys[pygame.K_RIGHT]: cam.move(cell_size,0)
-        if keys[pygame.K_UP]: cam.move(0,-cell_size)
-        if keys[pygame.K_DOWN]: cam.move(0,cell_size)
-
-        pygame.display.flip()  # Mettre à jour l'affichage
+        pan = max(cell_size, 8)  # Au moins 8 pixels par image, même très dézoomé
+        if keys[pygame.K_LEFT]: cam.move(-pan,0)
+        if keys[pygame.K_RIGHT]: cam.move(pan,0)
+        if keys[pygame.K_UP]: cam.move(0,-pan)
+        if keys[pygame.K_DOWN]: cam.move(0,pan)
+
+        # Mettre à jour l'affichage : tout l'écran, ou seulement les zones redessinées
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        prof.mark("display")
+
+        # Attendre la prochaine image pour respecter FPS (sans occuper le processeur)
+        if sched.end_frame(clock):
+            stats_dirty = True
+        prof.mark("wait")
+        prof.end_frame(generations=done)
 
 if __name__ == "__main__":
     game_loop()
\ No newline at end of file
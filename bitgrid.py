@@ -0,0 +1,181 @@
+import numpy as np
+
+from rules import parse_rule
+from soups import make_rng, random_cells
+
+WORD_BITS = 64                      # Nombre de cellules stockées dans un mot machine
+WORD = np.dtype('<u8')              # Mot de 64 bits, octets en ordre petit-boutiste
+ONE = np.uint64(1)
+LAST_BIT = np.uint64(WORD_BITS - 1)
+BAND_CELLS = 1 << 20                # Nombre de cellules tirées d'un coup par randomize
+
+
+def half_adder(a, b):
+    """
+    Additionne deux plans de bits.
+    Retourne (somme, retenue).
+    """
+    return a ^ b, a & b
+
+
+def full_adder(a, b, c):
+    """
+    Additionne trois plans de bits.
+    Retourne (somme, retenue).
+    """
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+
+class BitGrid:
+    """
+    Grille du Jeu de la vie compacte : une cellule = un bit.
+    Chaque ligne est stockée dans des mots de 64 bits (la colonne c est le bit c % 64
+    du mot c // 64), soit 64 fois moins de mémoire qu'une liste d'entiers.
+    Le calcul d'une génération traite 64 cellules à la fois grâce à des additionneurs
+    bit à bit (demi-additionneurs et additionneurs complets) appliqués à des mots entiers.
+    Même interface que Grid : reset, randomize, toggle, next_generation.
+    """
+
+    def __init__(self, rows, cols, rule="B3/S23"):
+        """
+        Initialise la grille avec le nombre de lignes et de colonnes donné.
+        Toutes les cellules sont mortes au départ.
+        rule : règle de l'automate, en notation B/S ou par son nom.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.rule = parse_rule(rule)
+        self.nwords = (cols + WORD_BITS - 1) // WORD_BITS  # Nombre de mots par ligne
+        # Masque du dernier mot : les bits au-delà de la dernière colonne restent à 0
+        spare = self.nwords * WORD_BITS - cols
+        self.last_mask = np.uint64((1 << (WORD_BITS - spare)) - 1)
+        self.reset()
+
+    def reset(self):
+        """
+        Remet toutes les cellules à zéro (mortes).
+        """
+        self.words = np.zeros((self.rows, self.nwords), dtype=WORD)
+
+    def load(self, array):
+        """
+        Remplit la grille à partir d'un tableau 2D de 0/1 (liste de listes ou tableau NumPy).
+        """
+        bits = np.asarray(array, dtype=np.uint8).reshape(self.rows, self.cols)
+        packed = np.packbits(bits, axis=1, bitorder='little')  # 8 cellules par octet
+        padded = np.zeros((self.rows, self.nwords * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        self.words = padded.view(WORD)
+
+    def to_array(self):
+        """
+        Retourne la grille décompressée sous forme de tableau NumPy uint8 (rows x cols).
+        """
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :self.cols]
+
+    def randomize(self, prob=0.2, seed=None):
+        """
+        Remplit la grille avec des cellules vivantes aléatoirement.
+        - prob : probabilité qu'une cellule soit vivante (entre 0 et 1),
+          ou profil de densité (voir soups.linear_gradient, soups.radial_gradient)
+        - seed : graine ou générateur NumPy ; la même graine redonne la même grille
+        Les cellules sont tirées et compressées bande de lignes par bande de lignes
+        (voir soups.random_cells) : la mémoire utilisée ne dépend pas de la taille de la grille.
+        """
+        rng = make_rng(seed)
+        words = np.zeros((self.rows, self.nwords), dtype=WORD)
+        packed = words.view(np.uint8)
+        band = max(BAND_CELLS // max(self.cols, 1), 1)
+        for start in range(0, self.rows, band):
+            end = min(start + band, self.rows)
+            density = prob[start:end] if np.ndim(prob) == 2 and np.shape(prob)[0] > 1 else prob
+            bits = np.packbits(random_cells(end - start, self.cols, density, rng), axis=1, bitorder='little')
+            packed[start:end, :bits.shape[1]] = bits
+        self.words = words
+
+    def get(self, r, c):
+        """
+        Retourne l'état (0 ou 1) de la cellule (r, c).
+        """
+        return int(self.words[r, c // WORD_BITS] >> np.uint64(c % WORD_BITS)) & 1
+
+    def toggle(self, r, c, value=None):
+        """
+        Change l'état d'une cellule (vivante/morte).
+        - Si value est None : inverse l'état (vivant <-> mort).
+        - Si value vaut 0 ou 1 : force la cellule à cette valeur.
+        """
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            w = c // WORD_BITS
+            bit = ONE << np.uint64(c % WORD_BITS)
+            if value is None:
+                self.words[r, w] ^= bit
+            elif value:
+                self.words[r, w] |= bit
+            else:
+                self.words[r, w] &= ~bit
+
+    def _shift_west(self, x):
+        """
+        Décale les lignes d'une colonne vers la droite : chaque bit reçoit son voisin de gauche.
+        Le bit sortant de chaque mot passe dans le mot suivant.
+        """
+        out = x << ONE
+        out[:, 1:] |= x[:, :-1] >> LAST_BIT
+        return out
+
+    def _shift_east(self, x):
+        """
+        Décale les lignes d'une colonne vers la gauche : chaque bit reçoit son voisin de droite.
+        """
+        out = x >> ONE
+        out[:, :-1] |= x[:, 1:] << LAST_BIT
+        return out
+
+    def _equals(self, planes, n):
+        """
+        Retourne le masque des cellules dont le nombre de voisins vaut n,
+        à partir des 4 plans de bits du nombre de voisins.
+        """
+        mask = None
+        for bit, plane in enumerate(planes):
+            term = plane if (n >> bit) & 1 else ~plane
+            mask = term if mask is None else mask & term
+        return mask
+
+    def next_generation(self):
+        """
+        Calcule la prochaine génération selon les règles du Jeu de la vie.
+        Les 8 voisins sont additionnés mot par mot avec des additionneurs bit à bit,
+        ce qui donne le nombre de voisins sous forme de 4 plans de bits (1, 2, 4, 8),
+        puis la règle est appliquée avec des opérations bit à bit sur ces plans.
+        """
+        x = self.words
+        # Lignes voisines du dessus et du dessous (bords morts)
+        north = np.zeros_like(x)
+        north[1:] = x[:-1]
+        south = np.zeros_like(x)
+        south[:-1] = x[1:]
+
+        # Additionneurs : 8 entrées -> plans de bits ones, twos, fours, eights
+        s1, c1 = full_adder(self._shift_west(north), north, self._shift_east(north))
+        s2, c2 = full_adder(self._shift_west(south), south, self._shift_east(south))
+        s3, c3 = half_adder(self._shift_west(x), self._shift_east(x))
+        ones, c4 = full_adder(s1, s2, s3)
+        t, c5 = full_adder(c1, c2, c3)
+        twos, c6 = half_adder(t, c4)
+        fours, eights = half_adder(c5, c6)
+
+        # Pour chaque nombre de voisins de la règle : naissance (cellule morte) ou survie (vivante)
+        planes = (ones, twos, fours, eights)
+        born = np.zeros_like(x)
+        for n in self.rule.births:
+            born |= self._equals(planes, n)
+        survive = np.zeros_like(x)
+        for n in self.rule.survivals:
+            survive |= self._equals(planes, n)
+        new = (born & ~x) | (survive & x)
+        new[:, -1] &= self.last_mask  # Efface les bits hors de la grille
+        self.words = new
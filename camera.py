@@ -1,3 +1,6 @@
+import math
+
+
 class Camera:
     """
     La classe Camera permet de "déplacer" la vue sur une grande grille.
@@ -6,7 +9,8 @@ class Camera:
     def __init__(self, world_width, world_height, view_width, view_height, cell_size):
         """
         Initialise la caméra.
-        - world_width, world_height : dimensions de la grille (en nombre de cellules)
+        - world_width, world_height : dimensions de la grille (en nombre de cellules),
+          None pour un monde sans bords (la caméra se déplace alors librement)
         - view_width, view_height : dimensions de la fenêtre d'affichage (en pixels)
         - cell_size : taille d'une cellule (en pixels)
         """
@@ -21,10 +25,42 @@ class Camera:
     def move(self, dx, dy):
         """
         Déplace la caméra de dx pixels horizontalement et dy pixels verticalement.
-        Empêche la caméra de sortir des limites de la grille.
+        Empêche la caméra de sortir des limites de la grille (s'il y en a).
+        """
+        self.x += dx
+        self.y += dy
+        self.clamp()
+
+    def clamp(self):
+        """
+        Ramène la caméra dans les limites de la grille. Sans effet pour un monde sans bords.
+        Une grille plus petite que la vue (zoom arrière) est centrée.
+        """
+        if self.world_width is not None:
+            extra = self.world_width * self.cell_size - self.view_width
+            self.x = min(max(self.x, 0), extra) if extra >= 0 else extra / 2
+        if self.world_height is not None:
+            extra = self.world_height * self.cell_size - self.view_height
+            self.y = min(max(self.y, 0), extra) if extra >= 0 else extra / 2
+
+    def fit(self, top, left, bottom, right, min_size=2 ** -16, max_size=200):
+        """
+        Choisit le zoom et la position pour voir en entier la zone de cellules
+        [top, bottom) x [left, right), centrée.
+        Au-dessus de 1 pixel par cellule, la taille est entière ; en dessous,
+        c'est une puissance de 2 (1/2, 1/4...) pour que chaque pixel couvre un bloc entier.
+        Retourne la nouvelle taille des cellules.
         """
-        self.x = min(max(self.x + dx, 0), self.world_width * self.cell_size - self.view_width)
-        self.y = min(max(self.y + dy, 0), self.world_height * self.cell_size - self.view_height)
+        size = min(self.view_width / max(right - left, 1), self.view_height / max(bottom - top, 1))
+        if size >= 1:
+            size = min(int(size), max_size)
+        else:
+            size = max(2.0 ** math.floor(math.log2(size)), min_size)
+        self.cell_size = size
+        self.x = (left + right) / 2 * size - self.view_width / 2
+        self.y = (top + bottom) / 2 * size - self.view_height / 2
+        self.clamp()
+        return size
 
     def apply(self, col, row):
         """
@@ -0,0 +1,274 @@
+"""
+Recensement des objets d'une grille : blocs, ruches, clignotants, planeurs...
+Les cellules vivantes sont regroupées en composantes : cellules qui se touchent, même en
+diagonale (label), puis parties assez proches pour agir les unes sur les autres (census).
+La grille est découpée en segments horizontaux de cellules vivantes, les segments proches
+sont réunis par un union-find vectorisé, sans boucle Python sur les cellules.
+Chaque forme différente est ensuite classée une seule fois : on la fait évoluer seule
+quelques générations pour trouver sa période, et sa forme canonique (la plus petite
+de ses phases, rotations et symétries comprises) donne son nom.
+Les noms inconnus suivent la notation des recensements de soupes : xs (stable),
+xp (oscillateur), xq (vaisseau), ov (autre), suivis de la population et d'une empreinte.
+"""
+import hashlib
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from cycles import cell_keys
+from engines import neighbor_sum
+from patterns import crop
+from rules import parse_rule
+
+MAX_PERIOD = 15  # Nombre de générations pendant lesquelles une forme est suivie pour trouver sa période
+OBJECT_DISTANCE = 2  # Distance maximale (en cases) entre deux parties d'un même objet recensé
+
+# Objets connus (règle de Conway), en texte : O = vivante
+KNOWN = {
+    "block": ["OO", "OO"],
+    "beehive": [".OO.", "O..O", ".OO."],
+    "loaf": [".OO.", "O..O", ".O.O", "..O."],
+    "boat": ["OO.", "O.O", ".O."],
+    "ship": ["OO.", "O.O", ".OO"],
+    "tub": [".O.", "O.O", ".O."],
+    "pond": [".OO.", "O..O", "O..O", ".OO."],
+    "long boat": ["OO..", "O.O.", ".O.O", "..O."],
+    "barge": [".O..", "O.O.", ".O.O", "..O."],
+    "blinker": ["OOO"],
+    "toad": [".OOO", "OOO."],
+    "beacon": ["OO..", "OO..", "..OO", "..OO"],
+    "glider": [".O.", "..O", "OOO"],
+    "lwss": [".O..O", "O....", "O...O", "OOOO."],
+    "mwss": ["...O..", ".O...O", "O.....", "O....O", "OOOOO."],
+    "hwss": ["...OO..", ".O....O", "O......", "O.....O", "OOOOOO."],
+}
+
+
+def runs(cells):
+    """
+    Retourne les segments horizontaux de cellules vivantes, dans l'ordre des lignes :
+    (lignes, débuts, fins), la fin étant exclue.
+    """
+    cells = np.asarray(cells, dtype=np.uint8)
+    padded = np.zeros((cells.shape[0], cells.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = cells
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+
+def _touching(rows, starts, ends, width, distance=1):
+    """
+    Retourne les paires (a, b) de segments dont deux cellules sont à au plus distance cases
+    l'une de l'autre (en ligne, colonne ou diagonale), b étant après a (même ligne ou lignes suivantes).
+    width doit dépasser le nombre de colonnes d'au moins 2 x distance.
+    Les segments d'une ligne ne se chevauchent pas : ils sont triés par début comme par fin.
+    """
+    key_start = rows.astype(np.int64) * width + starts
+    key_end = rows.astype(np.int64) * width + ends
+    pairs_a, pairs_b = [], []
+    for dr in range(distance + 1):
+        line = (rows + dr).astype(np.int64) * width
+        # Segments de la ligne dr plus bas qui finissent au plus tôt en début(a) - distance
+        # et commencent au plus tard en fin(a) - 1 + distance ; sur la même ligne, ceux après a
+        if dr == 0:
+            low = np.arange(1, len(rows) + 1)
+        else:
+            low = np.searchsorted(key_end, line + starts - distance + 1, side='left')
+        high = np.searchsorted(key_start, line + ends - 1 + distance, side='right')
+        count = np.maximum(high - low, 0)
+        a = np.repeat(np.arange(len(rows)), count)
+        offset = np.arange(len(a)) - np.repeat(np.cumsum(count) - count, count)
+        pairs_a.append(a)
+        pairs_b.append(np.repeat(low, count) + offset)
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+
+def _union(n, a, b):
+    """
+    Union-find vectorisé : retourne, pour chacun des n éléments, le plus petit élément
+    de sa composante, les arêtes étant les paires (a[i], b[i]).
+    À chaque tour, la racine la plus grande de chaque arête est accrochée à la plus petite,
+    puis les chemins sont raccourcis jusqu'aux racines.
+    """
+    parent = np.arange(n)
+    while True:
+        pa, pb = parent[a], parent[b]
+        differ = pa != pb
+        if not differ.any():
+            return parent
+        pa, pb = pa[differ], pb[differ]
+        low = np.minimum(pa, pb)
+        np.minimum.at(parent, pa, low)
+        np.minimum.at(parent, pb, low)
+        while True:
+            grand = parent[parent]
+            if (grand == parent).all():
+                break
+            parent = grand
+
+
+def label(cells):
+    """
+    Numérote les composantes 8-connexes des cellules vivantes.
+    Retourne (labels, count) : labels est un tableau int32 de la taille de la grille,
+    0 pour les cellules mortes, 1 à count pour les cellules des composantes.
+    """
+    cells = np.asarray(cells, dtype=np.uint8)
+    labels = np.zeros(cells.shape, dtype=np.int32)
+    rows, starts, ends, component, count = _components(cells)
+    lengths = ends - starts
+    flat = np.repeat(rows.astype(np.int64) * cells.shape[1] + starts - np.cumsum(lengths) + lengths, lengths)
+    flat += np.arange(len(flat))
+    labels.reshape(-1)[flat] = np.repeat(component + 1, lengths)
+    return labels, count
+
+
+def _components(cells, distance=1):
+    """
+    Retourne (lignes, débuts, fins, composante, nombre de composantes) des segments de la grille,
+    composante étant le numéro (à partir de 0) de la composante de chaque segment.
+    Deux cellules à au plus distance cases l'une de l'autre sont dans la même composante
+    (1 : composantes 8-connexes).
+    """
+    rows, starts, ends = runs(cells)
+    a, b = _touching(rows, starts, ends, cells.shape[1] + 2 * distance + 2, distance)
+    roots = _union(len(rows), a, b)
+    roots, component = np.unique(roots, return_inverse=True)
+    return rows, starts, ends, component, len(roots)
+
+
+def canonical(cells):
+    """
+    Retourne la forme canonique d'un motif : la plus petite de ses 8 orientations
+    (rotations et symétries), recadrée, sous forme (forme du tableau, octets).
+    """
+    cells = crop(cells)
+    forms = []
+    for a in (cells, cells.T):
+        for k in range(4):
+            b = np.rot90(a, k)
+            forms.append((b.shape, np.packbits(b).tobytes()))
+    return min(forms)
+
+
+def classify(cells, rule="B3/S23", generations=MAX_PERIOD):
+    """
+    Retourne le nom d'un motif isolé : nom connu (règle de Conway), sinon
+    xs<population>_<empreinte> pour une figure stable, xp<période>_... pour un oscillateur,
+    xq<période>_... pour un vaisseau, ov<population>_... si aucune période n'est trouvée
+    en generations générations.
+    """
+    rule = parse_rule(rule)
+    cells = np.ascontiguousarray(crop(cells))
+    key, prefix = _key(cells.tobytes(), cells.shape, rule, generations)
+    name = _known(rule, generations).get(key)
+    if name is not None:
+        return name
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=6).hexdigest()
+    return f"{prefix}_{digest}"
+
+
+@lru_cache(maxsize=4096)
+def _key(data, shape, rule, generations):
+    """
+    Retourne (forme canonique sur toutes les phases, préfixe du nom) d'un motif recadré
+    (octets et forme du tableau uint8).
+    """
+    start = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+    population = int(start.sum())
+    board = np.pad(start, generations + 1)
+    phases = [canonical(start)]
+    for g in range(1, generations + 1):
+        board = rule.apply(board, neighbor_sum(board))
+        live_rows = np.flatnonzero(board.any(axis=1))
+        if len(live_rows) == 0:
+            break
+        now = crop(board)
+        if now.shape == start.shape and (now == start).all():
+            # Même motif, même orientation : période g ; déplacé, c'est un vaisseau
+            live_cols = np.flatnonzero(board.any(axis=0))
+            moved = (live_rows[0], live_cols[0]) != (generations + 1, generations + 1)
+            if g == 1 and not moved:
+                prefix = f"xs{population}"
+            else:
+                prefix = f"{'xq' if moved else 'xp'}{g}"
+            return min(phases), prefix
+        phases.append(canonical(now))
+    return phases[0], f"ov{population}"
+
+
+@lru_cache(maxsize=None)
+def _known(rule, generations):
+    """
+    Retourne {forme canonique: nom} des objets connus, pour la règle de Conway (vide sinon).
+    """
+    if str(rule) != "B3/S23":
+        return {}
+    table = {}
+    for name, text in KNOWN.items():
+        cells = np.array([[c == "O" for c in line] for line in text], dtype=np.uint8)
+        table[_key(cells.tobytes(), cells.shape, rule, generations)[0]] = name
+    return table
+
+
+def census(cells, rule="B3/S23", generations=MAX_PERIOD):
+    """
+    Recense les objets d'une grille (tableau 2D, par exemple Grid.cells ou World.window(...)).
+    Retourne un Counter {nom de l'objet: nombre} (voir classify pour les noms).
+    Les cellules sont d'abord regroupées en composantes 8-connexes. Deux composantes à au plus
+    OBJECT_DISTANCE cases l'une de l'autre ont une voisine morte en commun et peuvent agir l'une
+    sur l'autre (les vaisseaux, par exemple, ne sont pas 8-connexes) : elles forment un seul objet,
+    sauf si ce sont toutes deux des objets connus (deux blocs proches restent deux blocs).
+    """
+    cells = np.asarray(cells, dtype=np.uint8)
+    rows, starts, ends, component, count = _components(cells)
+    if count == 0:
+        return Counter()
+    rule = parse_rule(rule)
+    names = _names(rows, starts, ends, component, count, rule, generations)
+    # Composantes proches réunies, sauf entre deux objets connus
+    known = set(_known(rule, generations).values())
+    is_known = np.array([name in known for name in names])
+    a, b = _touching(rows, starts, ends, cells.shape[1] + 2 * OBJECT_DISTANCE + 2, OBJECT_DISTANCE)
+    a, b = component[a], component[b]
+    merge = (a != b) & ~(is_known[a] & is_known[b])
+    roots = _union(count, a[merge], b[merge])
+    roots, objects = np.unique(roots, return_inverse=True)
+    if len(roots) < count:
+        names = _names(rows, starts, ends, objects[component], len(roots), rule, generations)
+    return Counter(names)
+
+
+def _names(rows, starts, ends, component, count, rule, generations):
+    """
+    Retourne la liste des noms (voir classify) des count composantes des segments donnés.
+    Chaque composante est résumée par une empreinte de sa forme (XOR des clés de ses cellules,
+    relatives à son coin haut-gauche) : seules les formes différentes sont classées.
+    """
+    # Cellules vivantes, regroupées par composante
+    lengths = ends - starts
+    cell_component = np.repeat(component, lengths)
+    cell_rows = np.repeat(rows, lengths).astype(np.int64)
+    cell_cols = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+    order = np.argsort(cell_component, kind='stable')
+    cell_component, cell_rows, cell_cols = cell_component[order], cell_rows[order], cell_cols[order]
+    first = np.searchsorted(cell_component, np.arange(count))
+    top = np.minimum.reduceat(cell_rows, first)
+    left = np.minimum.reduceat(cell_cols, first)
+    # Empreinte de la forme : cellules relatives au coin haut-gauche de la composante
+    relative = ((cell_rows - top[cell_component]) << 32) | (cell_cols - left[cell_component])
+    shapes = np.bitwise_xor.reduceat(cell_keys(relative), first)
+    _, representative, inverse = np.unique(shapes, return_index=True, return_inverse=True)
+
+    bounds = np.append(first, len(cell_component))
+    kinds = []
+    for index in representative:
+        r = cell_rows[bounds[index]:bounds[index + 1]] - top[index]
+        c = cell_cols[bounds[index]:bounds[index + 1]] - left[index]
+        shape = np.zeros((r.max() + 1, c.max() + 1), dtype=np.uint8)
+        shape[r, c] = 1
+        kinds.append(classify(shape, rule, generations))
+    return [kinds[k] for k in inverse.reshape(-1)]
@@ -0,0 +1,133 @@
+"""
+Détection des fins de partie : extinction, figure stable ou oscillateur.
+La grille est résumée par une empreinte de 64 bits (hachage de Zobrist) : chaque cellule
+a sa propre clé aléatoire et l'empreinte est le XOR des clés des cellules vivantes.
+Elle se met à jour avec les seules cellules qui ont changé, sans relire la grille.
+Les empreintes des dernières générations sont gardées dans une table : retrouver
+l'empreinte courante dans la table donne la période du cycle.
+"""
+from collections import deque
+
+import numpy as np
+
+MAX_PERIOD = 64  # Période maximale des oscillateurs détectés par défaut
+
+
+def cell_keys(indices, seed=0):
+    """
+    Retourne la clé de Zobrist (uint64) de chaque cellule, à partir de son indice à plat
+    (voir Grid.alive et World.alive).
+    Les clés sont calculées à la volée (mélangeur splitmix64) : pas de table à garder en mémoire.
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(indices).astype(np.uint64) + np.uint64(seed)
+        z = z * np.uint64(0x9E3779B97F4A7C15) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def keys_xor(indices, seed=0):
+    """
+    Retourne le XOR des clés des cellules données (0 s'il n'y en a aucune).
+    """
+    if len(indices) == 0:
+        return 0
+    return int(np.bitwise_xor.reduce(cell_keys(indices, seed)))
+
+
+class CycleDetector:
+    """
+    Suit l'empreinte d'une grille (voir Grid.cell_listeners) et détecte :
+    - l'extinction : plus aucune cellule vivante ;
+    - une figure stable : la grille ne change plus (période 1) ;
+    - un oscillateur : la grille revient à un état déjà vu, jusqu'à max_period générations plus tôt.
+    Les motifs qui se déplacent (planeurs) ne reviennent jamais au même état et ne sont pas détectés.
+    Toute modification à la main (clic, collage...) efface l'historique.
+    """
+
+    def __init__(self, grid, max_period=MAX_PERIOD, seed=0):
+        """
+        - grid : grille à suivre (le détecteur s'abonne à ses changements)
+        - max_period : période maximale détectée (taille de la table des empreintes)
+        - seed : graine des clés de Zobrist
+        """
+        self.grid = grid
+        self.max_period = max_period
+        self.seed = seed
+        alive = grid.alive()
+        self.hash = keys_xor(alive, seed)
+        self.population = len(alive)
+        self.found = None    # ("extinction",), ("still", 1) ou ("oscillator", période) une fois détecté
+        self.since = None    # Génération à laquelle le cycle a été détecté
+        self._history = {}   # (empreinte, population) -> génération
+        self._order = deque()
+        self._remember()
+        grid.cell_listeners.append(self.cells_changed)
+
+    @property
+    def period(self):
+        """
+        Période du cycle détecté (1 pour une figure stable ou une grille vide), None sinon.
+        """
+        if self.found is None:
+            return None
+        return self.found[1] if len(self.found) > 1 else 1
+
+    def cells_changed(self, born, died, step):
+        """
+        Met à jour l'empreinte avec les cellules nées et mortes (appelé par la grille).
+        """
+        self.hash ^= keys_xor(born, self.seed) ^ keys_xor(died, self.seed)
+        self.population += len(born) - len(died)
+        if not step:
+            self.forget()
+            return
+        generation = self.grid.generation + 1  # La grille compte la génération après nous
+        if self.found is None:
+            if self.population == 0:
+                self.found = ("extinction",)
+            else:
+                seen = self._history.get((self.hash, self.population))
+                if seen is not None:
+                    period = generation - seen
+                    self.found = ("still", 1) if period == 1 else ("oscillator", period)
+            if self.found is not None:
+                self.since = generation
+        self._remember(generation)
+
+    def forget(self):
+        """
+        Efface l'historique (la grille a été modifiée à la main).
+        """
+        self._history.clear()
+        self._order.clear()
+        self.found = None
+        self.since = None
+        self._remember()
+
+    def _remember(self, generation=None):
+        """
+        Ajoute l'empreinte courante à la table, en oubliant la plus ancienne si elle est pleine.
+        """
+        key = (self.hash, self.population)
+        self._history[key] = self.grid.generation if generation is None else generation
+        self._order.append(key)
+        if len(self._order) > self.max_period:
+            old = self._order.popleft()
+            if self._history.get(old, -1) <= self._history[key] - self.max_period:
+                del self._history[old]
+
+    def fast_forward(self, n):
+        """
+        Avance la grille de n générations. Si un cycle est détecté, seules n % période
+        générations sont vraiment calculées : les autres ramèneraient au même état.
+        """
+        period = self.period
+        if period is None:
+            for _ in range(n):
+                self.grid.next_generation()
+            return
+        for _ in range(n % period):
+            self.grid.next_generation()
+        self.grid.generation += n - n % period
@@ -0,0 +1,213 @@
+"""
+Grilles sur disque, pour les grilles plus grandes que la mémoire.
+Format du fichier : un en-tête fixe de 64 octets (voir HEADER), puis les lignes de la grille,
+une cellule par bit, chaque ligne occupant un nombre entier de mots de 64 bits
+(même disposition que BitGrid.words : la colonne c est le bit c % 64 du mot c // 64).
+Le fichier est ouvert par projection en mémoire (mmap) : l'ouverture ne lit que l'en-tête,
+et seules les pages des lignes lues ou écrites sont chargées par le système.
+Une génération est calculée par bandes de lignes, chacune avancée par BitGrid :
+la mémoire utilisée dépend de la taille d'une bande, pas de celle de la grille.
+"""
+import struct
+
+import numpy as np
+
+from bitgrid import WORD, WORD_BITS, BitGrid
+from grid import paste_mode
+from rules import parse_rule
+from soups import make_rng, random_cells
+
+MAGIC = b"LIFEGRD1"
+# Signature, lignes, colonnes, génération, octets par ligne, règle (texte B/S complété par des zéros)
+HEADER = struct.Struct("<8sQQQQ24s")
+BAND_CELLS = 1 << 26  # Nombre maximal de cellules d'une bande de lignes traitée d'un coup
+# Nombre de bits à 1 de chaque octet
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8).reshape(-1, 1), axis=1).sum(axis=1, dtype=np.uint8)
+
+
+def create(path, rows, cols, rule="B3/S23"):
+    """
+    Crée un fichier de grille vide (toutes les cellules mortes) et retourne la grille ouverte.
+    Le fichier est agrandi sans être écrit : sur la plupart des systèmes, il ne prend
+    de place sur le disque qu'au fur et à mesure que ses lignes sont remplies.
+    """
+    row_bytes = (cols + WORD_BITS - 1) // WORD_BITS * 8
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, rows, cols, 0, row_bytes, str(parse_rule(rule)).encode()))
+        file.truncate(HEADER.size + rows * row_bytes)
+    return DiskGrid(path)
+
+
+def save(cells, path, rule="B3/S23", generation=0):
+    """
+    Enregistre un tableau 2D de 0/1 (par exemple Grid.cells) dans un fichier de grille.
+    """
+    cells = np.asarray(cells, dtype=np.uint8)
+    grid = create(path, cells.shape[0], cells.shape[1], rule)
+    grid.paste(cells, 0, 0, mode="replace")
+    grid.generation = generation
+    grid.close()
+
+
+class DiskGrid:
+    """
+    Grille stockée dans un fichier (voir le format plus haut).
+    Même interface que Grid pour l'affichage et le calcul : window, get, toggle, paste,
+    randomize, population, next_generation, listeners.
+    """
+    bounded = True
+
+    def __init__(self, path, mode="r+", band_cells=BAND_CELLS):
+        """
+        Ouvre un fichier de grille sans le lire.
+        - mode : "r+" pour lire et modifier la grille, "r" pour la lire seulement
+        - band_cells : nombre maximal de cellules d'une bande de lignes traitée d'un coup
+          (la mémoire utilisée en dépend)
+        Lève une ValueError si le fichier n'est pas un fichier de grille.
+        """
+        self.path = path
+        self.mode = mode
+        self._header = np.memmap(path, dtype=np.uint8, mode=mode, shape=(HEADER.size,))
+        magic, rows, cols, generation, row_bytes, rule = HEADER.unpack(self._header.tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un fichier de grille")
+        self.rows = rows
+        self.cols = cols
+        self._generation = generation
+        self.rule = parse_rule(rule.rstrip(b"\0").decode())
+        self.words = np.memmap(path, dtype=WORD, mode=mode, offset=HEADER.size,
+                               shape=(rows, row_bytes // 8))
+        self.band = max(band_cells // max(cols, 1), 1)  # Nombre de lignes d'une bande
+        self.listeners = []  # Fonctions appelées avec (top, left, bottom, right) quand une zone change
+        self._stepper = None  # BitGrid réutilisée pour calculer les bandes
+
+    @property
+    def generation(self):
+        """
+        Numéro de la génération courante, gardé dans l'en-tête du fichier.
+        """
+        return self._generation
+
+    @generation.setter
+    def generation(self, value):
+        self._generation = value
+        fields = HEADER.unpack(self._header.tobytes())
+        self._header[:] = np.frombuffer(HEADER.pack(*fields[:3], value, *fields[4:]), dtype=np.uint8)
+
+    def window(self, top, left, bottom, right):
+        """
+        Retourne les cellules de la zone [top, bottom) x [left, right) (tableau uint8).
+        Seuls les mots de la zone sont lus et décompressés : rapide pour une vue de l'écran.
+        """
+        w0, w1 = left // WORD_BITS, (right + WORD_BITS - 1) // WORD_BITS
+        words = np.ascontiguousarray(self.words[top:bottom, w0:w1])
+        bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder='little')
+        offset = left - w0 * WORD_BITS
+        return bits[:, offset:offset + right - left]
+
+    def get(self, r, c):
+        """
+        Retourne l'état (0 ou 1) de la cellule (r, c), 0 hors de la grille.
+        """
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return int(self.words[r, c // WORD_BITS] >> np.uint64(c % WORD_BITS)) & 1
+        return 0
+
+    def toggle(self, r, c, value=None):
+        """
+        Change l'état d'une cellule (vivante/morte).
+        - Si value est None : inverse l'état (vivant <-> mort).
+        - Si value vaut 0 ou 1 : force la cellule à cette valeur.
+        """
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            if value is None:
+                value = 1 - self.get(r, c)
+            self.paste(np.array([[value]], dtype=np.uint8), r, c, mode="replace")
+
+    def paste(self, pattern, top=0, left=0, mode="or"):
+        """
+        Colle un motif (tableau 2D de 0/1) dans la grille, son coin haut-gauche en (top, left).
+        Ce qui dépasse de la grille est ignoré. Modes : voir Grid.paste.
+        Seuls les mots touchés par le motif sont lus et réécrits.
+        """
+        op = paste_mode(mode)
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        r0, c0 = max(top, 0), max(left, 0)
+        r1 = min(top + pattern.shape[0], self.rows)
+        c1 = min(left + pattern.shape[1], self.cols)
+        if r0 >= r1 or c0 >= c1:
+            return
+        w0, w1 = c0 // WORD_BITS, (c1 + WORD_BITS - 1) // WORD_BITS
+        for start in range(r0, r1, self.band):
+            end = min(start + self.band, r1)
+            words = np.ascontiguousarray(self.words[start:end, w0:w1])
+            bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder='little')
+            region = bits[:, c0 - w0 * WORD_BITS:c1 - w0 * WORD_BITS]
+            region[...] = op(region, pattern[start - top:end - top, c0 - left:c1 - left])
+            self.words[start:end, w0:w1] = np.packbits(bits, axis=1, bitorder='little').view(WORD)
+        self._notify(r0, c0, r1, c1)
+
+    def randomize(self, prob=0.2, seed=None):
+        """
+        Remplit la grille avec des cellules vivantes tirées au hasard, bande par bande
+        (voir soups.random_cells ; la même graine redonne la même grille), et remet la génération à 0.
+        """
+        rng = make_rng(seed)
+        for start in range(0, self.rows, self.band):
+            end = min(start + self.band, self.rows)
+            self.paste(random_cells(end - start, self.cols, prob, rng), start, 0, mode="replace")
+        self.generation = 0
+
+    def population(self):
+        """
+        Retourne le nombre de cellules vivantes (lit tout le fichier, bande par bande).
+        """
+        total = 0
+        for start in range(0, self.rows, self.band):
+            band = np.ascontiguousarray(self.words[start:start + self.band])
+            total += int(POPCOUNT[band.view(np.uint8)].sum(dtype=np.int64))
+        return total
+
+    def next_generation(self):
+        """
+        Calcule la prochaine génération, bande par bande, directement dans le fichier.
+        Chaque bande est lue avec une ligne de halo au-dessus et au-dessous ; la ligne du dessus
+        a déjà été réécrite par la bande précédente, on en garde donc une copie avant de l'écrire.
+        """
+        above = np.zeros(self.words.shape[1], dtype=WORD)  # Ligne au-dessus de la bande, avant calcul
+        for start in range(0, self.rows, self.band):
+            end = min(start + self.band, self.rows)
+            if self._stepper is None or self._stepper.rows != end - start + 2:
+                self._stepper = BitGrid(end - start + 2, self.cols, self.rule)
+            block = self._stepper.words
+            block[0] = above
+            block[1:-1] = self.words[start:end]
+            block[-1] = self.words[end] if end < self.rows else 0
+            above = block[-2].copy()
+            self._stepper.next_generation()
+            self.words[start:end] = self._stepper.words[1:-1]
+        self.generation += 1
+        self._notify(0, 0, self.rows, self.cols)
+
+    def flush(self):
+        """
+        Écrit sur le disque les modifications en attente.
+        """
+        if self.words is not None and self.mode != "r":
+            self.words.flush()
+            self._header.flush()
+
+    def close(self):
+        """
+        Écrit les modifications et ferme le fichier.
+        """
+        self.flush()
+        self.words = None
+        self._header = None
+
+    def _notify(self, top, left, bottom, right):
+        """
+        Prévient les fonctions abonnées que la zone [top, bottom) x [left, right) a changé.
+        """
+        for listener in self.listeners:
+            listener(top, left, bottom, right)
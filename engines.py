@@ -0,0 +1,331 @@
+from importlib import import_module
+
+import numpy as np
+
+from rules import parse_rule
+
+
+def count_neighbors(cells, r, c):
+    """
+    Compte le nombre de cellules vivantes autour de la cellule (r, c).
+    Les voisins sont les 8 cellules autour (haut, bas, gauche, droite, diagonales).
+    """
+    rows, cols = len(cells), len(cells[0])
+    count = 0
+    for i in range(r-1, r+2):      # Parcourt les lignes voisines
+        for j in range(c-1, c+2):  # Parcourt les colonnes voisines
+            # Ignore la cellule centrale et les indices hors grille
+            if (i == r and j == c) or i < 0 or j < 0 or i >= rows or j >= cols:
+                continue
+            count += cells[i][j]  # Ajoute 1 si la cellule est vivante
+    return count
+
+
+class Engine:
+    """
+    Classe de base des moteurs de calcul.
+    Un moteur sait créer une grille vide, convertir un tableau 2D dans son format
+    et calculer la génération suivante selon sa règle (B3/S23 par défaut).
+    """
+    name = None
+
+    def __init__(self, rule="B3/S23"):
+        """
+        rule : règle de l'automate, en notation B/S ("B36/S23") ou par son nom ("highlife").
+        """
+        self.rule = parse_rule(rule)
+
+    def empty(self, rows, cols):
+        raise NotImplementedError
+
+    def from_array(self, array):
+        raise NotImplementedError
+
+    def step(self, cells):
+        raise NotImplementedError
+
+    def step_changes(self, cells):
+        """
+        Calcule la prochaine génération et les cellules qui ont changé.
+        Retourne (nouvelle grille, naissances, morts), les naissances et les morts étant
+        des tableaux d'indices à plat (ligne * colonnes + colonne).
+        Par défaut, compare l'ancienne et la nouvelle grille ; les moteurs qui modifient
+        la grille sur place doivent redéfinir cette méthode.
+        """
+        old = np.asarray(cells, dtype=np.uint8)
+        new = self.step(cells)
+        new_array = np.asarray(new, dtype=np.uint8)
+        return new, np.flatnonzero(new_array > old), np.flatnonzero(old > new_array)
+
+    def touch(self, r, c):
+        """
+        Signale qu'une cellule a été modifiée à la main (clic, dessin).
+        Ne fait rien par défaut ; utile aux moteurs qui gardent un état entre deux générations.
+        """
+
+    def touch_region(self, top, left, bottom, right):
+        """
+        Signale que les cellules des lignes [top, bottom) et colonnes [left, right)
+        ont été modifiées d'un coup (collage d'un motif). Ne fait rien par défaut.
+        """
+
+    def touch_cells(self, rows, cols):
+        """
+        Signale que les cellules données par leurs lignes et colonnes (tableaux)
+        ont été modifiées (trait de souris, annulation). Ne fait rien par défaut.
+        """
+
+    def close(self):
+        """
+        Libère les ressources du moteur (processus, mémoire partagée). Ne fait rien par défaut.
+        """
+
+
+class PythonEngine(Engine):
+    """
+    Moteur de référence : la grille est une liste de listes d'entiers
+    et chaque cellule est calculée une par une en Python pur.
+    Lent, mais sert de base de comparaison pour les autres moteurs.
+    """
+    name = "python"
+
+    def empty(self, rows, cols):
+        """
+        Retourne une grille vide (toutes les cellules mortes).
+        """
+        return [[0 for _ in range(cols)] for _ in range(rows)]
+
+    def from_array(self, array):
+        """
+        Convertit un tableau 2D (liste de listes ou tableau NumPy) en grille de ce moteur.
+        """
+        return [[int(v) for v in row] for row in array]
+
+    def step(self, cells):
+        """
+        Calcule la prochaine génération selon la règle du moteur
+        (pour Conway, B3/S23) :
+        - Une cellule vivante survit si son nombre de voisins est dans S (2 ou 3).
+        - Une cellule morte devient vivante si son nombre de voisins est dans B (3).
+        - Sinon, la cellule meurt ou reste morte.
+        Retourne une nouvelle grille.
+        """
+        survivals, births = self.rule.survivals, self.rule.births
+        rows, cols = len(cells), len(cells[0]) if cells else 0
+        new = [[0] * cols for _ in range(rows)]  # Nouvelle grille
+        for r in range(rows):
+            for c in range(cols):
+                n = count_neighbors(cells, r, c)
+                if cells[r][c] == 1 and n in survivals:
+                    new[r][c] = 1  # Survie
+                elif cells[r][c] == 0 and n in births:
+                    new[r][c] = 1  # Naissance
+                # Sinon, reste morte (0)
+        return new
+
+
+def neighbor_sum(cells):
+    """
+    Calcule, pour chaque cellule d'un tableau 2D uint8, le nombre de voisins vivants.
+    Les bords sont considérés comme morts (pas de grille torique).
+    On ajoute les 8 copies décalées du tableau au lieu de parcourir les cellules.
+    """
+    padded = np.pad(cells, 1)  # Entoure la grille d'une bordure de cellules mortes
+    return (padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+            padded[1:-1, :-2]                    + padded[1:-1, 2:] +
+            padded[2:, :-2]  + padded[2:, 1:-1]  + padded[2:, 2:])
+
+
+class NumpyEngine(Engine):
+    """
+    Moteur vectorisé : la grille est un tableau NumPy contigu de uint8.
+    Le nombre de voisins est obtenu en additionnant des copies décalées
+    de toute la grille, ce qui évite la boucle Python sur chaque cellule,
+    puis la règle est appliquée d'un coup grâce à sa table de correspondance.
+    Donne exactement le même résultat que le moteur de référence.
+    """
+    name = "numpy"
+
+    def empty(self, rows, cols):
+        """
+        Retourne une grille vide (toutes les cellules mortes).
+        """
+        return np.zeros((rows, cols), dtype=np.uint8)
+
+    def from_array(self, array):
+        """
+        Convertit un tableau 2D (liste de listes ou tableau NumPy) en grille de ce moteur.
+        """
+        return np.ascontiguousarray(array, dtype=np.uint8)
+
+    def step(self, cells):
+        """
+        Calcule la prochaine génération de toute la grille en une seule passe vectorisée.
+        Retourne un nouveau tableau.
+        """
+        return self.rule.apply(cells, neighbor_sum(cells))
+
+
+class IncrementalEngine(NumpyEngine):
+    """
+    Moteur incrémental : la grille est découpée en tuiles de tile x tile cellules
+    et seules les tuiles qui ont changé à la génération précédente (et leurs voisines)
+    sont recalculées. Sur une grille stabilisée (blocs, oscillateurs), le coût d'une
+    génération dépend du nombre de cellules actives et non de rows * cols.
+    Les cellules sont stockées dans un tableau entouré d'une bordure morte ;
+    la grille manipulée par Grid est une vue sur l'intérieur de ce tableau.
+    """
+    name = "incremental"
+
+    def __init__(self, rule="B3/S23", tile=16):
+        """
+        - rule : règle de l'automate
+        - tile : côté d'une tuile en cellules
+        """
+        super().__init__(rule)
+        self.tile = tile
+        self.active_cells = 0  # Nombre de cellules recalculées à la dernière génération
+        self._view = None
+        self._last = None
+
+    def empty(self, rows, cols):
+        """
+        Retourne une grille vide (toutes les cellules mortes).
+        """
+        t = self.tile
+        self.rows, self.cols = rows, cols
+        self.tile_rows = (rows + t - 1) // t
+        self.tile_cols = (cols + t - 1) // t
+        # Tableau arrondi à un nombre entier de tuiles, plus une bordure morte d'une cellule
+        self._padded = np.zeros((self.tile_rows * t + 2, self.tile_cols * t + 2), dtype=np.uint8)
+        inner = self._padded[1:-1, 1:-1]
+        # Vue (tuile_ligne, tuile_colonne, t, t) de l'intérieur, pour écrire tuile par tuile
+        self._tiles = inner.reshape(self.tile_rows, t, self.tile_cols, t).swapaxes(1, 2)
+        # Vue de chaque tuile avec sa bordure d'une cellule, pour lire les voisins
+        self._windows = np.lib.stride_tricks.sliding_window_view(self._padded, (t + 2, t + 2))[::t, ::t]
+        # Cellules qui appartiennent vraiment à la grille (pas à l'arrondi)
+        inside = np.zeros_like(inner)
+        inside[:rows, :cols] = 1
+        self._inside = inside.reshape(self.tile_rows, t, self.tile_cols, t).swapaxes(1, 2).copy()
+        self.active = np.ones((self.tile_rows, self.tile_cols), dtype=bool)
+        self._view = inner[:rows, :cols]
+        return self._view
+
+    def from_array(self, array):
+        """
+        Convertit un tableau 2D (liste de listes ou tableau NumPy) en grille de ce moteur.
+        """
+        array = np.asarray(array, dtype=np.uint8)
+        cells = self.empty(*array.shape)
+        cells[:] = array
+        return cells
+
+    def touch(self, r, c):
+        """
+        Réactive la tuile de la cellule (r, c) et ses voisines.
+        """
+        self.touch_region(r, c, r + 1, c + 1)
+
+    def touch_region(self, top, left, bottom, right):
+        """
+        Réactive les tuiles de la zone [top, bottom) x [left, right) et leurs voisines.
+        """
+        t = self.tile
+        self.active[max(top // t - 1, 0):(bottom - 1) // t + 2,
+                    max(left // t - 1, 0):(right - 1) // t + 2] = True
+
+    def touch_cells(self, rows, cols):
+        """
+        Réactive les seules tuiles des cellules données et leurs voisines.
+        """
+        t = self.tile
+        tiles = np.unique(np.asarray(rows) // t * self.tile_cols + np.asarray(cols) // t)
+        tr, tc = np.divmod(tiles, self.tile_cols)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = tr + dr, tc + dc
+                keep = (r >= 0) & (r < self.tile_rows) & (c >= 0) & (c < self.tile_cols)
+                self.active[r[keep], c[keep]] = True
+
+    def step(self, cells):
+        """
+        Calcule la prochaine génération en ne recalculant que les tuiles actives.
+        La grille est modifiée sur place et retournée.
+        """
+        if cells is not self._view:
+            # La grille a été remplacée de l'extérieur : on la reprend et tout est actif
+            cells = self.from_array(cells)
+        ti, tj = np.nonzero(self.active)
+        self.active_cells = len(ti) * self.tile * self.tile
+        self._last = None
+        if len(ti) == 0:
+            return cells  # Rien n'a bougé : la grille est stable
+
+        # Lecture de toutes les tuiles actives avec leur bordure (avant toute écriture)
+        blocks = self._windows[ti, tj]
+        old = blocks[:, 1:-1, 1:-1]
+        n = (blocks[:, :-2, :-2] + blocks[:, :-2, 1:-1] + blocks[:, :-2, 2:] +
+             blocks[:, 1:-1, :-2]                      + blocks[:, 1:-1, 2:] +
+             blocks[:, 2:, :-2]  + blocks[:, 2:, 1:-1]  + blocks[:, 2:, 2:])
+        new = self.rule.apply(old, n) & self._inside[ti, tj]
+        self._tiles[ti, tj] = new
+        self._last = (ti, tj, old, new)  # Pour retrouver les cellules modifiées (step_changes)
+
+        # Les tuiles modifiées et leurs 8 voisines seront actives à la génération suivante
+        changed = np.zeros_like(self.active)
+        changed[ti, tj] = (new != old).any(axis=(1, 2))
+        active = changed.copy()
+        active[1:] |= changed[:-1]
+        active[:-1] |= changed[1:]
+        spread = active.copy()
+        active[:, 1:] |= spread[:, :-1]
+        active[:, :-1] |= spread[:, 1:]
+        self.active = active
+        return cells
+
+    def step_changes(self, cells):
+        """
+        Comme step, mais retourne aussi les naissances et les morts (indices à plat).
+        Seules les tuiles actives sont examinées.
+        """
+        cells = self.step(cells)
+        if self._last is None:
+            nothing = np.zeros(0, dtype=np.int64)
+            return cells, nothing, nothing
+        ti, tj, old, new = self._last
+        k, a, b = np.nonzero(old != new)
+        flat = (ti[k] * self.tile + a) * self.cols + tj[k] * self.tile + b
+        alive = new[k, a, b] == 1
+        return cells, flat[alive], flat[~alive]
+
+
+# Moteurs disponibles, sélectionnés par leur nom à la création de la grille
+ENGINES = {
+    PythonEngine.name: PythonEngine,
+    NumpyEngine.name: NumpyEngine,
+    IncrementalEngine.name: IncrementalEngine,
+}
+
+# Moteurs définis dans leur propre module, importés seulement si on les demande
+EXTRA_ENGINES = {
+    "hashlife": ("hashlife", "HashLifeEngine"),
+    "parallel": ("parallel", "ParallelEngine"),
+}
+
+
+def make_engine(name="python", **options):
+    """
+    Crée le moteur de calcul correspondant au nom donné ("python", "numpy", ...).
+    options : paramètres passés au constructeur du moteur (ex : tile pour "incremental",
+    workers pour "parallel").
+    Si name est déjà un moteur, il est retourné tel quel.
+    Lève une ValueError si le nom est inconnu.
+    """
+    if isinstance(name, Engine):
+        return name
+    if name in EXTRA_ENGINES:
+        module, class_name = EXTRA_ENGINES[name]
+        return getattr(import_module(module), class_name)(**options)
+    if name not in ENGINES:
+        raise ValueError(f"Moteur inconnu : {name!r} (disponibles : {', '.join([*ENGINES, *EXTRA_ENGINES])})")
+    return ENGINES[name](**options)
@@ -0,0 +1,167 @@
+"""
+Calcul en lot de nombreuses petites grilles indépendantes (par exemple des milliers
+de soupes aléatoires de 64 x 64), pour des statistiques : durée de vie, population finale.
+Toutes les grilles, de même taille, sont rangées dans un seul tableau 3D
+(grille, ligne, colonne) et avancées ensemble par les mêmes opérations NumPy :
+le coût de l'interpréteur est payé une fois par génération, pas une fois par grille.
+Une grille qui devient stable (vide, fixe ou oscillante) est retirée du lot.
+run_ensemble répartit les grilles entre plusieurs processus (un par coeur).
+"""
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from cycles import cell_keys
+from rules import parse_rule
+from soups import make_rng, random_cells
+
+MAX_PERIOD = 15  # Période maximale des oscillateurs reconnus (15 : pentadécathlon)
+BATCH_CELLS = 1 << 18  # Nombre de cellules calculées d'un coup (un paquet de grilles)
+
+
+def random_boards(count, rows, cols, density=0.5, seed=None):
+    """
+    Retourne un tableau uint8 (count, rows, cols) de grilles aléatoires (voir soups.random_cells).
+    La même graine redonne exactement les mêmes grilles.
+    """
+    return random_cells(count * rows, cols, density, seed).reshape(count, rows, cols)
+
+
+class Ensemble:
+    """
+    Lot de grilles de même taille, avancées ensemble.
+    Après chaque génération, l'empreinte de chaque grille est comparée à celles des
+    max_period générations précédentes : une grille qui revient à un état déjà vu est stable,
+    elle est retirée du lot. Résultats, un tableau par grille :
+    - lifespans : génération à partir de laquelle la grille se répète (-1 si elle ne s'est pas stabilisée)
+    - periods : période du cycle final (1 : grille vide ou fixe, 0 si pas stabilisée)
+    - populations : population finale
+    - boards : état final des grilles
+    L'empreinte d'une grille est la somme (sur 64 bits) de ses mots de 64 cellules, chacun combiné
+    à une clé propre à sa position puis mélangé (voir cycles.cell_keys) : une collision
+    (deux états différents de même empreinte) est possible mais extrêmement improbable.
+    """
+
+    def __init__(self, boards, rule="B3/S23", max_period=MAX_PERIOD, seed=0):
+        """
+        - boards : tableau (nombre de grilles, lignes, colonnes) des grilles de départ
+        - rule : règle de l'automate
+        - max_period : période maximale des oscillateurs reconnus
+        - seed : graine des clés des empreintes
+        """
+        self.boards = np.array(boards, dtype=np.uint8)
+        count, rows, cols = self.boards.shape
+        self.rule = parse_rule(rule)
+        self.max_period = max_period
+        self.generation = 0
+        self.lifespans = np.full(count, -1, dtype=np.int64)
+        self.periods = np.zeros(count, dtype=np.int64)
+        self.populations = self.boards.sum(axis=(1, 2), dtype=np.int64)
+        # Grilles encore en cours : numéros, et deux tableaux bordés de cellules mortes (génération courante et suivante)
+        self.active = np.arange(count)
+        self._padded = [np.zeros((count, rows + 2, cols + 2), dtype=np.uint8) for _ in range(2)]
+        self._padded[0][:, 1:-1, 1:-1] = self.boards
+        words = (rows * ((cols + 7) // 8) + 7) // 8
+        self._salts = make_rng(seed).integers(0, 1 << 64, words, dtype=np.uint64)
+        # Empreintes des max_period dernières générations : colonne g % max_period pour la génération g
+        self._hashes = np.zeros((count, max_period), dtype=np.uint64)
+        self._hashes[:, 0] = self._hash(self._padded[0])
+
+    @property
+    def cells(self):
+        """
+        Vue (grilles en cours, lignes, colonnes) de la génération courante des grilles en cours.
+        """
+        return self._padded[0][:, 1:-1, 1:-1]
+
+    def step(self):
+        """
+        Calcule la génération suivante de toutes les grilles en cours, puis retire celles qui sont stables.
+        """
+        source, dest = self._padded
+        # Par paquets de grilles qui tiennent dans le cache du processeur
+        batch = max(BATCH_CELLS // (source.shape[1] * source.shape[2]), 1)
+        for start in range(0, len(source), batch):
+            p = source[start:start + batch]
+            cells = p[:, 1:-1, 1:-1]
+            # Somme des 3 x 3 cellules en deux passes (lignes puis colonnes), moins la cellule elle-même
+            h = p[:, :, :-2] + p[:, :, 1:-1]
+            h += p[:, :, 2:]
+            n = h[:, :-2] + h[:, 1:-1]
+            n += h[:, 2:]
+            n -= cells
+            dest[start:start + batch, 1:-1, 1:-1] = self.rule.apply(cells, n)
+        self._padded.reverse()
+        self.generation += 1
+        self._check()
+
+    def run(self, generations):
+        """
+        Avance les grilles de generations générations, ou jusqu'à ce qu'elles soient toutes stables.
+        Retourne (lifespans, periods, populations).
+        """
+        for _ in range(generations):
+            if len(self.active) == 0:
+                break
+            self.step()
+        self.boards[self.active] = self.cells
+        self.populations[self.active] = self.cells.sum(axis=(1, 2), dtype=np.int64)
+        return self.lifespans, self.periods, self.populations
+
+    def _hash(self, padded):
+        """
+        Retourne l'empreinte de 64 bits de chaque grille (tableau bordé).
+        """
+        bits = np.packbits(padded[:, 1:-1, 1:-1], axis=2).reshape(len(padded), -1)
+        words = np.zeros((len(padded), len(self._salts) * 8), dtype=np.uint8)
+        words[:, :bits.shape[1]] = bits
+        return cell_keys(words.view(np.uint64) ^ self._salts).sum(axis=1, dtype=np.uint64)
+
+    def _check(self):
+        """
+        Range l'empreinte de la nouvelle génération et retire du lot les grilles revenues à un état déjà vu.
+        """
+        g, window = self.generation, self.max_period
+        current = self._hash(self._padded[0])
+        period = np.zeros(len(current), dtype=np.int64)
+        for p in range(min(window, g), 0, -1):
+            # Les plus petites périodes sont testées en dernier : elles l'emportent
+            period[self._hashes[:, (g - p) % window] == current] = p
+        self._hashes[:, g % window] = current
+        done = period > 0
+        if not done.any():
+            return
+        ids = self.active[done]
+        self.lifespans[ids] = g - period[done]
+        self.periods[ids] = period[done]
+        self.boards[ids] = self.cells[done]
+        self.populations[ids] = self.cells[done].sum(axis=(1, 2), dtype=np.int64)
+        keep = ~done
+        self.active = self.active[keep]
+        self._padded = [padded[keep] for padded in self._padded]
+        self._hashes = self._hashes[keep]
+
+
+def _run_part(task):
+    """
+    Calcule une part des grilles dans un processus de calcul.
+    """
+    boards, generations, rule, max_period = task
+    return Ensemble(boards, rule, max_period).run(generations)
+
+
+def run_ensemble(boards, generations, rule="B3/S23", max_period=MAX_PERIOD, workers=None):
+    """
+    Avance un lot de grilles (tableau (nombre, lignes, colonnes)) en le répartissant
+    entre workers processus (par défaut, un par coeur ; 1 : dans ce processus).
+    Retourne (lifespans, periods, populations), un tableau par grille (voir Ensemble).
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    workers = min(workers or os.cpu_count(), max(len(boards), 1))
+    if workers <= 1:
+        return Ensemble(boards, rule, max_period).run(generations)
+    parts = np.array_split(boards, workers)
+    with Pool(workers) as pool:
+        results = pool.map(_run_part, [(part, generations, str(parse_rule(rule)), max_period) for part in parts])
+    return tuple(np.concatenate(arrays) for arrays in zip(*results))
@@ -6,6 +6,8 @@ PLAYER_SPEED = 0.5
 PLAYER_MAX_SPEED = 10
 
 TILE_SIZE = 40  # Taille d'une case en pixels
+CHUNK_WIDTH, CHUNK_HEIGHT = WIDTH, HEIGHT  # Taille des morceaux pré-dessinés du niveau (l'écran en touche au plus 4)
+BACKGROUND = (135, 206, 235)  # Couleur du ciel
 
 BLOCK_MAP = {
     0: None,             # Vide
@@ -42,9 +44,48 @@ BLOCK_TYPES = {
   }
 }
 
+# Propriétés de chaque numéro de case, calculées une fois (None : case vide ou type inconnu)
+TILE_PROPERTIES = {tile: BLOCK_TYPES.get(name) for tile, name in BLOCK_MAP.items()}
+
 import pygame
 import sys
 import json
+
+
+def merge_tiles(grid):
+    """
+    Regroupe les cases pleines voisines de même numéro en rectangles les plus grands possible
+    (maillage glouton) : chaque case libre est étendue vers la droite tant que le numéro est le même,
+    puis vers le bas tant que toute la ligne du dessous est identique.
+    Retourne une liste de (colonne, ligne, largeur, hauteur, numéro), en cases.
+    """
+    used = [[False] * len(row) for row in grid]
+    rects = []
+    for y, row in enumerate(grid):
+        x = 0
+        while x < len(row):
+            tile = row[x]
+            if used[y][x] or TILE_PROPERTIES.get(tile) is None:
+                x += 1
+                continue
+            # Largeur : suite de cases identiques sur cette ligne
+            w = 1
+            while x + w < len(row) and row[x + w] == tile and not used[y][x + w]:
+                w += 1
+            # Hauteur : lignes suivantes identiques sur toute la largeur
+            h = 1
+            while y + h < len(grid):
+                below = grid[y + h]
+                if x + w > len(below) or any(below[i] != tile or used[y + h][i] for i in range(x, x + w)):
+                    break
+                h += 1
+            for j in range(y, y + h):
+                used[j][x:x + w] = [True] * w
+            rects.append((x, y, w, h, tile))
+            x += w
+    return rects
+
+
 class Game:
     def __init__(self):
         # Initialise Pygame et crée la fenêtre du jeu
@@ -71,42 +112,44 @@ class Game:
             with open(filename, 'r') as file:
                 self.grid = json.load(file)
             print("Niveau chargé avec succès.")
-            # Création des plateformes à partir de la grille
-            self.platforms = []
-            
-            # Parcourt chaque cellule de la grille
-            for y, row in enumerate(self.grid):
-                for x, cell in enumerate(row):
-                    print(f"Cellule ({x}, {y}): {cell}")  # Affiche la valeur de la cellule
-                    # Si la cellule n'est pas vide (différente de 0)
-                    if cell != 0 and cell in BLOCK_MAP and BLOCK_MAP[cell] is not None:
-                        # Crée une plateforme de la taille d'une case
-                    
-                        block_type = BLOCK_MAP[cell]
-                        
-                        block_object = BLOCK_TYPES.get(block_type)
-                        
-                        if(block_object is None):
-                            print(f"Type de bloc inconnu: {block_type}")
-                            continue
-                        
-                        print(f"Type de bloc: {block_type}, Propriétés: {block_object}")  # Affiche le type de bloc et ses propriétés
-                        platform = Platform(
-                            x * TILE_SIZE,           # Position X
-                            y * TILE_SIZE,           # Position Y
-                            TILE_SIZE,               # Largeur
-                            TILE_SIZE,               # Hauteur
-                            block_object          # Type de bloc
-                        )
-                        self.platforms.append(platform)
-                        
         except FileNotFoundError:
             print(f"Erreur: Le fichier {filename} n'a pas été trouvé.")
-            # Niveau par défaut si le fichier n'est pas trouvé
-            self.platforms = [
-                Platform(0, HEIGHT - 40, WIDTH, 40)  # Sol par défaut
-            ]
-            
+            # Niveau par défaut si le fichier n'est pas trouvé : une ligne d'herbe en bas de l'écran
+            self.grid = [[0] * (WIDTH // TILE_SIZE) for _ in range(HEIGHT // TILE_SIZE - 1)]
+            self.grid.append([1] * (WIDTH // TILE_SIZE))
+
+        # Création des plateformes à partir de la grille : les cases voisines de même type
+        # sont regroupées en grands rectangles (une plateforme par rectangle)
+        for tile in {cell for row in self.grid for cell in row}:
+            if BLOCK_MAP.get(tile) is not None and TILE_PROPERTIES[tile] is None:
+                print(f"Type de bloc inconnu: {BLOCK_MAP[tile]}")
+        self.platforms = [
+            Platform(x * TILE_SIZE, y * TILE_SIZE, w * TILE_SIZE, h * TILE_SIZE, TILE_PROPERTIES[tile])
+            for x, y, w, h, tile in merge_tiles(self.grid)
+        ]
+        print(f"{len(self.platforms)} plateformes créées.")
+        self.build_static_layer()
+
+    def build_static_layer(self):
+        # Le niveau ne change pas pendant le jeu : on dessine une fois pour toutes les plateformes
+        # dans des morceaux de CHUNK_WIDTH x CHUNK_HEIGHT pixels, qu'il suffit ensuite de copier à l'écran.
+        # Surfaces à palette (1 octet par pixel) ; les morceaux sans plateforme ne sont pas créés.
+        palette = [BACKGROUND] + [props['color'] for props in BLOCK_TYPES.values()]
+        self.chunks = {}
+        for plat in self.platforms:
+            rect = plat.rect
+            for cy in range(rect.top // CHUNK_HEIGHT, (rect.bottom - 1) // CHUNK_HEIGHT + 1):
+                for cx in range(rect.left // CHUNK_WIDTH, (rect.right - 1) // CHUNK_WIDTH + 1):
+                    chunk = self.chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = pygame.Surface((CHUNK_WIDTH, CHUNK_HEIGHT), depth=8)
+                        chunk.set_palette(palette)
+                        chunk.fill(BACKGROUND)
+                        self.chunks[(cx, cy)] = chunk
+                    # Position de la plateforme dans le morceau
+                    pygame.draw.rect(chunk, plat.properties.get('color'),
+                                     rect.move(-cx * CHUNK_WIDTH, -cy * CHUNK_HEIGHT))
+
     def update_camera(self):
         # Calcule le centre du joueur
         target_x = self.player.rect.centerx - WIDTH // 2
@@ -134,7 +177,7 @@ class Game:
         while self.running:
             self.handle_events()  # Gère les entrées clavier et la fermeture de la fenêtre
             keys = pygame.key.get_pressed()  # Récupère l'état de toutes les touches du clavier
-            self.player.update(self.platforms, keys)  # Met à jour le joueur
+            self.player.update(self.grid, keys)  # Met à jour le joueur (collisions avec les cases de la grille)
             self.update_camera()  # Met à jour la position de la caméra
             self.draw()  # Affiche tous les éléments à l'écran
             self.clock.tick(FPS)  # Limite la vitesse du jeu à FPS images/seconde
@@ -159,15 +202,15 @@ class Game:
 
     def draw(self):
         # Dessine le fond, les plateformes et le joueur
-        self.screen.fill((135, 206, 235))  # Remplit l'écran avec une couleur bleu ciel
-        
-        for plat in self.platforms:
-            # Dessine chaque plateforme avec l'offset de la caméra
-            camera_rect = self.apply_camera(plat.rect)
-            # Vérifie si la plateforme est visible à l'écran avant de la dessiner
-            if (camera_rect.right > 0 and camera_rect.left < WIDTH and 
-                camera_rect.bottom > 0 and camera_rect.top < HEIGHT):
-                pygame.draw.rect(self.screen, plat.properties.get('color'), camera_rect)
+        self.screen.fill(BACKGROUND)  # Remplit l'écran avec une couleur bleu ciel
+
+        # Copie les morceaux pré-dessinés du niveau qui touchent l'écran (au plus 4)
+        left, top = self.camera_offset
+        for cy in range(top // CHUNK_HEIGHT, (top + HEIGHT - 1) // CHUNK_HEIGHT + 1):
+            for cx in range(left // CHUNK_WIDTH, (left + WIDTH - 1) // CHUNK_WIDTH + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    self.screen.blit(chunk, (cx * CHUNK_WIDTH - left, cy * CHUNK_HEIGHT - top))
         
         # Dessine le joueur avec l'offset de la caméra
         player_camera_rect = self.apply_camera(self.player.rect)
@@ -202,7 +245,26 @@ class Platform:
         
         # Différentes propriétés selon le type
         self.properties = properties
-        print(self.properties)
+
+
+def tiles_in_rect(grid, rect):
+    """
+    Retourne les cases pleines de la grille touchées par le rectangle (en pixels),
+    ligne par ligne de haut en bas : liste de (ligne, colonne, propriétés du bloc).
+    Seules les quelques cases sous le rectangle sont lues, quelle que soit la taille du niveau.
+    """
+    top = max(rect.top // TILE_SIZE, 0)
+    bottom = min((rect.bottom - 1) // TILE_SIZE, len(grid) - 1)
+    tiles = []
+    for row in range(top, bottom + 1):
+        line = grid[row]
+        left = max(rect.left // TILE_SIZE, 0)
+        right = min((rect.right - 1) // TILE_SIZE, len(line) - 1)
+        for col in range(left, right + 1):
+            properties = TILE_PROPERTIES.get(line[col])
+            if properties is not None:
+                tiles.append((row, col, properties))
+    return tiles
 
 
 class Player:
@@ -257,33 +319,36 @@ class Player:
         # Déplace le joueur verticalement selon sa vitesse
         self.rect.y += int(self.vel_y)
 
-    def check_collision(self, platforms):
-        # Crée un petit rectangle sous le joueur pour détecter s'il touche une plateforme
-        foot_rect = pygame.Rect(self.rect.x, self.rect.bottom, self.rect.width, 5)
+    def check_collision(self, grid):
+        # Rectangle des "pieds" du joueur : de sa position avant la chute de cette image
+        # jusqu'à 5 pixels sous lui, pour ne pas traverser une case en tombant vite
+        fall = max(int(self.vel_y), 0)
+        foot_rect = pygame.Rect(self.rect.x, self.rect.bottom - fall, self.rect.width, fall + 5)
         self.on_ground = False  # On suppose d'abord que le joueur n'est pas sur le sol
 
-        # On vérifie si le "pied" du joueur touche une des plateformes
-        for plat in platforms:
-            # Collision seulement si le joueur tombe (vel_y >= 0)
-            if foot_rect.colliderect(plat.rect) and self.vel_y >= 0:
-                self.rect.bottom = plat.rect.top  # Place le joueur juste au-dessus de la plateforme
-                self.vel_y = 0                   # Annule la vitesse verticale (arrête la chute)
-                self.on_ground = True            # Le joueur est maintenant sur le sol
-                
-                # Si c'est un bloc rebond, le joueur rebondit automatiquement
-                self.jump_multiplier = plat.properties.get('jump_multiplier', 1)
-                self.slowing_speed = plat.properties.get('slowing_speed', 1)
-                self.speed_multiplier = plat.properties.get('speed_multiplier', 1)
-                print(f"Collision avec la plateforme: {plat.properties}")
-                
+        # Collision seulement si le joueur tombe (vel_y >= 0), avec les cases de la grille sous ses pieds
+        tiles = tiles_in_rect(grid, foot_rect) if self.vel_y >= 0 else []
+        if tiles:
+            # Première ligne de cases touchée : celle sur laquelle le joueur se pose
+            row = tiles[0][0]
+            properties = [props for r, c, props in tiles if r == row][-1]
+            self.rect.bottom = row * TILE_SIZE  # Place le joueur juste au-dessus de la case
+            self.vel_y = 0                      # Annule la vitesse verticale (arrête la chute)
+            self.on_ground = True               # Le joueur est maintenant sur le sol
+
+            # Si c'est un bloc rebond, le joueur rebondit automatiquement
+            self.jump_multiplier = properties.get('jump_multiplier', 1)
+            self.slowing_speed = properties.get('slowing_speed', 1)
+            self.speed_multiplier = properties.get('speed_multiplier', 1)
+
         if(not self.on_ground):
             self.slowing_speed = 0.3
 
-    def update(self, platforms, keys):
+    def update(self, grid, keys):
         # Met à jour l'état du joueur à chaque frame
         self.handle_input(keys)           # Déplacement gauche/droite
         self.apply_gravity()              # Applique la gravité
-        self.check_collision(platforms)   # Vérifie les collisions avec les plateformes
+        self.check_collision(grid)        # Vérifie les collisions avec les cases de la grille
 
     def draw(self, surface, camera_offset=None):
         if camera_offset:
@@ -0,0 +1,346 @@
+import numpy as np
+
+from engines import make_engine, count_neighbors
+from soups import random_cells
+from stats import GridStats
+
+
+def _replace(old, new):
+    return new
+
+
+# Façons de combiner un motif collé avec les cellules déjà présentes
+PASTE_MODES = {
+    "or": np.bitwise_or,    # Ajoute les cellules vivantes du motif
+    "xor": np.bitwise_xor,  # Inverse les cellules sous les cellules vivantes du motif
+    "replace": _replace,    # Remplace la zone par le motif (cellules mortes comprises)
+}
+
+
+def paste_mode(mode):
+    """
+    Retourne la fonction de combinaison du mode de collage donné ("or", "xor" ou "replace").
+    Lève une ValueError si le mode est inconnu.
+    """
+    try:
+        return PASTE_MODES[mode]
+    except KeyError:
+        raise ValueError(f"Mode de collage inconnu : {mode!r} (or, xor ou replace)") from None
+
+
+def line_cells(r0, c0, r1, c1):
+    """
+    Retourne (lignes, colonnes) des cellules d'un segment entre (r0, c0) et (r1, c1),
+    calculées d'un coup : une cellule par pas sur l'axe le plus long, sans trou
+    (même tracé qu'un algorithme de Bresenham, aux arrondis près).
+    """
+    n = max(abs(r1 - r0), abs(c1 - c0)) + 1
+    t = np.arange(n) / max(n - 1, 1)
+    rows = np.rint(r0 + t * (r1 - r0)).astype(np.int64)
+    cols = np.rint(c0 + t * (c1 - c0)).astype(np.int64)
+    return rows, cols
+
+
+class Grid:
+    """
+    Classe qui gère la grille du Jeu de la vie de Conway.
+    Chaque cellule peut être vivante (1) ou morte (0).
+    Le calcul des générations est délégué à un moteur choisi à la création
+    ("python" = moteur de référence en listes, "numpy" = moteur vectorisé,
+    "incremental" = ne recalcule que les zones qui bougent, "parallel" = multi-coeurs).
+    La grille a des bords : les cellules hors de la grille sont mortes (voir world.World
+    pour un monde sans bords).
+    """
+    bounded = True  # La grille a une taille fixe (rows x cols)
+
+    def __init__(self, rows, cols, engine="python", rule="B3/S23"):
+        """
+        Initialise la grille avec le nombre de lignes et de colonnes donné.
+        Toutes les cellules sont mortes au départ.
+        - engine : nom du moteur de calcul (voir engines.ENGINES) ou moteur déjà créé
+        - rule : règle de l'automate, "B3/S23" = Conway (ignorée si engine est déjà un moteur)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.engine = make_engine(engine, rule=rule)
+        # Fonctions appelées avec (top, left, bottom, right) quand des cellules changent
+        # (utilisé par l'affichage pour ne redessiner que ce qui a bougé)
+        self.listeners = []
+        # Fonctions appelées avec (naissances, morts, step) pour chaque changement cellule par cellule :
+        # indices à plat (ligne * cols + colonne), step vaut True pour une nouvelle génération
+        # (utilisé par la détection de cycles ; rien n'est calculé si la liste est vide)
+        self.cell_listeners = []
+        self.generation = 0  # Numéro de la génération courante
+        self._stats = None   # Statistiques tenues à jour, créées à la première lecture (voir stats)
+        self.reset()  # Crée la grille vide
+
+    def reset(self):
+        """
+        Remet toutes les cellules à zéro (mortes).
+        """
+        before = self._snapshot()
+        self.cells = self.engine.empty(self.rows, self.cols)
+        self.generation = 0
+        self._changed(0, 0, self.rows, self.cols, before)
+
+    def randomize(self, prob=0.2, seed=None):
+        """
+        Remplit la grille avec des cellules vivantes aléatoirement, en un seul tirage.
+        - prob : probabilité qu'une cellule soit vivante (entre 0 et 1),
+          ou profil de densité (voir soups.linear_gradient, soups.radial_gradient)
+        - seed : graine ou générateur NumPy ; la même graine redonne la même grille
+        """
+        before = self._snapshot()
+        self.cells = self.engine.from_array(random_cells(self.rows, self.cols, prob, seed))
+        self.generation = 0
+        self._changed(0, 0, self.rows, self.cols, before)
+
+    def soup(self, top, left, bottom, right, prob=0.5, seed=None):
+        """
+        Remplit aléatoirement la zone [top, bottom) x [left, right) seulement ("soupe"),
+        le reste de la grille étant gardé. prob et seed : comme pour randomize.
+        """
+        cells = random_cells(max(bottom - top, 0), max(right - left, 0), prob, seed)
+        self.paste(cells, top, left, "replace")
+
+    def count_neighbors(self, r, c):
+        """
+        Compte le nombre de cellules vivantes autour de la cellule (r, c).
+        Les voisins sont les 8 cellules autour (haut, bas, gauche, droite, diagonales).
+        """
+        return count_neighbors(self.cells, r, c)
+
+    def next_generation(self):
+        """
+        Calcule la prochaine génération selon les règles du Jeu de la vie :
+        - Une cellule vivante avec 2 ou 3 voisins survit.
+        - Une cellule morte avec exactement 3 voisins devient vivante.
+        - Sinon, la cellule meurt ou reste morte.
+        """
+        if self.cell_listeners:
+            self.cells, born, died = self.engine.step_changes(self.cells)
+            for listener in self.cell_listeners:
+                listener(born, died, True)
+        else:
+            self.cells = self.engine.step(self.cells)  # Met à jour la grille
+        self.generation += 1
+        self._changed(0, 0, self.rows, self.cols)
+
+    def advance(self, n, engine=None):
+        """
+        Avance de n générations d'un coup.
+        - engine : moteur (ou nom de moteur) à utiliser pour le saut, par défaut celui de la grille.
+        Si ce moteur sait sauter plusieurs générations (HashLife), le saut est fait en une fois ;
+        sinon next_generation est appelé n fois.
+        Avec HashLife, les cellules qui sortent de la grille pendant le saut sont perdues.
+        """
+        jumper = self.engine if engine is None else make_engine(engine)
+        if hasattr(jumper, "advance"):
+            before = self._snapshot()
+            self.cells = self.engine.from_array(jumper.advance(self.cells, n))
+            self.generation += n
+            self._changed(0, 0, self.rows, self.cols, before)
+        else:
+            for _ in range(n):
+                self.next_generation()
+
+    def paste(self, pattern, top=0, left=0, mode="or"):
+        """
+        Colle un motif (tableau 2D de 0/1) dans la grille, son coin haut-gauche en (top, left),
+        en une seule opération sur toute la zone. Ce qui dépasse de la grille est ignoré.
+        - mode : "or" = ajoute les cellules vivantes du motif, "xor" = inverse les cellules
+          sous les cellules vivantes du motif, "replace" = remplace la zone par le motif
+        """
+        op = paste_mode(mode)
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        r0, c0 = max(top, 0), max(left, 0)
+        r1 = min(top + pattern.shape[0], self.rows)
+        c1 = min(left + pattern.shape[1], self.cols)
+        if r0 >= r1 or c0 >= c1:
+            return
+        part = pattern[r0 - top:r1 - top, c0 - left:c1 - left]
+        before = self._snapshot(r0, c0, r1, c1)
+        if isinstance(self.cells, np.ndarray):
+            region = self.cells[r0:r1, c0:c1]
+            region[...] = op(region, part)
+        else:
+            for r, values in zip(range(r0, r1), part):
+                row = self.cells[r]
+                row[c0:c1] = op(np.array(row[c0:c1], dtype=np.uint8), values).tolist()
+        self.engine.touch_region(r0, c0, r1, c1)
+        self._changed(r0, c0, r1, c1, before)
+
+    def fill(self, top, left, bottom, right, value=1):
+        """
+        Met toutes les cellules de la zone [top, bottom) x [left, right) à value (1 = vivantes).
+        """
+        shape = (max(bottom - top, 0), max(right - left, 0))
+        self.paste(np.broadcast_to(np.uint8(value), shape), top, left, "replace")
+
+    def clear(self, top, left, bottom, right):
+        """
+        Tue toutes les cellules de la zone [top, bottom) x [left, right).
+        """
+        self.fill(top, left, bottom, right, 0)
+
+    def copy(self, top, left, bottom, right):
+        """
+        Retourne une copie des cellules de la zone [top, bottom) x [left, right) (tableau uint8),
+        les cellules hors de la grille étant mortes. À recoller avec paste.
+        """
+        out = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint8)
+        r0, c0 = max(top, 0), max(left, 0)
+        r1, c1 = min(bottom, self.rows), min(right, self.cols)
+        if r0 < r1 and c0 < c1:
+            out[r0 - top:r1 - top, c0 - left:c1 - left] = self.window(r0, c0, r1, c1)
+        return out
+
+    def paint(self, rows, cols, value=1):
+        """
+        Met à value les cellules données par leurs lignes et colonnes (par exemple un trait
+        de souris, voir line_cells), en une seule opération. Les cellules hors de la grille sont ignorées.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        index = rows[inside] * self.cols + cols[inside]
+        if value:
+            self.set_cells(index, index[:0])
+        else:
+            self.set_cells(index[:0], index)
+
+    def get(self, r, c):
+        """
+        Retourne l'état (0 ou 1) de la cellule (r, c), 0 hors de la grille.
+        """
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return int(self.cells[r][c])
+        return 0
+
+    def window(self, top, left, bottom, right):
+        """
+        Retourne les cellules de la zone [top, bottom) x [left, right) (tableau uint8).
+        La zone doit être dans la grille ; avec le moteur numpy, c'est une vue sans copie.
+        """
+        if isinstance(self.cells, np.ndarray):
+            return self.cells[top:bottom, left:right]
+        return np.array([row[left:right] for row in self.cells[top:bottom]], dtype=np.uint8)
+
+    def alive(self):
+        """
+        Retourne les indices à plat (ligne * cols + colonne) des cellules vivantes.
+        """
+        return np.flatnonzero(np.asarray(self.cells))
+
+    @property
+    def stats(self):
+        """
+        Statistiques de la grille (population, comptes par ligne et par colonne, boîte englobante,
+        naissances et morts), tenues à jour à chaque changement à partir de la première lecture.
+        """
+        if self._stats is None:
+            self._stats = GridStats(self)
+        return self._stats
+
+    def population(self):
+        """
+        Retourne le nombre de cellules vivantes (sans parcourir la grille si les statistiques sont suivies).
+        """
+        if self._stats is not None:
+            return self._stats.population
+        return int(np.count_nonzero(np.asarray(self.cells)))
+
+    def bounding_box(self):
+        """
+        Retourne la boîte englobante (top, left, bottom, right) des cellules vivantes,
+        None si la grille est vide.
+        """
+        return self.stats.box
+
+    def close(self):
+        """
+        Libère les ressources du moteur (utile pour le moteur "parallel").
+        """
+        self.engine.close()
+
+    def toggle(self, r, c, value=None):
+        """
+        Change l'état d'une cellule (vivante/morte).
+        - Si value est None : inverse l'état (vivant <-> mort).
+        - Si value vaut 0 ou 1 : force la cellule à cette valeur.
+        """
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            before = self._snapshot(r, c, r + 1, c + 1)
+            if value is None:
+                self.cells[r][c] = 1 - self.cells[r][c]
+            else:
+                self.cells[r][c] = value
+            self.engine.touch(r, c)  # Prévient le moteur que la cellule a changé
+            self._changed(r, c, r + 1, c + 1, before)
+
+    def set_cells(self, born, died):
+        """
+        Rend vivantes les cellules born et mortes les cellules died (indices à plat,
+        ligne * cols + colonne). Sert à rejouer ou annuler des changements (voir history.py).
+        """
+        born = np.asarray(born, dtype=np.int64)
+        died = np.asarray(died, dtype=np.int64)
+        if len(born) + len(died) == 0:
+            return
+        # Valeur finale de chaque cellule (une cellule à la fois dans born et died finit morte)
+        index = np.concatenate((born, died))
+        value = np.concatenate((np.ones(len(born), np.uint8), np.zeros(len(died), np.uint8)))
+        index, last = np.unique(index[::-1], return_index=True)
+        value = value[::-1][last]
+        rows, cols = np.divmod(index, self.cols)
+        if isinstance(self.cells, np.ndarray):
+            old = self.cells[rows, cols]
+        else:
+            old = np.array([self.cells[r][c] for r, c in zip(rows.tolist(), cols.tolist())], dtype=np.uint8)
+        # Seules les cellules qui changent vraiment sont écrites et signalées
+        changed = old != value
+        if not changed.any():
+            return
+        index, value, rows, cols = index[changed], value[changed], rows[changed], cols[changed]
+        if isinstance(self.cells, np.ndarray):
+            self.cells[rows, cols] = value
+        else:
+            for r, c, v in zip(rows.tolist(), cols.tolist(), value.tolist()):
+                self.cells[r][c] = v
+        self.engine.touch_cells(rows, cols)
+        top, left = int(rows.min()), int(cols.min())
+        bottom, right = int(rows.max()) + 1, int(cols.max()) + 1
+        alive = value == 1
+        self._changed(top, left, bottom, right, changes=(index[alive], index[~alive]))
+
+    def _snapshot(self, top=0, left=0, bottom=None, right=None):
+        """
+        Copie la zone [top, bottom) x [left, right) avant une modification, pour pouvoir
+        retrouver ensuite les cellules qui ont changé. Ne copie rien si personne ne suit
+        les changements cellule par cellule.
+        """
+        if not self.cell_listeners:
+            return None
+        bottom = self.rows if bottom is None else bottom
+        right = self.cols if right is None else right
+        return np.array(self.window(top, left, bottom, right), dtype=np.uint8)
+
+    def _changed(self, top, left, bottom, right, before=None, changes=None):
+        """
+        Prévient les fonctions de self.listeners que la zone [top, bottom) x [left, right) a changé.
+        - before : copie de la zone avant la modification (voir _snapshot), pour prévenir
+          aussi self.cell_listeners des naissances et des morts (hors nouvelle génération)
+        - changes : (naissances, morts) déjà connues, à la place de before
+        """
+        for listener in self.listeners:
+            listener(top, left, bottom, right)
+        if changes is not None:
+            for listener in self.cell_listeners:
+                listener(changes[0], changes[1], False)
+        elif before is not None:
+            after = self._snapshot(top, left, bottom, right)
+            a, b = np.nonzero(before != after)
+            flat = (a + top) * self.cols + (b + left)
+            alive = after[a, b] == 1
+            for listener in self.cell_listeners:
+                listener(flat[alive], flat[~alive], False)
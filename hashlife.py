@@ -0,0 +1,334 @@
+import numpy as np
+
+from engines import NumpyEngine
+from rules import parse_rule
+
+
+class Node:
+    """
+    Noeud du quadtree HashLife.
+    Un noeud de niveau k représente un carré de 2**k x 2**k cellules,
+    découpé en 4 sous-noeuds de niveau k-1 :
+    a = haut-gauche, b = haut-droite, c = bas-gauche, d = bas-droite.
+    n est le nombre de cellules vivantes du carré.
+    Les noeuds sont canoniques : deux carrés identiques sont le même objet.
+    """
+    __slots__ = ("k", "a", "b", "c", "d", "n")
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+
+
+# Les deux feuilles (niveau 0) : cellule morte et cellule vivante
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+
+class HashLife:
+    """
+    Univers HashLife : un plan infini représenté par un quadtree de noeuds canoniques.
+    Le résultat de chaque noeud dans le futur est mémorisé, ce qui permet de sauter
+    des milliards de générations en quelques millisecondes sur les motifs réguliers.
+    Le cache est borné : au-delà de max_nodes noeuds, il est allégé entre deux pas de advance
+    (voir collect), jamais au milieu d'un calcul dont les résultats intermédiaires servent encore.
+    """
+
+    def __init__(self, rule="B3/S23", max_nodes=1 << 20):
+        """
+        - rule : règle de l'automate (les règles avec B0 ne sont pas possibles sur un plan infini)
+        - max_nodes : nombre de noeuds du cache au-delà duquel il est allégé
+        """
+        self.rule = parse_rule(rule)
+        if 0 in self.rule.births:
+            raise ValueError(f"HashLife ne gère pas les règles avec B0 : {self.rule}")
+        self.max_nodes = max_nodes
+        self.clear()
+
+    def clear(self):
+        """
+        Vide le cache des noeuds, des carrés vides et des successeurs.
+        """
+        self._nodes = {}
+        self._zeros = {}
+        self._successors = {}
+
+    def collect(self, *roots):
+        """
+        Allège le cache : ne garde que les noeuds atteignables depuis roots, les carrés vides
+        et, dans la limite de la moitié de max_nodes, les successeurs mémorisés de ces noeuds.
+        Les noeuds gardés restent canoniques ; les autres restent valides mais ne sont plus partagés.
+        """
+        nodes = {}
+
+        def keep(stack):
+            while stack:
+                m = stack.pop()
+                if m.k == 0:
+                    continue
+                key = (m.a, m.b, m.c, m.d)
+                if key not in nodes:
+                    nodes[key] = m
+                    stack.extend(key)
+
+        keep(list(roots) + list(self._zeros.values()))
+        successors = {}
+        for (m, j), result in reversed(self._successors.items()):  # Les plus récents d'abord
+            if len(nodes) >= self.max_nodes // 2:
+                break
+            if nodes.get((m.a, m.b, m.c, m.d)) is m:
+                successors[(m, j)] = result
+                keep([result])
+        self._nodes = nodes
+        self._successors = successors
+
+    def join(self, a, b, c, d):
+        """
+        Retourne le noeud canonique formé des 4 sous-noeuds donnés.
+        """
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def zero(self, k):
+        """
+        Retourne le noeud vide de niveau k.
+        """
+        node = self._zeros.get(k)
+        if node is None:
+            if k == 0:
+                node = OFF
+            else:
+                z = self.zero(k - 1)
+                node = self.join(z, z, z, z)
+            self._zeros[k] = node
+        return node
+
+    def centre(self, m):
+        """
+        Retourne un noeud de niveau k+1 contenant m en son centre, entouré de vide.
+        """
+        z = self.zero(m.k - 1)
+        return self.join(self.join(z, z, z, m.a), self.join(z, z, m.b, z),
+                         self.join(z, m.c, z, z), self.join(m.d, z, z, z))
+
+    def inner(self, m):
+        """
+        Retourne le carré central de niveau k-1 du noeud m.
+        """
+        return self.join(m.a.d, m.b.c, m.c.b, m.d.a)
+
+    def is_padded(self, m):
+        """
+        Vrai si toutes les cellules vivantes de m sont dans son carré central
+        (la couronne extérieure de 12 petits-enfants est vide).
+        """
+        if m.k < 3:
+            return False
+        return (m.a.a.n + m.a.b.n + m.a.c.n + m.b.a.n + m.b.b.n + m.b.d.n +
+                m.c.a.n + m.c.c.n + m.c.d.n + m.d.b.n + m.d.c.n + m.d.d.n) == 0
+
+    def life_4x4(self, m):
+        """
+        Cas de base : calcule le carré central 2x2 d'un noeud 4x4 après une génération.
+        """
+        cells = [[m.a.a.n, m.a.b.n, m.b.a.n, m.b.b.n],
+                 [m.a.c.n, m.a.d.n, m.b.c.n, m.b.d.n],
+                 [m.c.a.n, m.c.b.n, m.d.a.n, m.d.b.n],
+                 [m.c.c.n, m.c.d.n, m.d.c.n, m.d.d.n]]
+        result = []
+        for r in (1, 2):
+            for c in (1, 2):
+                n = sum(cells[i][j] for i in range(r - 1, r + 2) for j in range(c - 1, c + 2)) - cells[r][c]
+                result.append(ON if self.rule.table[cells[r][c], n] else OFF)
+        return self.join(*result)
+
+    def successor(self, m, j):
+        """
+        Retourne le carré central de niveau k-1 du noeud m, 2**j générations plus tard.
+        j doit être au plus k-2.
+        """
+        key = (m, j)
+        result = self._successors.get(key)
+        if result is not None:
+            return result
+        if m.n == 0:
+            result = m.a  # Le vide reste vide
+        elif m.k == 2:
+            result = self.life_4x4(m)
+        else:
+            # 9 sous-carrés qui se chevauchent, chacun avancé dans le temps
+            join = self.join
+            c1 = self.successor(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+            c2 = self.successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+            c3 = self.successor(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+            c4 = self.successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+            c5 = self.successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+            c6 = self.successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+            c7 = self.successor(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+            c8 = self.successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+            c9 = self.successor(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+            if j < m.k - 2:
+                # Un seul pas de 2**j : on recolle simplement les centres
+                result = join(join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                              join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+            else:
+                # Deux pas de 2**(k-3) générations chacun
+                result = join(self.successor(join(c1, c2, c4, c5), j),
+                              self.successor(join(c2, c3, c5, c6), j),
+                              self.successor(join(c4, c5, c7, c8), j),
+                              self.successor(join(c5, c6, c8, c9), j))
+        self._successors[key] = result
+        return result
+
+    def build(self, cells):
+        """
+        Construit le quadtree d'un tableau 2D de 0/1.
+        Retourne le noeud racine (la cellule (0, 0) du tableau est son coin haut-gauche).
+        """
+        cells = np.asarray(cells, dtype=np.uint8)
+        k = 3
+        while (1 << k) < max(cells.shape):
+            k += 1
+        square = np.zeros((1 << k, 1 << k), dtype=np.uint8)
+        square[:cells.shape[0], :cells.shape[1]] = cells
+        return self._build(square, k)
+
+    def build_blocks(self, blocks, k):
+        """
+        Construit le quadtree d'un motif donné par blocs : dictionnaire (i, j) -> tableau 0/1
+        de 2**k x 2**k cellules, le bloc (i, j) ayant son coin haut-gauche en (i * 2**k, j * 2**k).
+        Chaque bloc devient un noeud, puis les noeuds sont assemblés quatre par quatre,
+        les blocs absents étant vides : c'est l'inverse de blocks, sans allouer le carré du motif.
+        Retourne (racine, top, left).
+        """
+        if not blocks:
+            return self.zero(max(k, 3)), 0, 0
+        # Les blocs sont numérotés à partir du premier, pour que les quadrants se rejoignent
+        i0 = min(i for i, _ in blocks)
+        j0 = min(j for _, j in blocks)
+        top, left = i0 << k, j0 << k
+        nodes = {(i - i0, j - j0): self._build(np.asarray(block, dtype=np.uint8), k)
+                 for (i, j), block in blocks.items()}
+        while len(nodes) > 1:
+            parents = {(i >> 1, j >> 1) for i, j in nodes}
+            z = self.zero(k)
+            nodes = {(i, j): self.join(nodes.get((2 * i, 2 * j), z), nodes.get((2 * i, 2 * j + 1), z),
+                                       nodes.get((2 * i + 1, 2 * j), z), nodes.get((2 * i + 1, 2 * j + 1), z))
+                     for i, j in parents}
+            k += 1
+        return nodes[(0, 0)], top, left
+
+    def _build(self, square, k):
+        if k == 0:
+            return ON if square[0, 0] else OFF
+        if not square.any():
+            return self.zero(k)
+        h = 1 << (k - 1)
+        return self.join(self._build(square[:h, :h], k - 1), self._build(square[:h, h:], k - 1),
+                         self._build(square[h:, :h], k - 1), self._build(square[h:, h:], k - 1))
+
+    def paint(self, node, out, top, left):
+        """
+        Recopie les cellules vivantes du noeud dans le tableau out,
+        le coin haut-gauche du noeud étant à la position (top, left).
+        Les cellules qui tombent hors du tableau sont ignorées.
+        """
+        size = 1 << node.k
+        if (node.n == 0 or top >= out.shape[0] or left >= out.shape[1] or
+                top + size <= 0 or left + size <= 0):
+            return
+        if node.k == 0:
+            out[top, left] = 1
+            return
+        h = size >> 1
+        self.paint(node.a, out, top, left)
+        self.paint(node.b, out, top, left + h)
+        self.paint(node.c, out, top + h, left)
+        self.paint(node.d, out, top + h, left + h)
+
+    def blocks(self, node, top, left, k):
+        """
+        Parcourt les carrés non vides de niveau k (au plus) du noeud, coin haut-gauche en (top, left).
+        Produit des couples (top, left, tableau 0/1) : seules les parties vivantes sont recopiées,
+        ce qui permet de relire un motif très étendu sans allouer tout son carré.
+        """
+        if node.n == 0:
+            return
+        if node.k <= k:
+            size = 1 << node.k
+            out = np.zeros((size, size), dtype=np.uint8)
+            self.paint(node, out, 0, 0)
+            yield top, left, out
+            return
+        h = 1 << (node.k - 1)
+        yield from self.blocks(node.a, top, left, k)
+        yield from self.blocks(node.b, top, left + h, k)
+        yield from self.blocks(node.c, top + h, left, k)
+        yield from self.blocks(node.d, top + h, left + h, k)
+
+    def advance(self, root, top, left, n):
+        """
+        Avance le motif du noeud root (coin haut-gauche en (top, left)) de n générations.
+        n est décomposé en puissances de 2, chacune calculée en un seul appel à successor.
+        Retourne (racine, top, left) du résultat.
+        """
+        j = 0
+        while n > 0:
+            if n & 1:
+                if len(self._nodes) >= self.max_nodes:
+                    self.collect(root)  # Cache plein : allégé entre deux pas, jamais pendant un calcul
+                # Agrandit la racine jusqu'à ce que le motif ne puisse pas en sortir
+                while root.k < j + 2 or not self.is_padded(root):
+                    half = 1 << (root.k - 1)
+                    root, top, left = self.centre(root), top - half, left - half
+                root = self.successor(self.centre(root), j)
+                # Réduit la racine si le motif n'occupe plus que son centre
+                while root.k > 3 and self.is_padded(root) and self.is_padded(self.inner(root)):
+                    quarter = 1 << (root.k - 2)
+                    root, top, left = self.inner(root), top + quarter, left + quarter
+            n >>= 1
+            j += 1
+        return root, top, left
+
+
+class HashLifeEngine(NumpyEngine):
+    """
+    Moteur HashLife : sait avancer d'un grand nombre de générations d'un coup (advance).
+    Pendant un saut, la grille est considérée comme une fenêtre sur un plan infini :
+    les cellules qui sortent de la grille continuent d'évoluer, puis sont perdues
+    quand le résultat est recopié dans la grille. Pour une seule génération
+    (step), le résultat est identique aux autres moteurs.
+    """
+    name = "hashlife"
+
+    def __init__(self, rule="B3/S23", max_nodes=1 << 20):
+        """
+        - rule : règle de l'automate
+        - max_nodes : nombre de noeuds du cache au-delà duquel il est allégé (voir HashLife)
+        """
+        super().__init__(rule)
+        self.universe = HashLife(self.rule, max_nodes)
+
+    def advance(self, cells, n):
+        """
+        Retourne la grille après n générations (nouveau tableau).
+        """
+        cells = np.asarray(cells, dtype=np.uint8)
+        root, top, left = self.universe.advance(self.universe.build(cells), 0, 0, n)
+        out = np.zeros_like(cells)
+        self.universe.paint(root, out, top, left)
+        return out
+
+    def step(self, cells):
+        """
+        Calcule la prochaine génération.
+        """
+        return self.advance(cells, 1)
@@ -0,0 +1,137 @@
+"""
+Lancement du Jeu de la vie sans fenêtre (serveurs sans écran, calculs en lot).
+N'importe pas pygame : seule la grille et ses moteurs de calcul sont chargés.
+
+Exemple :
+    python headless.py --rows 2000 --cols 2000 --engine numpy --generations 1000
+    python headless.py --pattern gosper.rle --top 10 --left 10 --generations 500 --output fin.rle
+    python headless.py --grid-file grande.lg --rows 100000 --cols 100000 --generations 10
+    python headless.py --ensemble 5000 --rows 64 --cols 64 --density 0.5 --generations 5000 --seed 1
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+import patterns
+from census import census
+from cycles import CycleDetector
+from diskgrid import DiskGrid, create
+from ensemble import random_boards, run_ensemble
+from grid import Grid
+
+
+def run(grid, generations, detector=None):
+    """
+    Avance la grille de generations générations le plus vite possible.
+    - detector : détecteur de cycles (CycleDetector) ; dès qu'un cycle est trouvé,
+      les générations restantes sont sautées sans être calculées
+    Retourne la durée du calcul en secondes.
+    """
+    start = time.perf_counter()
+    for done in range(generations):
+        if detector is not None and detector.found is not None:
+            detector.fast_forward(generations - done)
+            break
+        grid.next_generation()
+    return time.perf_counter() - start
+
+
+def run_soups(args):
+    """
+    Calcule args.ensemble soupes aléatoires en lot (voir ensemble.py) et affiche leurs statistiques.
+    """
+    boards = random_boards(args.ensemble, args.rows, args.cols, args.density, args.seed)
+    start = time.perf_counter()
+    lifespans, periods, populations = run_ensemble(boards, args.generations, args.rule,
+                                                   args.max_period, args.workers)
+    elapsed = time.perf_counter() - start
+    stable = periods > 0
+    print(f"{args.ensemble} soupes {args.rows}x{args.cols}, densité {args.density}, en {elapsed:.3f} s")
+    print(f"Stabilisées avant {args.generations} générations : {int(stable.sum())}")
+    if stable.any():
+        print(f"Durée de vie : moyenne {lifespans[stable].mean():.1f}, médiane {np.median(lifespans[stable]):.0f}, "
+              f"maximum {int(lifespans[stable].max())}")
+        print("Périodes finales : " + ", ".join(f"{p} : {n}" for p, n in zip(*np.unique(periods[stable], return_counts=True))))
+    print(f"Population finale : moyenne {populations.mean():.1f}, maximum {int(populations.max())}")
+
+
+def run_file(args):
+    """
+    Avance une grille sur disque (voir diskgrid.py) de args.generations générations.
+    """
+    if os.path.exists(args.grid_file):
+        grid = DiskGrid(args.grid_file)
+    else:
+        grid = create(args.grid_file, args.rows, args.cols, args.rule)
+        grid.randomize(args.density, args.seed)
+    try:
+        print(f"Grille sur disque {grid.rows}x{grid.cols}, règle {grid.rule}, génération {grid.generation}")
+        start = time.perf_counter()
+        for _ in range(args.generations):
+            grid.next_generation()
+        elapsed = time.perf_counter() - start
+        print(f"{args.generations} générations en {elapsed:.3f} s, génération {grid.generation}")
+        print(f"Population finale : {grid.population()}")
+    finally:
+        grid.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jeu de la vie sans affichage")
+    parser.add_argument('--rows', type=int, default=100, help="nombre de lignes de la grille")
+    parser.add_argument('--cols', type=int, default=100, help="nombre de colonnes de la grille")
+    parser.add_argument('--engine', default='numpy', help="moteur de calcul (python, numpy, incremental, ...)")
+    parser.add_argument('--rule', default='B3/S23', help="règle de l'automate (B3/S23, B36/S23, highlife, ...)")
+    parser.add_argument('--generations', type=int, default=100, help="nombre de générations à calculer")
+    parser.add_argument('--pattern', help="fichier motif de départ .rle ou .cells (sinon grille aléatoire)")
+    parser.add_argument('--top', type=int, default=0, help="ligne où coller le motif")
+    parser.add_argument('--left', type=int, default=0, help="colonne où coller le motif")
+    parser.add_argument('--output', help="fichier .rle ou .cells où enregistrer la grille finale")
+    parser.add_argument('--density', type=float, default=0.2, help="densité de la grille aléatoire")
+    parser.add_argument('--seed', type=int, help="graine de la grille aléatoire (pour la reproduire)")
+    parser.add_argument('--stop-on-cycle', action='store_true',
+                        help="s'arrêter dès que la grille est vide, stable ou oscille")
+    parser.add_argument('--max-period', type=int, default=64, help="période maximale des oscillateurs détectés")
+    parser.add_argument('--grid-file', help="grille sur disque (.lg) à avancer bande par bande ; "
+                                               "créée aléatoire avec --rows et --cols si elle n'existe pas")
+    parser.add_argument('--census', action='store_true', help="recenser les objets de la grille finale")
+    parser.add_argument('--ensemble', type=int, metavar='N',
+                        help="calculer N soupes aléatoires indépendantes et afficher leurs statistiques")
+    parser.add_argument('--workers', type=int, help="nombre de processus pour --ensemble (par défaut, un par coeur)")
+    args = parser.parse_args(argv)
+
+    if args.ensemble:
+        run_soups(args)
+        return
+    if args.grid_file:
+        run_file(args)
+        return
+
+    grid = Grid(args.rows, args.cols, args.engine, args.rule)
+    try:
+        if args.pattern:
+            grid.paste(patterns.load(args.pattern), args.top, args.left)
+        else:
+            grid.randomize(args.density, args.seed)
+        print(f"Grille {args.rows}x{args.cols}, moteur {args.engine}, règle {grid.engine.rule}, population initiale : {grid.population()}")
+
+        detector = CycleDetector(grid, args.max_period) if args.stop_on_cycle else None
+        elapsed = run(grid, args.generations, detector)
+        speed = args.generations / elapsed if elapsed > 0 else float('inf')
+        print(f"{args.generations} générations en {elapsed:.3f} s ({speed:.1f} gen/s)")
+        if detector is not None and detector.found is not None:
+            print(f"Cycle détecté à la génération {detector.since} : {detector.found[0]}, période {detector.period}")
+        print(f"Population finale : {grid.population()}")
+        if args.census:
+            for name, count in census(grid.cells, grid.engine.rule).most_common():
+                print(f"  {name} : {count}")
+        if args.output:
+            patterns.save(grid.cells, args.output, str(grid.engine.rule))
+    finally:
+        grid.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Historique de la grille : retour en arrière, annulation des traits, accès à une génération.
+On garde, dans l'ordre, chaque changement de la grille sous forme compacte (indices des
+cellules nées et des cellules mortes), et tous les keyframe_every générations une image
+complète (keyframe). Revenir à un instant donné coûte au plus la distance jusqu'à
+l'image complète la plus proche ou jusqu'à la position actuelle.
+Les plus anciens changements sont oubliés quand la mémoire utilisée dépasse max_bytes.
+"""
+from collections import deque
+
+import numpy as np
+
+KEYFRAME_EVERY = 32          # Nombre de générations entre deux images complètes
+MAX_BYTES = 64 * 1024 * 1024  # Mémoire maximale de l'historique (64 Mo)
+
+
+def _compact(indices):
+    """
+    Retourne les indices dans le plus petit type entier qui les contient (int32 ou int64).
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) and (indices.min() < -(1 << 31) or indices.max() >= 1 << 31):
+        return indices
+    return indices.astype(np.int32)
+
+
+def _net(changes):
+    """
+    Combine une suite de changements [(naissances, morts), ...] en un seul :
+    pour chaque cellule, seul son dernier état compte.
+    """
+    if not changes:
+        nothing = np.zeros(0, dtype=np.int64)
+        return nothing, nothing
+    index = np.concatenate([np.concatenate((born, died)).astype(np.int64) for born, died in changes])
+    value = np.concatenate([np.repeat((1, 0), (len(born), len(died))) for born, died in changes])
+    # Dernière apparition de chaque cellule : première apparition dans la liste retournée
+    cells, first = np.unique(index[::-1], return_index=True)
+    alive = value[::-1][first] == 1
+    return cells[alive], cells[~alive]
+
+
+class History:
+    """
+    Historique d'une grille (Grid ou World), abonné à ses changements (cell_listeners).
+    Chaque changement est une entrée (groupe, step, génération après le changement, naissances, morts),
+    step valant True pour une génération calculée.
+    Les changements faits ensemble (un trait de souris, un collage...) forment un groupe,
+    annulé d'un coup par undo ; chaque génération calculée forme son propre groupe.
+    Après un retour en arrière, les entrées suivantes sont gardées (redo, seek vers l'avant)
+    jusqu'à ce que la grille soit modifiée.
+    """
+
+    def __init__(self, grid, keyframe_every=KEYFRAME_EVERY, max_bytes=MAX_BYTES):
+        """
+        - grid : grille à suivre
+        - keyframe_every : nombre de générations entre deux images complètes
+        - max_bytes : mémoire maximale des entrées et des images complètes
+        """
+        self.grid = grid
+        self.keyframe_every = keyframe_every
+        self.max_bytes = max_bytes
+        self.entries = deque()
+        self.first = 0          # Position (absolue) de la première entrée gardée
+        self.cursor = 0         # Position actuelle : nombre d'entrées appliquées depuis le début
+        self.keyframes = {}     # Position -> (génération, cellules vivantes)
+        self.nbytes = 0         # Mémoire utilisée
+        self._group = 0
+        self._since_keyframe = 0
+        self._replaying = False
+        self._keyframe(0)
+        grid.cell_listeners.append(self.cells_changed)
+
+    @property
+    def end(self):
+        """
+        Position juste après la dernière entrée gardée.
+        """
+        return self.first + len(self.entries)
+
+    def begin_stroke(self):
+        """
+        Commence un nouveau groupe : les modifications suivantes seront annulées ensemble.
+        """
+        self._group += 1
+
+    def cells_changed(self, born, died, step):
+        """
+        Enregistre un changement de la grille (appelé par la grille).
+        """
+        if self._replaying or (len(born) == 0 and len(died) == 0 and not step):
+            return
+        self._truncate()
+        if step:
+            self._group += 1
+            group = self._group
+            self._group += 1  # Les modifications suivantes ne seront pas annulées avec cette génération
+            generation = self.grid.generation + 1  # La grille compte la génération après nous
+        else:
+            group = self._group
+            generation = self.grid.generation
+        entry = (group, step, generation, _compact(born), _compact(died))
+        self.entries.append(entry)
+        self.nbytes += entry[3].nbytes + entry[4].nbytes
+        self.cursor += 1
+        if step:
+            self._since_keyframe += 1
+            if self._since_keyframe >= self.keyframe_every:
+                self._keyframe(self.cursor, generation)
+        self._trim()
+
+    def generation_at(self, position):
+        """
+        Retourne la génération de la grille à la position donnée de l'historique.
+        """
+        if position == self.first:
+            return self.keyframes[self.first][0]
+        return self.entries[position - 1 - self.first][2]
+
+    def undo(self):
+        """
+        Annule le dernier groupe de changements (trait de souris, collage, ou une génération).
+        Retourne False s'il n'y a plus rien à annuler.
+        """
+        if self.cursor == self.first:
+            return False
+        group = self.entries[self.cursor - 1 - self.first][0]
+        position = self.cursor - 1
+        while position > self.first and self.entries[position - 1 - self.first][0] == group:
+            position -= 1
+        self.goto(position)
+        return True
+
+    def redo(self):
+        """
+        Rejoue le groupe de changements annulé en dernier.
+        Retourne False s'il n'y a rien à rejouer.
+        """
+        if self.cursor == self.end:
+            return False
+        group = self.entries[self.cursor - self.first][0]
+        position = self.cursor + 1
+        while position < self.end and self.entries[position - self.first][0] == group:
+            position += 1
+        self.goto(position)
+        return True
+
+    def step_back(self):
+        """
+        Revient juste avant la dernière génération calculée (en annulant aussi
+        les modifications faites depuis). Retourne False si aucune génération n'est gardée.
+        """
+        for position in range(self.cursor - 1, self.first - 1, -1):
+            if self.entries[position - self.first][1]:
+                self.goto(position)
+                return True
+        return False
+
+    def seek(self, generation):
+        """
+        Ramène la grille à la génération donnée : à la dernière position de l'historique
+        où elle avait cette génération, ou en calculant les générations manquantes si elle est
+        après la fin de l'historique. Lève une ValueError si elle a été oubliée.
+        """
+        for position in range(self.end, self.first - 1, -1):
+            if self.generation_at(position) == generation:
+                self.goto(position)
+                return
+        last = self.generation_at(self.end)
+        if generation > last:
+            self.goto(self.end)
+            for _ in range(generation - last):
+                self.grid.next_generation()
+            return
+        raise ValueError(f"Génération {generation} absente de l'historique")
+
+    def goto(self, position):
+        """
+        Ramène la grille à la position donnée de l'historique, par le chemin le plus court :
+        en annulant les entrées depuis la position actuelle, ou en repartant de l'image
+        complète la plus proche avant la position et en rejouant les entrées suivantes.
+        """
+        if not self.first <= position <= self.end:
+            raise ValueError(f"Position {position} absente de l'historique")
+        keyframe = max(p for p in self.keyframes if p <= position)
+        self._replaying = True
+        try:
+            if position < self.cursor and self.cursor - position <= position - keyframe:
+                # Annulation des entrées, de la plus récente à la plus ancienne
+                changes = [(died, born) for _, _, _, born, died in self._slice(position, self.cursor)]
+                born, died = _net(changes[::-1])
+            else:
+                start = max(self.cursor, keyframe) if position >= self.cursor else keyframe
+                changes = [(born, died) for _, _, _, born, died in self._slice(start, position)]
+                if start == keyframe and start != self.cursor:
+                    # Différence entre l'état actuel et l'image complète
+                    alive = self.grid.alive()
+                    kept = self.keyframes[keyframe][1]
+                    changes.insert(0, (np.setdiff1d(kept, alive), np.setdiff1d(alive, kept)))
+                born, died = _net(changes)
+            self.grid.set_cells(born, died)
+            self.grid.generation = self.generation_at(position)
+        finally:
+            self._replaying = False
+        self.cursor = position
+
+    def _slice(self, start, stop):
+        """
+        Retourne les entrées des positions [start, stop).
+        """
+        return [self.entries[p - self.first] for p in range(start, stop)]
+
+    def _keyframe(self, position, generation=None):
+        """
+        Garde une image complète de la grille à la position donnée.
+        """
+        generation = self.grid.generation if generation is None else generation
+        alive = _compact(self.grid.alive())
+        self.keyframes[position] = (generation, alive)
+        self.nbytes += alive.nbytes
+        self._since_keyframe = 0
+
+    def _truncate(self):
+        """
+        Oublie les entrées après la position actuelle (la grille a changé après un retour en arrière).
+        """
+        while self.end > self.cursor:
+            entry = self.entries.pop()
+            self.nbytes -= entry[3].nbytes + entry[4].nbytes
+        for position in [p for p in self.keyframes if p > self.cursor]:
+            self.nbytes -= self.keyframes.pop(position)[1].nbytes
+
+    def _trim(self):
+        """
+        Oublie les plus anciennes entrées tant que la mémoire dépasse max_bytes.
+        On oublie toujours jusqu'à l'image complète suivante, pour pouvoir repartir de celle-ci.
+        """
+        while self.nbytes > self.max_bytes:
+            following = [p for p in self.keyframes if self.first < p <= self.cursor]
+            if not following:
+                break
+            start = min(following)
+            while self.first < start:
+                entry = self.entries.popleft()
+                self.nbytes -= entry[3].nbytes + entry[4].nbytes
+                self.first += 1
+            for position in [p for p in self.keyframes if p < start]:
+                self.nbytes -= self.keyframes.pop(position)[1].nbytes
@@ -0,0 +1,184 @@
+"""
+Pyramide de densité, pour afficher la grille à moins d'un pixel par cellule.
+Le niveau k de la pyramide compte les cellules vivantes de chaque bloc de 2**k x 2**k cellules :
+le niveau 1 est calculé à partir des cellules, chaque niveau suivant à partir du précédent
+(somme de 2 x 2 blocs). Pour une grille (Grid), les naissances et les morts qu'elle signale
+(cell_listeners) sont ajoutées directement aux comptes des niveaux déjà calculés ; sinon, les blocs
+des zones modifiées sont recalculés, et seulement au moment où le niveau est affiché.
+Pour un monde sans bords (World), chaque morceau a sa propre petite pyramide.
+"""
+import numpy as np
+
+MAX_MERGE = 32  # Nombre de zones modifiées gardées par niveau avant de les réunir en une seule
+
+
+def level_dtype(k):
+    """
+    Retourne le plus petit type entier qui contient le compte d'un bloc de niveau k (au plus 4**k).
+    """
+    if k <= 3:
+        return np.uint8
+    if k <= 7:
+        return np.uint16
+    return np.uint32
+
+
+def reduce_2x2(src, dst):
+    """
+    Écrit dans dst la somme de chaque bloc de 2 x 2 valeurs de src.
+    src peut avoir une ligne ou une colonne de moins que 2 x dst (bords de la grille).
+    """
+    dst[...] = 0
+    for dr in (0, 1):
+        for dc in (0, 1):
+            part = src[dr::2, dc::2]
+            dst[:part.shape[0], :part.shape[1]] += part
+
+
+class DensityPyramid:
+    """
+    Pyramide de densité d'une grille (Grid) ou d'un monde sans bords (World),
+    tenue à jour grâce aux cellules (cell_listeners) ou aux zones (listeners) que la grille signale.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.levels = {}   # Grid : niveau -> tableau des comptes
+        self.dirty = {}    # Grid : niveau -> zones modifiées (en cellules) pas encore recalculées
+        self._chunks = {}  # World : (ligne, colonne) du morceau -> (morceau, pyramide du morceau)
+        # Grid : chaque changement est signalé cellule par cellule, les zones sont alors inutiles
+        self._exact = grid.bounded and hasattr(grid, "cell_listeners")
+        if self._exact:
+            grid.cell_listeners.append(self.cells_changed)
+        grid.listeners.append(self.grid_changed)
+
+    def grid_changed(self, top, left, bottom, right):
+        """
+        Appelée par la grille quand la zone [top, bottom) x [left, right) a changé.
+        """
+        if not self.grid.bounded:
+            self._forget_chunks(top, left, bottom, right)
+            return
+        if self._exact:
+            return  # Déjà pris en compte par cells_changed
+        for boxes in self.dirty.values():
+            boxes.append((top, left, bottom, right))
+            if len(boxes) > MAX_MERGE:
+                # Trop de petites zones : on les remplace par la zone qui les contient toutes
+                boxes[:] = [(min(b[0] for b in boxes), min(b[1] for b in boxes),
+                             max(b[2] for b in boxes), max(b[3] for b in boxes))]
+
+    def cells_changed(self, born, died, step):
+        """
+        Appelée par la grille avec les cellules nées et mortes (indices à plat) :
+        ajoute 1 ou retire 1 au bloc qui les contient, dans chaque niveau déjà calculé.
+        """
+        if not self.levels or (len(born) == 0 and len(died) == 0):
+            return
+        born_rows, born_cols = np.divmod(np.asarray(born, dtype=np.int64), self.grid.cols)
+        died_rows, died_cols = np.divmod(np.asarray(died, dtype=np.int64), self.grid.cols)
+        for j, level in self.levels.items():
+            np.add.at(level, (born_rows >> j, born_cols >> j), 1)
+            np.subtract.at(level, (died_rows >> j, died_cols >> j), 1)
+
+    def window(self, k, top, left, bottom, right):
+        """
+        Retourne les comptes des blocs de niveau k des lignes [top, bottom) et colonnes [left, right)
+        (en blocs de 2**k cellules), 0 pour les blocs hors de la grille.
+        """
+        out = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint32)
+        if out.size == 0:
+            return out
+        if not self.grid.bounded:
+            self._world_window(k, top, left, out)
+            return out
+        level = self._level(k)
+        r0, c0 = max(top, 0), max(left, 0)
+        r1, c1 = min(bottom, level.shape[0]), min(right, level.shape[1])
+        if r0 < r1 and c0 < c1:
+            out[r0 - top:r1 - top, c0 - left:c1 - left] = level[r0:r1, c0:c1]
+        return out
+
+    def _level(self, k):
+        """
+        Retourne le niveau k de la pyramide d'une grille, après avoir recalculé ses blocs modifiés
+        (et ceux des niveaux inférieurs dont il dépend).
+        """
+        grid = self.grid
+        for j in range(1, k + 1):
+            if j not in self.levels:
+                shape = ((grid.rows + (1 << j) - 1) >> j, (grid.cols + (1 << j) - 1) >> j)
+                self.levels[j] = np.zeros(shape, dtype=level_dtype(j))
+                self.dirty[j] = [(0, 0, grid.rows, grid.cols)]
+            level, boxes = self.levels[j], self.dirty[j]
+            for top, left, bottom, right in boxes:
+                # Blocs du niveau j touchés par la zone, recalculés à partir du niveau j - 1
+                r0, c0 = top >> j, left >> j
+                r1, c1 = ((bottom - 1) >> j) + 1, ((right - 1) >> j) + 1
+                if j == 1:
+                    src = grid.window(2 * r0, 2 * c0, min(2 * r1, grid.rows), min(2 * c1, grid.cols))
+                else:
+                    src = self.levels[j - 1][2 * r0:2 * r1, 2 * c0:2 * c1]
+                reduce_2x2(src, level[r0:r1, c0:c1])
+            boxes.clear()
+        return self.levels[k]
+
+    def _forget_chunks(self, top, left, bottom, right):
+        """
+        Oublie les pyramides des morceaux de la zone [top, bottom) x [left, right).
+        """
+        c = self.grid.chunk
+        ci0, ci1 = top // c, (bottom - 1) // c + 1
+        cj0, cj1 = left // c, (right - 1) // c + 1
+        if (ci1 - ci0) * (cj1 - cj0) <= len(self._chunks):
+            for ci in range(ci0, ci1):
+                for cj in range(cj0, cj1):
+                    self._chunks.pop((ci, cj), None)
+        else:
+            self._chunks = {key: value for key, value in self._chunks.items()
+                            if not (ci0 <= key[0] < ci1 and cj0 <= key[1] < cj1)}
+
+    def _chunk_levels(self, key, block):
+        """
+        Retourne la pyramide d'un morceau : liste des niveaux 0 (le morceau) à log2(chunk) (un seul bloc).
+        """
+        cached = self._chunks.get(key)
+        if cached is not None and cached[0] is block:
+            return cached[1]
+        levels = [block]
+        n = block.shape[0]
+        while n > 1:
+            n //= 2
+            levels.append(levels[-1].reshape(n, 2, n, 2).sum(axis=(1, 3), dtype=np.uint32))
+        self._chunks[key] = (block, levels)
+        return levels
+
+    def _world_window(self, k, top, left, out):
+        """
+        Remplit out avec les comptes des blocs de niveau k d'un monde sans bords,
+        son coin haut-gauche étant le bloc (top, left). Seuls les morceaux existants sont parcourus.
+        """
+        world = self.grid
+        c = world.chunk
+        base = c.bit_length() - 1  # Niveau où un morceau ne fait plus qu'un bloc
+        h, w = out.shape
+        if k <= base:
+            n = c >> k  # Côté d'un morceau en blocs de niveau k
+            ci0, ci1 = top // n, (top + h - 1) // n + 1
+            cj0, cj1 = left // n, (left + w - 1) // n + 1
+        else:
+            shift = k - base  # Un bloc de niveau k contient 2**shift x 2**shift morceaux
+            ci0, ci1 = top << shift, (top + h) << shift
+            cj0, cj1 = left << shift, (left + w) << shift
+        if (ci1 - ci0) * (cj1 - cj0) <= len(world.chunks):
+            keys = [(ci, cj) for ci in range(ci0, ci1) for cj in range(cj0, cj1) if (ci, cj) in world.chunks]
+        else:
+            keys = [(ci, cj) for ci, cj in world.chunks if ci0 <= ci < ci1 and cj0 <= cj < cj1]
+        for ci, cj in keys:
+            levels = self._chunk_levels((ci, cj), world.chunks[(ci, cj)])
+            if k <= base:
+                r0, c0 = ci * n - top, cj * n - left
+                part = levels[k][max(-r0, 0):h - r0, max(-c0, 0):w - c0]
+                out[max(r0, 0):max(r0, 0) + part.shape[0], max(c0, 0):max(c0, 0) + part.shape[1]] = part
+            else:
+                out[(ci >> shift) - top, (cj >> shift) - left] += levels[base][0, 0]
@@ -0,0 +1,124 @@
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from engines import NumpyEngine, neighbor_sum
+from rules import parse_rule
+
+# Tableaux partagés vus par chaque processus de calcul (remplis par _attach)
+_buffers = []
+_arrays = []
+_rule = []
+
+
+def _attach(names, shape, rule):
+    """
+    Initialise un processus de calcul : s'attache aux deux tableaux en mémoire partagée
+    et compile la règle à appliquer.
+    """
+    _rule.append(parse_rule(rule))
+    for name in names:
+        shm = shared_memory.SharedMemory(name=name)
+        _buffers.append(shm)  # Garde une référence pour que la mémoire reste ouverte
+        _arrays.append(np.ndarray(shape, dtype=np.uint8, buffer=shm.buf))
+
+
+def _step_band(task):
+    """
+    Calcule une bande de lignes [start, end) de la génération suivante.
+    Lit la bande et une ligne de halo au-dessus et au-dessous dans le tableau source,
+    puis écrit le résultat dans l'autre tableau.
+    """
+    src, start, end = task
+    source, dest = _arrays[src], _arrays[1 - src]
+    # Les tableaux ont une ligne morte en haut et en bas : la ligne r de la grille est la ligne r+1
+    band = source[start:end + 2]
+    dest[start + 1:end + 1] = _rule[0].apply(band[1:-1], neighbor_sum(band)[1:-1])
+
+
+class ParallelEngine(NumpyEngine):
+    """
+    Moteur multi-coeurs : la grille est découpée en bandes de lignes calculées en parallèle
+    par un groupe de processus. Les deux générations (courante et suivante) sont dans
+    de la mémoire partagée ; chaque processus ne lit que sa bande et une ligne de halo
+    de chaque côté. Donne exactement le même résultat que le moteur "numpy".
+    Penser à appeler close() pour arrêter les processus et libérer la mémoire partagée.
+    """
+    name = "parallel"
+
+    def __init__(self, rule="B3/S23", workers=None):
+        """
+        - rule : règle de l'automate
+        - workers : nombre de processus de calcul (par défaut, le nombre de coeurs)
+        """
+        super().__init__(rule)
+        self.workers = workers or os.cpu_count()
+        self._pool = None
+        self._shms = []
+        self._views = []
+        self._current = 0
+
+    def empty(self, rows, cols):
+        """
+        Retourne une grille vide (toutes les cellules mortes), en mémoire partagée.
+        """
+        shape = (rows + 2, cols)  # Une ligne morte en haut et en bas pour les halos
+        if self._pool is not None and self._views[0].shape == (rows, cols):
+            # Même taille : on réutilise la mémoire partagée et les processus
+            self._views[self._current][:] = 0
+            return self._views[self._current]
+        self.close()
+        size = max(shape[0] * shape[1], 1)
+        self._shms = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        arrays = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in self._shms]
+        for array in arrays:
+            array[:] = 0
+        self._views = [array[1:-1] for array in arrays]
+        self._current = 0
+        # Bandes de lignes, une par processus
+        limits = np.linspace(0, rows, min(self.workers, max(rows, 1)) + 1).astype(int)
+        self._bands = [(int(a), int(b)) for a, b in zip(limits[:-1], limits[1:]) if b > a]
+        self._pool = Pool(self.workers, initializer=_attach,
+                          initargs=([shm.name for shm in self._shms], shape, str(self.rule)))
+        return self._views[0]
+
+    def from_array(self, array):
+        """
+        Convertit un tableau 2D (liste de listes ou tableau NumPy) en grille de ce moteur.
+        """
+        array = np.asarray(array, dtype=np.uint8)
+        cells = self.empty(*array.shape)
+        cells[:] = array
+        return cells
+
+    def step(self, cells):
+        """
+        Calcule la prochaine génération en parallèle.
+        Retourne une vue sur le tableau partagé qui contient le résultat.
+        """
+        if self._pool is None or cells is not self._views[self._current]:
+            if self._pool is not None and np.shape(cells) == self._views[self._current].shape:
+                self._views[self._current][:] = cells  # Grille remplacée de l'extérieur
+            else:
+                cells = self.from_array(cells)
+        self._pool.map(_step_band, [(self._current, start, end) for start, end in self._bands])
+        self._current = 1 - self._current
+        return self._views[self._current]
+
+    def close(self):
+        """
+        Arrête les processus de calcul et libère la mémoire partagée.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._views = []
+        for shm in self._shms:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # Une ancienne grille utilise encore ce tableau : il sera libéré avec elle
+            shm.unlink()
+        self._shms = []
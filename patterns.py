@@ -0,0 +1,230 @@
+"""
+Lecture et écriture des motifs du Jeu de la vie aux formats standards :
+- RLE (.rle) : "x = 3, y = 3, rule = B3/S23" puis des séquences comme "bo$2bo$3o!"
+- texte (.cells) : une ligne par ligne de cellules, '.' = morte, 'O' = vivante, '!' = commentaire
+Les fichiers sont lus par blocs, sans construire de liste de lignes,
+et les cellules sont placées directement dans un tableau NumPy.
+"""
+import re
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20         # Taille des blocs lus dans le fichier (1 Mo)
+RLE_LINE_LENGTH = 70         # Longueur maximale d'une ligne RLE écrite
+WHITESPACE = b' \t\r\n\v\f'  # Caractères ignorés dans le corps d'un fichier RLE
+
+RLE_HEADER = re.compile(rb'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)')
+
+
+def _read_header(file):
+    """
+    Lit les commentaires (#...) et l'en-tête d'un fichier RLE.
+    Retourne (lignes, colonnes).
+    """
+    for line in file:
+        line = line.strip()
+        if not line or line.startswith(b'#'):
+            continue
+        match = RLE_HEADER.match(line)
+        if match is None:
+            raise ValueError(f"En-tête RLE invalide : {line[:40]!r}")
+        return int(match.group(2)), int(match.group(1))
+    raise ValueError("Fichier RLE vide")
+
+
+def read_rle(file):
+    """
+    Lit un motif RLE depuis un fichier ouvert en binaire.
+    Retourne un tableau NumPy uint8 (lignes x colonnes) de 0/1.
+    Le corps du fichier est traité par blocs : chaque bloc est découpé en jetons
+    (nombre, lettre) puis les positions des suites de cellules vivantes sont
+    calculées en une fois avec NumPy, sans boucle Python par jeton.
+    """
+    rows, cols = _read_header(file)
+    out = np.zeros((rows, cols), dtype=np.uint8)
+    flat = out.reshape(-1)
+    row, col = 0, 0  # Position courante au début du bloc
+    rest = b''
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        # Les blancs sont retirés d'abord : un nombre peut être séparé de sa lettre par une fin de ligne
+        data = rest + chunk.translate(None, WHITESPACE)
+        # Garde pour le bloc suivant un éventuel jeton coupé en deux (chiffres sans lettre) ;
+        # en fin de fichier, un nombre sans lettre est ignoré
+        end = len(data.rstrip(b'0123456789'))
+        data, rest = data[:end], data[end:]
+        stop = data.find(b'!')
+        if stop >= 0:
+            data = data[:stop]
+        counts, tags = _tokenize(data)
+        if len(tags):
+            row, col = _place_runs(counts, tags, flat, rows, cols, row, col)
+        if stop >= 0 or not chunk:
+            return out
+
+
+def _tokenize(data):
+    """
+    Découpe un bloc RLE en jetons.
+    Retourne (counts, tags) : le nombre de répétitions et la lettre de chaque jeton
+    (un nombre absent vaut 1). Le bloc ne doit contenir ni blancs (voir WHITESPACE)
+    ni chiffres après sa dernière lettre.
+    """
+    chars = np.frombuffer(data, dtype=np.uint8)
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+    is_tag = ~is_digit
+    tag_pos = np.flatnonzero(is_tag)
+    digit_pos = np.flatnonzero(is_digit)
+    # Chaque chiffre appartient à la lettre qui le suit ; son poids dépend de sa place dans le nombre
+    owner = np.searchsorted(tag_pos, digit_pos)
+    power = tag_pos[owner] - 1 - digit_pos
+    values = (chars[digit_pos] - ord('0')) * 10.0 ** power
+    counts = np.bincount(owner, weights=values, minlength=len(tag_pos)).astype(np.int64)
+    counts[counts == 0] = 1
+    return counts, chars[tag_pos]
+
+
+def _place_runs(counts, tags, flat, rows, cols, row, col):
+    """
+    Place les jetons RLE (nombre, lettre) d'un bloc dans le tableau aplati flat,
+    à partir de la position (row, col). Retourne la position à la fin du bloc.
+    """
+    newline = tags == ord('$')
+    # Numéro de ligne de chaque jeton : lignes sautées par les '$' précédents
+    line_steps = np.where(newline, counts, 0)
+    token_rows = row + np.cumsum(line_steps) - line_steps
+    # Colonne de chaque jeton : cellules avancées depuis le dernier '$'
+    col_steps = np.where(newline, 0, counts)
+    advanced = np.cumsum(col_steps) - col_steps
+    last_newline = np.maximum.accumulate(np.where(newline, np.arange(len(tags)), -1))
+    reset = np.where(last_newline >= 0, (advanced + col_steps)[np.maximum(last_newline, 0)], 0)
+    token_cols = np.where(last_newline >= 0, advanced - reset, col + advanced)
+
+    # Suites de cellules vivantes : toute lettre autre que 'b', '.' et '$'
+    alive = ~newline & (tags != ord('b')) & (tags != ord('.'))
+    starts, lengths, run_rows = token_cols[alive], counts[alive], token_rows[alive]
+    inside = run_rows < rows
+    starts, lengths, run_rows = starts[inside], lengths[inside], run_rows[inside]
+    lengths = np.clip(np.minimum(lengths, cols - starts), 0, None)
+    if lengths.sum():
+        # Indices de toutes les cellules des suites, sans boucle Python
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        flat[np.repeat(run_rows * cols + starts, lengths) + offsets] = 1
+
+    end_row = int(token_rows[-1] + line_steps[-1])
+    end_col = 0 if newline[-1] else int(token_cols[-1] + col_steps[-1])
+    return end_row, end_col
+
+
+def read_plaintext(file):
+    """
+    Lit un motif au format texte (.cells) depuis un fichier ouvert en binaire.
+    'O' ou '*' = cellule vivante, tout autre caractère = cellule morte,
+    les lignes commençant par '!' sont des commentaires.
+    Retourne un tableau NumPy uint8 (lignes x colonnes) de 0/1.
+    """
+    live_rows, live_cols = [], []
+    rows = cols = 0
+    for line in file:
+        if line.startswith(b'!'):
+            continue
+        line = line.rstrip(b'\r\n')
+        chars = np.frombuffer(line, dtype=np.uint8)
+        found = np.flatnonzero((chars == ord('O')) | (chars == ord('*')))
+        if len(found):
+            live_cols.append(found)
+            live_rows.append(np.full(len(found), rows))
+        cols = max(cols, len(line))
+        rows += 1
+    out = np.zeros((rows, cols), dtype=np.uint8)
+    if live_rows:
+        out[np.concatenate(live_rows), np.concatenate(live_cols)] = 1
+    return out
+
+
+def load(filename):
+    """
+    Charge un motif depuis un fichier .rle ou texte (.cells, .txt).
+    Retourne un tableau NumPy uint8 de 0/1.
+    """
+    with open(filename, 'rb') as file:
+        if filename.lower().endswith('.rle'):
+            return read_rle(file)
+        return read_plaintext(file)
+
+
+def crop(cells):
+    """
+    Retourne la plus petite partie du tableau qui contient toutes les cellules vivantes
+    (tableau vide 0x0 si aucune cellule n'est vivante).
+    """
+    cells = np.asarray(cells, dtype=np.uint8)
+    live_rows = np.flatnonzero(cells.any(axis=1))
+    if len(live_rows) == 0:
+        return cells[:0, :0]
+    live_cols = np.flatnonzero(cells.any(axis=0))
+    return cells[live_rows[0]:live_rows[-1] + 1, live_cols[0]:live_cols[-1] + 1]
+
+
+def write_rle(cells, file, rule="B3/S23"):
+    """
+    Écrit les cellules vivantes (recadrées sur leur boîte englobante) au format RLE
+    dans un fichier ouvert en texte.
+    """
+    cells = crop(cells)
+    rows, cols = cells.shape
+    file.write(f"x = {cols}, y = {rows}, rule = {rule}\n")
+    line = ''
+    pending_rows = 0  # Fins de ligne '$' pas encore écrites (lignes vides consécutives)
+
+    def emit(count, tag):
+        nonlocal line
+        token = (str(count) if count > 1 else '') + tag
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            file.write(line + '\n')
+            line = ''
+        line += token
+
+    for r in range(rows):
+        row = cells[r]
+        # Limites des suites de cellules identiques dans la ligne
+        edges = np.flatnonzero(np.diff(row)) + 1
+        starts = np.concatenate(([0], edges))
+        ends = np.concatenate((edges, [cols]))
+        if not row[starts[-1]]:
+            starts, ends = starts[:-1], ends[:-1]  # Cellules mortes en fin de ligne : inutiles
+        if len(starts) == 0:
+            pending_rows += 1
+            continue
+        if r > 0:
+            emit(pending_rows + 1, '$')
+        pending_rows = 0
+        for start, end in zip(starts, ends):
+            emit(int(end - start), 'o' if row[start] else 'b')
+    emit(1, '!')
+    file.write(line + '\n')
+
+
+def write_plaintext(cells, file, name=None):
+    """
+    Écrit les cellules vivantes (recadrées sur leur boîte englobante) au format texte (.cells)
+    dans un fichier ouvert en texte.
+    """
+    cells = crop(cells)
+    if name:
+        file.write(f"!Name: {name}\n")
+    chars = np.where(cells == 1, ord('O'), ord('.')).astype(np.uint8)
+    for row in chars:
+        file.write(row.tobytes().decode('ascii') + '\n')
+
+
+def save(cells, filename, rule="B3/S23"):
+    """
+    Enregistre les cellules vivantes dans un fichier .rle ou texte (.cells, .txt),
+    selon l'extension. rule : règle écrite dans l'en-tête RLE.
+    """
+    with open(filename, 'w') as file:
+        if filename.lower().endswith('.rle'):
+            write_rle(cells, file, rule)
+        else:
+            write_plaintext(cells, file)
@@ -0,0 +1,133 @@
+"""
+Mesure du temps passé dans chaque phase d'une image de la boucle de jeu
+(événements, dessin à la souris, calcul des générations, affichage...).
+Les durées des dernières images sont gardées pour calculer des centiles glissants,
+et chaque image peut être ajoutée à un fichier .csv ou .jsonl pour une analyse ultérieure.
+Quand la mesure est désactivée, chaque appel se limite à un test : le coût est négligeable.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+
+# Phases d'une image de game_loop, dans l'ordre
+PHASES = ("events", "paint", "step", "draw", "ui", "display", "wait")
+
+
+class Profiler:
+    """
+    Chronomètre des phases d'une image.
+    Usage, à chaque image : start_frame(), puis mark(phase) à la fin de chaque phase
+    (le temps écoulé depuis la marque précédente est attribué à cette phase), puis end_frame().
+    La mesure s'active et se désactive avec enable, à tout moment de l'image.
+    """
+
+    def __init__(self, phases=PHASES, window=240, path=None):
+        """
+        - phases : noms des phases mesurées
+        - window : nombre d'images gardées pour les centiles
+        - path : fichier .csv ou .jsonl où ajouter une ligne par image (optionnel)
+        """
+        self.phases = tuple(phases)
+        self.window = window
+        self.enabled = False  # Rien n'est mesuré tant que la mesure n'est pas activée (voir enable)
+        self.frames = 0       # Nombre d'images mesurées
+        self._index = {name: k for k, name in enumerate(self.phases)}
+        self._times = np.zeros((window, len(self.phases)))  # Tampon circulaire des durées (s)
+        self._current = [0.0] * len(self.phases)
+        self._last = 0.0
+        self._file = None
+        self._writer = None
+        if path is not None:
+            self.open(path)
+
+    def enable(self, on=True):
+        """
+        Active (ou désactive si on est faux) la mesure. À l'activation, l'image en cours
+        repart de maintenant : la première marque ne compte pas le temps passé désactivé.
+        """
+        started = on and not self.enabled
+        self.enabled = bool(on)
+        if started:
+            self.start_frame()
+
+    def start_frame(self):
+        """
+        À appeler au début de chaque image.
+        """
+        if not self.enabled:
+            return
+        self._current = [0.0] * len(self.phases)
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Attribue à la phase donnée le temps écoulé depuis la marque précédente.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self, **extra):
+        """
+        À appeler à la fin de chaque image : range ses durées dans le tampon
+        et l'ajoute au fichier s'il y en a un.
+        - extra : valeurs ajoutées à la ligne du fichier (par exemple le nombre de générations)
+        """
+        if not self.enabled:
+            return
+        self._times[self.frames % self.window] = self._current
+        self.frames += 1
+        if self._writer is not None:
+            record = {"frame": self.frames, "time": time.time()}
+            record.update((name, round(t * 1000, 3)) for name, t in zip(self.phases, self._current))
+            record.update(extra)
+            self._writer(record)
+
+    def percentiles(self, q=(50, 95, 99)):
+        """
+        Retourne {phase: durées en millisecondes aux centiles q} sur les dernières images,
+        plus "total" pour l'image entière. Dictionnaire vide si aucune image n'a été mesurée.
+        """
+        n = min(self.frames, self.window)
+        if n == 0:
+            return {}
+        times = self._times[:n] * 1000
+        values = np.percentile(times, q, axis=0)
+        result = {name: values[:, k] for k, name in enumerate(self.phases)}
+        result["total"] = np.percentile(times.sum(axis=1), q)
+        return result
+
+    def open(self, path):
+        """
+        Ajoute désormais une ligne par image au fichier donné (.jsonl, sinon CSV), et active la mesure.
+        """
+        self.close()
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        if str(path).endswith(".jsonl"):
+            self._writer = lambda record: self._file.write(json.dumps(record) + "\n")
+        else:
+            self._writer = self._write_csv
+        self.enable()
+
+    def _write_csv(self, record):
+        """
+        Ajoute une ligne au fichier CSV ; les colonnes sont celles de la première ligne.
+        """
+        writer = csv.DictWriter(self._file, list(record), extrasaction="ignore")
+        if self._file.tell() == 0:
+            writer.writeheader()
+        writer.writerow(record)
+        self._writer = writer.writerow
+
+    def close(self):
+        """
+        Ferme le fichier de mesures s'il y en a un.
+        """
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._writer = None
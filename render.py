@@ -0,0 +1,222 @@
+import math
+
+import numpy as np
+import pygame
+
+from lod import DensityPyramid
+
+
+def visible_window(grid, cam):
+    """
+    Calcule la partie de la grille (ou du monde sans bords) visible par la caméra.
+    Retourne (r0, c0, fenêtre) où fenêtre est le tableau uint8 des cellules visibles
+    et (r0, c0) la position de son coin haut-gauche dans la grille.
+    """
+    size = cam.cell_size
+    r0 = int(cam.y // size)
+    c0 = int(cam.x // size)
+    r1 = int((cam.y + cam.view_height) // size) + 1
+    c1 = int((cam.x + cam.view_width) // size) + 1
+    if grid.bounded:
+        r0, c0 = max(r0, 0), max(c0, 0)
+        r1, c1 = min(r1, grid.rows), min(c1, grid.cols)
+    if r1 <= r0 or c1 <= c0:
+        return r0, c0, np.zeros((0, 0), dtype=np.uint8)
+    return r0, c0, grid.window(r0, c0, r1, c1)
+
+
+class GridRenderer:
+    """
+    Affiche la partie visible de la grille en une seule copie d'image.
+    Les cellules visibles sont écrites dans une petite surface où 1 pixel = 1 cellule
+    (surface à palette : la valeur de la cellule est directement la couleur),
+    puis cette surface est agrandie à la taille des cellules et copiée à l'écran.
+    Le coût d'une image dépend de la taille de la vue, pas de la taille de la grille
+    ni du nombre de cellules vivantes.
+    En dessous d'un pixel par cellule (cell_size < 1), chaque pixel montre la densité d'un bloc
+    de cellules, lue dans une pyramide de densité (voir lod.py) plutôt que dans les cellules.
+    """
+
+    def __init__(self, alive_color=(0, 255, 0), dead_color=(0, 0, 0)):
+        """
+        - alive_color : couleur des cellules vivantes
+        - dead_color : couleur des cellules mortes (fond)
+        """
+        self.palette = [dead_color, alive_color]
+        # Palette des densités : du fond (bloc vide) à la couleur des cellules vivantes (bloc plein)
+        shade = np.linspace(0, 1, 256).reshape(-1, 1)
+        self.density_palette = [tuple(c) for c in np.rint(
+            np.array(dead_color) + shade * (np.array(alive_color) - np.array(dead_color))).astype(int).tolist()]
+        self._small = None   # Surface 1 pixel = 1 cellule, réutilisée tant que sa taille ne change pas
+        self._scaled = None  # Surface agrandie, réutilisée de même
+        self._density = None  # Surface 1 pixel = 1 bloc (vue dézoomée)
+        self._pyramid = None  # Pyramide de densité, créée au premier affichage dézoomé
+
+    def draw(self, surface, grid, cam, areas=None):
+        """
+        Dessine les cellules visibles de la grille sur la surface, selon la caméra.
+        - areas : liste de rectangles de l'écran à redessiner (par défaut, toute la vue)
+        """
+        if cam.cell_size < 1:
+            self._draw_density(surface, grid, cam, areas)
+            return
+        r0, c0, window = visible_window(grid, cam)
+        h, w = window.shape
+        if h == 0 or w == 0:
+            return
+        if self._small is None or self._small.get_size() != (w, h):
+            self._small = pygame.Surface((w, h), depth=8)
+            self._small.set_palette(self.palette)
+        pygame.surfarray.blit_array(self._small, window.T)  # Écriture directe des cellules
+
+        size = cam.cell_size
+        scaled_size = (w * size, h * size)
+        if self._scaled is None or self._scaled.get_size() != scaled_size:
+            self._scaled = pygame.Surface(scaled_size, depth=8)
+            self._scaled.set_palette(self.palette)
+        pygame.transform.scale(self._small, scaled_size, self._scaled)
+        # On limite la copie à la zone de la vue (pour ne pas déborder sur les boutons)
+        view = pygame.Rect(0, 0, cam.view_width, cam.view_height)
+        clip = surface.get_clip()
+        for area in areas or [view]:
+            surface.set_clip(view.clip(area))
+            surface.blit(self._scaled, (c0 * size - cam.x, r0 * size - cam.y))
+        surface.set_clip(clip)
+
+    def _draw_density(self, surface, grid, cam, areas):
+        """
+        Dessine la vue dézoomée : un pixel par bloc de 2**k x 2**k cellules, de la couleur du fond
+        à celle des cellules vivantes selon la part de cellules vivantes du bloc.
+        """
+        if self._pyramid is None or self._pyramid.grid is not grid:
+            self._pyramid = DensityPyramid(grid)
+        k = max(round(-math.log2(cam.cell_size)), 1)  # Niveau de la pyramide : 2**k cellules par pixel
+        size = cam.cell_size * (1 << k)  # Taille d'un bloc en pixels (1 pour un zoom en puissance de 2)
+        r0 = int(cam.y // size)
+        c0 = int(cam.x // size)
+        r1 = int((cam.y + cam.view_height) // size) + 1
+        c1 = int((cam.x + cam.view_width) // size) + 1
+        counts = self._pyramid.window(k, r0, c0, r1, c1)
+        # Racine de la densité : un bloc presque vide reste visible
+        shade = np.ceil(np.sqrt(counts / float(1 << 2 * k)) * 255).astype(np.uint8)
+        h, w = shade.shape
+        if self._density is None or self._density.get_size() != (w, h):
+            self._density = pygame.Surface((w, h), depth=8)
+            self._density.set_palette(self.density_palette)
+        pygame.surfarray.blit_array(self._density, shade.T)
+        image = self._density
+        if size != 1:
+            image = pygame.transform.scale(image, (round(w * size), round(h * size)))
+        view = pygame.Rect(0, 0, cam.view_width, cam.view_height)
+        clip = surface.get_clip()
+        for area in areas or [view]:
+            surface.set_clip(view.clip(area))
+            surface.fill(self.palette[0])  # Hors de la grille (si elle a des bords)
+            surface.blit(image, (c0 * size - cam.x, r0 * size - cam.y))
+        surface.set_clip(clip)
+
+
+class DirtyTracker:
+    """
+    Suit les zones de l'écran qui doivent être redessinées d'une image à l'autre.
+    Elle est prévenue par la grille (toggle, collage, nouvelle génération) et
+    compare la position de la caméra à celle de l'image précédente.
+    - petites modifications (clic, dessin) : on redessine seulement ces cellules ;
+    - nouvelle génération : on compare la partie visible à l'image précédente,
+      tuile par tuile, pour ne garder que les tuiles qui ont changé ;
+    - caméra déplacée ou zone modifiée trop grande : on redessine tout l'écran.
+    """
+
+    def __init__(self, grid, tile=8, full_ratio=0.3, box_limit=64):
+        """
+        - grid : grille à surveiller
+        - tile : côté (en cellules) des tuiles comparées après une génération
+        - full_ratio : part de la vue au-delà de laquelle on redessine tout l'écran
+        - box_limit : nombre de cellules au-delà duquel une modification est traitée par comparaison
+        """
+        self.tile = tile
+        self.full_ratio = full_ratio
+        self.box_limit = box_limit
+        self.boxes = []           # Petites zones modifiées (en cellules)
+        self.compare = False      # True si une grande zone a changé : il faudra comparer
+        self.full = True          # True si tout l'écran doit être redessiné
+        self._view = None         # Position de la caméra à l'image précédente
+        self._window = None       # Cellules visibles à l'image précédente
+        grid.listeners.append(self.grid_changed)
+
+    def grid_changed(self, top, left, bottom, right):
+        """
+        Appelée par la grille quand la zone [top, bottom) x [left, right) a changé.
+        """
+        if (bottom - top) * (right - left) > self.box_limit:
+            self.compare = True
+        else:
+            self.boxes.append((top, left, bottom, right))
+
+    def invalidate(self):
+        """
+        Demande de redessiner tout l'écran à la prochaine image.
+        """
+        self.full = True
+
+    def collect(self, grid, cam):
+        """
+        Retourne la liste des rectangles de l'écran à redessiner pour cette image
+        ([] si rien n'a changé), ou None s'il faut redessiner tout l'écran.
+        """
+        view = (cam.x, cam.y, cam.cell_size)
+        if cam.cell_size < 1:
+            # Vue dézoomée : redessinée entièrement à partir de la pyramide de densité,
+            # sans lire les cellules visibles (il peut y en avoir des centaines de millions)
+            self.boxes = []
+            self.compare = False
+            self.full = False
+            self._view = None
+            self._window = None
+            return None
+        r0, c0, window = visible_window(grid, cam)
+        if self.full or view != self._view or window.shape != self._window.shape:
+            rects = None
+        else:
+            rects = [self._cells_to_screen(box, cam) for box in self.boxes]
+            if self.compare:
+                rects += self._changed_tiles(window, r0, c0, cam)
+            screen_area = cam.view_width * cam.view_height
+            if sum(rect.width * rect.height for rect in rects) > self.full_ratio * screen_area:
+                rects = None
+        self.boxes = []
+        self.compare = False
+        self.full = False
+        self._view = view
+        self._window = window.copy()
+        return rects
+
+    def _cells_to_screen(self, box, cam):
+        """
+        Convertit une zone de cellules (top, left, bottom, right) en rectangle de l'écran.
+        """
+        top, left, bottom, right = box
+        size = cam.cell_size
+        rect = pygame.Rect(left * size - cam.x, top * size - cam.y,
+                           (right - left) * size, (bottom - top) * size)
+        return rect.clip(pygame.Rect(0, 0, cam.view_width, cam.view_height))
+
+    def _changed_tiles(self, window, r0, c0, cam):
+        """
+        Compare les cellules visibles à celles de l'image précédente, par tuiles.
+        Retourne un rectangle de l'écran par suite horizontale de tuiles modifiées.
+        """
+        t = self.tile
+        h, w = window.shape
+        changed = np.zeros(((h + t - 1) // t * t, (w + t - 1) // t * t), dtype=bool)
+        changed[:h, :w] = window != self._window
+        tiles = changed.reshape(changed.shape[0] // t, t, changed.shape[1] // t, t).any(axis=(1, 3))
+        rects = []
+        for tr in np.flatnonzero(tiles.any(axis=1)):
+            row = tiles[tr]
+            # Regroupe les tuiles modifiées voisines d'une même ligne en un seul rectangle
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], row.view(np.uint8), [0]))))
+            for start, end in zip(edges[::2], edges[1::2]):
+                box = (r0 + tr * t, c0 + start * t, r0 + (tr + 1) * t, c0 + end * t)
+                rects.append(self._cells_to_screen(box, cam))
+        return rects
@@ -0,0 +1,90 @@
+"""
+Règles des automates "de type Life", en notation B/S :
+"B3/S23" = une cellule morte naît avec 3 voisins, une cellule vivante survit avec 2 ou 3 voisins.
+Chaque règle est compilée en une table de correspondance (état, nombre de voisins) -> nouvel état,
+que les moteurs vectorisés appliquent d'un coup à toute la grille.
+"""
+import re
+
+import numpy as np
+
+# Quelques règles connues, utilisables par leur nom
+RULES = {
+    "conway": "B3/S23",
+    "highlife": "B36/S23",
+    "seeds": "B2/S",
+    "daynight": "B3678/S34678",
+    "lifewithoutdeath": "B3/S012345678",
+    "maze": "B3/S12345",
+    "2x2": "B36/S125",
+}
+
+RULE_FORMAT = re.compile(r'^B([0-8]*)/S([0-8]*)$')
+RULE_FORMAT_SB = re.compile(r'^S?([0-8]*)/B?([0-8]*)$')
+
+
+class Rule:
+    """
+    Règle B/S compilée.
+    - births : nombres de voisins qui font naître une cellule morte
+    - survivals : nombres de voisins qui font survivre une cellule vivante
+    - table : tableau 2 x 9, table[état, voisins] = nouvel état
+    La table est aussi rangée dans un entier de 18 bits (bit état * 9 + voisins),
+    ce qui permet de l'appliquer à toute une grille avec un simple décalage de bits,
+    bien plus rapide qu'une indexation de tableau.
+    """
+
+    def __init__(self, births, survivals):
+        self.births = frozenset(births)
+        self.survivals = frozenset(survivals)
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.births)] = 1
+        self.table[1, sorted(self.survivals)] = 1
+        self._bits = np.uint32(sum(int(v) << i for i, v in enumerate(self.table.reshape(-1))))
+
+    def apply(self, cells, n):
+        """
+        Retourne le nouvel état de chaque cellule (tableau uint8),
+        à partir des cellules et de leur nombre de voisins.
+        """
+        index = cells * np.uint8(9)
+        index += n
+        result = np.right_shift(self._bits, index, dtype=np.uint32)
+        result &= 1
+        return result.astype(np.uint8)
+
+    def __eq__(self, other):
+        return (isinstance(other, Rule) and self.births == other.births
+                and self.survivals == other.survivals)
+
+    def __hash__(self):
+        return hash((self.births, self.survivals))
+
+    def __str__(self):
+        return "B" + "".join(map(str, sorted(self.births))) + "/S" + "".join(map(str, sorted(self.survivals)))
+
+    def __repr__(self):
+        return f"Rule({str(self)!r})"
+
+
+def parse_rule(text="B3/S23"):
+    """
+    Crée une règle à partir de sa notation ("B36/S23", "b3/s23", "23/3" en notation S/B)
+    ou de son nom ("highlife"). Si text est déjà une règle, elle est retournée telle quelle.
+    Lève une ValueError si la notation est invalide.
+    """
+    if isinstance(text, Rule):
+        return text
+    cleaned = RULES.get(text.strip().lower(), text).strip().upper().replace(' ', '')
+    match = RULE_FORMAT.match(cleaned)
+    if match:
+        births, survivals = match.groups()
+    else:
+        match = RULE_FORMAT_SB.match(cleaned)
+        if match is None:
+            raise ValueError(f"Règle invalide : {text!r} (exemple : B3/S23)")
+        survivals, births = match.groups()
+    return Rule(map(int, births), map(int, survivals))
+
+
+CONWAY = parse_rule("B3/S23")
@@ -0,0 +1,90 @@
+import time
+
+MIN_SPEED = 1        # Vitesse minimale (générations par seconde)
+MAX_SPEED = 4096     # Vitesse maximale (générations par seconde)
+
+
+class Scheduler:
+    """
+    Règle le rythme de la boucle de jeu : nombre d'images par seconde (fps)
+    et nombre de générations par seconde (speed), indépendamment l'un de l'autre.
+    À chaque image, on calcule autant de générations que le temps écoulé en demande :
+    plusieurs par image si la simulation est rapide, aucune certaines images si elle est lente.
+    Le calcul ne prend jamais plus que budget x la durée d'une image : s'il prend du retard,
+    le retard est abandonné plutôt qu'accumulé, pour que l'interface reste réactive.
+    """
+
+    def __init__(self, fps=60, speed=10, budget=0.7):
+        """
+        - fps : nombre d'images par seconde visé
+        - speed : nombre de générations par seconde visé
+        - budget : part de la durée d'une image réservée au calcul des générations
+        """
+        self.fps = fps
+        self.speed = speed
+        self.budget = budget
+        self.measured_speed = 0.0   # Générations par seconde mesurées
+        self.frame_time = 0.0       # Durée de travail d'une image en secondes (moyenne glissante)
+        self._due = 0.0             # Générations en attente (fraction comprise)
+        self._last = time.perf_counter()
+        self._frame_start = self._last
+        self._count = 0             # Générations calculées depuis le début de la mesure
+        self._count_start = self._last
+
+    def faster(self):
+        """
+        Double la vitesse de la simulation.
+        """
+        self.speed = min(self.speed * 2, MAX_SPEED)
+
+    def slower(self):
+        """
+        Divise la vitesse de la simulation par deux.
+        """
+        self.speed = max(self.speed // 2, MIN_SPEED)
+
+    def start_frame(self):
+        """
+        À appeler au début de chaque image.
+        """
+        self._frame_start = time.perf_counter()
+
+    def run(self, grid, running):
+        """
+        Calcule les générations dues depuis la dernière image si running est vrai.
+        Retourne le nombre de générations calculées.
+        """
+        now = time.perf_counter()
+        elapsed, self._last = now - self._last, now
+        if not running:
+            self._due = 0.0
+            return 0
+        self._due += elapsed * self.speed
+        deadline = now + self.budget / self.fps
+        done = 0
+        while self._due >= 1:
+            grid.next_generation()
+            self._due -= 1
+            done += 1
+            if time.perf_counter() >= deadline:
+                self._due = min(self._due, 1.0)  # Trop lent : on abandonne le retard
+                break
+        self._count += done
+        return done
+
+    def end_frame(self, clock):
+        """
+        À appeler à la fin de chaque image : met à jour les mesures
+        puis attend le temps nécessaire pour respecter le nombre d'images par seconde.
+        Retourne True si les mesures ont changé (environ deux fois par seconde).
+        """
+        now = time.perf_counter()
+        self.frame_time = 0.9 * self.frame_time + 0.1 * (now - self._frame_start)
+        updated = False
+        if now - self._count_start >= 0.5:
+            self.measured_speed = self._count / (now - self._count_start)
+            self._count = 0
+            self._count_start = now
+            updated = True
+        clock.tick(self.fps)
+        return updated
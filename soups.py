@@ -0,0 +1,54 @@
+"""
+Remplissage aléatoire rapide et reproductible des grilles ("soupes").
+Toute la zone est tirée d'un coup par un générateur NumPy initialisé avec une graine :
+la même graine redonne exactement la même grille.
+La densité est soit un nombre (probabilité qu'une cellule soit vivante), soit un tableau
+de densités qui varie selon la position (profil), par exemple un dégradé.
+"""
+import numpy as np
+
+RESOLUTION = 1 << 16  # Précision des densités : chaque cellule est tirée sur 16 bits
+
+
+def make_rng(seed=None):
+    """
+    Retourne un générateur NumPy à partir d'une graine (entier), ou le générateur lui-même
+    si seed en est déjà un (utile pour enchaîner des milliers de grilles sans réinitialiser).
+    seed None : graine imprévisible.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def random_cells(rows, cols, density=0.2, seed=None):
+    """
+    Retourne un tableau uint8 rows x cols de cellules vivantes tirées au hasard.
+    - density : probabilité qu'une cellule soit vivante, ou tableau de probabilités
+      de forme (rows, cols), (rows, 1) ou (1, cols) (voir linear_gradient, radial_gradient)
+    - seed : graine ou générateur (voir make_rng)
+    Un entier de 16 bits par cellule est comparé à la densité : pas de nombre à virgule tiré.
+    """
+    draw = make_rng(seed).integers(0, RESOLUTION, (rows, cols), dtype=np.uint16)
+    threshold = np.rint(np.clip(density, 0, 1) * RESOLUTION).astype(np.uint32)
+    return (draw < threshold).view(np.uint8)
+
+
+def linear_gradient(rows, cols, start, end, axis=1):
+    """
+    Retourne un profil de densité qui passe de start à end le long d'un axe
+    (axis=1 : de gauche à droite, axis=0 : de haut en bas).
+    """
+    n = cols if axis == 1 else rows
+    values = np.linspace(start, end, n, dtype=np.float32)
+    return values.reshape(1, -1) if axis == 1 else values.reshape(-1, 1)
+
+
+def radial_gradient(rows, cols, centre, edge):
+    """
+    Retourne un profil de densité qui vaut centre au milieu de la zone et edge dans ses coins.
+    """
+    r = np.linspace(-1, 1, rows, dtype=np.float32).reshape(-1, 1)
+    c = np.linspace(-1, 1, cols, dtype=np.float32).reshape(1, -1)
+    distance = np.sqrt((r * r + c * c) / 2)  # 0 au centre, 1 dans les coins
+    return centre + (edge - centre) * distance
@@ -0,0 +1,81 @@
+"""
+Statistiques d'une grille tenues à jour au fil des changements :
+population, nombre de cellules vivantes par ligne et par colonne, boîte englobante
+des cellules vivantes, naissances et morts de la dernière génération.
+Elles sont mises à jour avec les seules cellules qui changent (voir Grid.cell_listeners),
+que les moteurs fournissent en calculant la génération : les lire ne coûte rien.
+Le monde sans bords a les mêmes statistiques (voir world.WorldStats).
+"""
+import numpy as np
+
+
+class GridStats:
+    """
+    Statistiques d'une grille (Grid), abonnées à ses changements.
+    - population : nombre de cellules vivantes
+    - row_counts, col_counts : nombre de cellules vivantes de chaque ligne et de chaque colonne
+    - box : boîte englobante (top, left, bottom, right) des cellules vivantes, None si la grille est vide
+    - births, deaths : naissances et morts de la dernière génération calculée
+    """
+
+    def __init__(self, grid):
+        """
+        Compte une fois les cellules de la grille, puis suit ses changements.
+        """
+        cells = np.asarray(grid.cells, dtype=np.uint8)
+        self.cols = grid.cols
+        self.row_counts = cells.sum(axis=1, dtype=np.int64)
+        self.col_counts = cells.sum(axis=0, dtype=np.int64)
+        self.population = int(self.row_counts.sum())
+        self.births = 0
+        self.deaths = 0
+        self.box = None
+        self._shrink(0, 0, grid.rows, grid.cols)
+        grid.cell_listeners.append(self.cells_changed)
+
+    def cells_changed(self, born, died, step):
+        """
+        Met à jour les statistiques avec les cellules nées et mortes (appelé par la grille).
+        """
+        if step:
+            self.births, self.deaths = len(born), len(died)
+        if len(born) == 0 and len(died) == 0:
+            return
+        born_rows, born_cols = np.divmod(born, self.cols)
+        died_rows, died_cols = np.divmod(died, self.cols)
+        rows, cols = len(self.row_counts), len(self.col_counts)
+        self.row_counts += np.bincount(born_rows, minlength=rows)
+        self.row_counts -= np.bincount(died_rows, minlength=rows)
+        self.col_counts += np.bincount(born_cols, minlength=cols)
+        self.col_counts -= np.bincount(died_cols, minlength=cols)
+        self.population += len(born) - len(died)
+
+        if self.population == 0:
+            self.box = None
+            return
+        if len(born):
+            # Les naissances agrandissent la boîte
+            top, left = int(born_rows.min()), int(born_cols.min())
+            bottom, right = int(born_rows.max()) + 1, int(born_cols.max()) + 1
+            if self.box is not None:
+                top, left = min(top, self.box[0]), min(left, self.box[1])
+                bottom, right = max(bottom, self.box[2]), max(right, self.box[3])
+            self.box = (top, left, bottom, right)
+        if len(died):
+            # Les morts peuvent vider les lignes ou colonnes du bord de la boîte
+            self._shrink(*self.box)
+
+    def _shrink(self, top, left, bottom, right):
+        """
+        Réduit la boîte (top, left, bottom, right) jusqu'aux premières lignes et colonnes non vides.
+        """
+        if self.population == 0:
+            self.box = None
+            return
+        if (self.row_counts[top] and self.row_counts[bottom - 1]
+                and self.col_counts[left] and self.col_counts[right - 1]):
+            self.box = (top, left, bottom, right)  # Les bords sont encore vivants : rien à parcourir
+            return
+        rows = np.flatnonzero(self.row_counts[top:bottom])
+        cols = np.flatnonzero(self.col_counts[left:right])
+        self.box = (top + int(rows[0]), left + int(cols[0]), top + int(rows[-1]) + 1, left + int(cols[-1]) + 1)
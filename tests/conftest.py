@@ -0,0 +1,7 @@
+"""
+Les modules du jeu sont à la racine du dépôt : on la rend importable pour les tests.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
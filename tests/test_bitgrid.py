@@ -0,0 +1,42 @@
+"""
+Tests de la grille compacte (BitGrid), comparée à Grid avec le moteur python.
+"""
+import numpy as np
+
+import bitgrid
+from bitgrid import BitGrid
+from grid import Grid
+from soups import linear_gradient
+
+
+def test_matches_python_engine():
+    board = BitGrid(37, 150, "B36/S23")
+    board.randomize(0.35, seed=4)
+    reference = Grid(37, 150, "python", "B36/S23")
+    reference.paste(board.to_array(), 0, 0, "replace")
+    for _ in range(25):
+        board.next_generation()
+        reference.next_generation()
+        assert (board.to_array() == np.asarray(reference.cells)).all()
+
+
+def test_randomize_is_seeded_and_banded(monkeypatch):
+    first = BitGrid(50, 130)
+    first.randomize(0.3, seed=7)
+    monkeypatch.setattr(bitgrid, "BAND_CELLS", 200)  # Une bande par ligne
+    second = BitGrid(50, 130)
+    second.randomize(0.3, seed=7)
+    assert (first.words == second.words).all()
+    assert (first.words[:, -1] & ~first.last_mask == 0).all()  # Rien hors de la grille
+    assert abs(first.to_array().mean() - 0.3) < 0.03
+    other = BitGrid(50, 130)
+    other.randomize(0.3, seed=8)
+    assert (first.words != other.words).any()
+
+
+def test_randomize_with_profile(monkeypatch):
+    monkeypatch.setattr(bitgrid, "BAND_CELLS", 1000)
+    board = BitGrid(200, 100)
+    board.randomize(linear_gradient(200, 100, 0, 1, axis=0), seed=1)
+    cells = board.to_array()
+    assert cells[:20].mean() < 0.15 and cells[-20:].mean() > 0.85
@@ -0,0 +1,111 @@
+"""
+Tests du recensement : la numérotation des composantes est comparée à un parcours
+en largeur simple, cellule par cellule.
+"""
+from collections import Counter, deque
+
+import numpy as np
+import pytest
+
+from census import KNOWN, _components, canonical, census, classify, label
+
+
+def flood_labels(cells, distance=1):
+    """
+    Composantes par parcours en largeur (deux cellules à au plus distance cases sont voisines) :
+    retourne l'ensemble des composantes (chacune un ensemble figé de cellules).
+    """
+    rows, cols = cells.shape
+    seen = np.zeros_like(cells, dtype=bool)
+    components = set()
+    for r, c in zip(*np.nonzero(cells)):
+        if seen[r, c]:
+            continue
+        seen[r, c] = True
+        queue, component = deque([(r, c)]), []
+        while queue:
+            a, b = queue.popleft()
+            component.append((int(a), int(b)))
+            for da in range(-distance, distance + 1):
+                for db in range(-distance, distance + 1):
+                    x, y = a + da, b + db
+                    if 0 <= x < rows and 0 <= y < cols and cells[x, y] and not seen[x, y]:
+                        seen[x, y] = True
+                        queue.append((x, y))
+        components.add(frozenset(component))
+    return components
+
+
+def pattern(name):
+    return np.array([[ch == "O" for ch in line] for line in KNOWN[name]], dtype=np.uint8)
+
+
+@pytest.mark.parametrize("density", [0.1, 0.3, 0.5, 0.7])
+@pytest.mark.parametrize("seed", range(3))
+def test_label_matches_flood_fill(density, seed):
+    cells = (np.random.default_rng(seed).random((45, 67)) < density).astype(np.uint8)
+    labels, count = label(cells)
+    assert ((labels > 0) == (cells == 1)).all()
+    found = {frozenset(map(tuple, np.argwhere(labels == k).tolist())) for k in range(1, count + 1)}
+    assert found == flood_labels(cells)
+
+
+@pytest.mark.parametrize("density", [0.05, 0.15, 0.3])
+def test_object_grouping_matches_flood_fill(density):
+    cells = (np.random.default_rng(7).random((50, 61)) < density).astype(np.uint8)
+    rows, starts, ends, component, count = _components(cells, 2)
+    groups = [set() for _ in range(count)]
+    for r, s, e, k in zip(rows, starts, ends, component):
+        groups[k].update((int(r), c) for c in range(s, e))
+    assert {frozenset(g) for g in groups} == flood_labels(cells, 2)
+
+
+def test_label_empty():
+    labels, count = label(np.zeros((5, 6), dtype=np.uint8))
+    assert count == 0 and not labels.any()
+
+
+@pytest.mark.parametrize("name", sorted(KNOWN))
+def test_known_objects_in_every_orientation(name):
+    cells = pattern(name)
+    for form in (cells, cells.T):
+        for k in range(4):
+            assert classify(np.rot90(form, k)) == name
+
+
+def test_unknown_names():
+    assert classify(pattern("block")[:, :1]) .startswith("ov")  # Deux cellules : meurent
+    pentadecathlon = np.zeros((3, 10), dtype=np.uint8)
+    pentadecathlon[1] = 1
+    pentadecathlon[0, 2] = pentadecathlon[2, 2] = pentadecathlon[0, 7] = pentadecathlon[2, 7] = 0
+    pentadecathlon[:, 2] = pentadecathlon[:, 7] = [1, 0, 1]
+    assert classify(pentadecathlon).startswith("xp15_")
+    snake = np.array([[1, 1, 0, 1], [1, 0, 1, 1]], dtype=np.uint8)
+    assert classify(snake).startswith("xs6_")
+
+
+def test_census_counts_separated_objects():
+    board = np.zeros((60, 80), dtype=np.uint8)
+    placed = Counter()
+    rng = np.random.default_rng(0)
+    names = sorted(KNOWN)
+    for r in range(2, 55, 10):
+        for c in range(2, 75, 10):
+            name = names[rng.integers(len(names))]
+            cells = np.rot90(pattern(name), rng.integers(4))
+            board[r:r + cells.shape[0], c:c + cells.shape[1]] = cells
+            placed[name] += 1
+    assert census(board) == placed
+
+
+def test_canonical_ignores_orientation():
+    glider = pattern("glider")
+    assert canonical(glider) == canonical(np.rot90(glider.T, 3)) == canonical(glider[::-1])
+
+
+def test_close_known_objects_stay_apart():
+    board = np.zeros((12, 20), dtype=np.uint8)
+    board[2:4, 2:4] = 1
+    board[2:4, 5:7] = 1  # Un bloc une case plus loin
+    board[7:11, 10:15] = pattern("lwss")  # Ses parties ne sont pas 8-connexes
+    assert census(board) == Counter({"block": 2, "lwss": 1})
@@ -0,0 +1,60 @@
+"""
+Tests de la détection de cycles : l'empreinte tenue à jour est comparée à celle
+recalculée sur toutes les cellules, et les périodes à celles des motifs connus.
+"""
+import numpy as np
+import pytest
+
+from cycles import CycleDetector, keys_xor
+from grid import Grid
+from world import World
+
+BLINKER = [[1, 1, 1]]
+GLIDER = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+PENTADECATHLON = [[0, 0, 1, 0, 0, 0, 0, 1, 0, 0],
+                  [1, 1, 0, 1, 1, 1, 1, 0, 1, 1],
+                  [0, 0, 1, 0, 0, 0, 0, 1, 0, 0]]
+
+
+def run(grid, pattern, generations):
+    grid.paste(np.array(pattern, dtype=np.uint8), 10, 10)
+    detector = CycleDetector(grid)
+    for _ in range(generations):
+        grid.next_generation()
+        assert detector.hash == keys_xor(grid.alive())
+        assert detector.population == grid.population()
+    return detector
+
+
+@pytest.mark.parametrize("make", [lambda: Grid(30, 30, "numpy"), lambda: World(chunk=16)])
+@pytest.mark.parametrize("pattern, found", [
+    ([[1, 1], [1, 1]], ("still", 1)),
+    (BLINKER, ("oscillator", 2)),
+    (PENTADECATHLON, ("oscillator", 15)),
+    ([[1, 1]], ("extinction",)),
+])
+def test_periods(make, pattern, found):
+    assert run(make(), pattern, 40).found == found
+
+
+def test_glider_is_not_a_cycle():
+    assert run(World(), GLIDER, 40).found is None
+
+
+def test_manual_edit_forgets():
+    grid = Grid(30, 30, "numpy")
+    detector = run(grid, BLINKER, 5)
+    assert detector.period == 2
+    grid.toggle(0, 0)
+    assert detector.found is None and detector.hash == keys_xor(grid.alive())
+
+
+def test_fast_forward_matches_stepping():
+    grid, reference = Grid(30, 30, "numpy"), Grid(30, 30, "numpy")
+    detector = run(grid, PENTADECATHLON, 20)
+    run(reference, PENTADECATHLON, 20)
+    detector.fast_forward(1003)
+    for _ in range(1003):
+        reference.next_generation()
+    assert grid.generation == reference.generation
+    assert (np.asarray(grid.cells) == np.asarray(reference.cells)).all()
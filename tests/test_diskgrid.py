@@ -0,0 +1,65 @@
+"""
+Tests des grilles sur disque, comparées à Grid (moteur numpy) : petites bandes
+pour que chaque génération soit calculée en plusieurs morceaux.
+"""
+import numpy as np
+import pytest
+
+import diskgrid
+from grid import Grid
+
+
+@pytest.mark.parametrize("band_cells", [1, 130, 1000, diskgrid.BAND_CELLS])
+@pytest.mark.parametrize("cols", [64, 70, 130])
+def test_matches_grid(tmp_path, band_cells, cols):
+    grid = Grid(45, cols, "numpy", "B36/S23")
+    grid.randomize(0.35, 1)
+    path = tmp_path / "grid.bin"
+    diskgrid.save(grid.cells, path, "B36/S23")
+    board = diskgrid.DiskGrid(path, band_cells=band_cells)
+    assert str(board.rule) == "B36/S23"
+    for _ in range(15):
+        board.next_generation()
+        grid.next_generation()
+    assert (board.window(0, 0, 45, cols) == np.asarray(grid.cells)).all()
+    assert board.population() == grid.population()
+    assert board.generation == 15
+    board.close()
+    reopened = diskgrid.DiskGrid(path, mode="r")
+    assert reopened.generation == 15
+    assert (reopened.window(0, 0, 45, cols) == np.asarray(grid.cells)).all()
+
+
+@pytest.mark.parametrize("mode", ["or", "xor", "replace"])
+def test_edits_match_grid(tmp_path, mode):
+    grid = Grid(40, 150, "numpy")
+    board = diskgrid.create(tmp_path / "grid.bin", 40, 150)
+    board.band = 7
+    rng = np.random.default_rng(2)
+    for _ in range(10):
+        pattern = (rng.random((9, 80)) < 0.5).astype(np.uint8)
+        top, left = rng.integers(-5, 40), rng.integers(-20, 140)
+        grid.paste(pattern, top, left, mode)
+        board.paste(pattern, top, left, mode)
+        r, c = rng.integers(0, 40), rng.integers(0, 150)
+        grid.toggle(r, c)
+        board.toggle(r, c)
+        assert board.get(r, c) == grid.get(r, c)
+    assert (board.window(0, 0, 40, 150) == np.asarray(grid.cells)).all()
+    assert (board.window(3, 61, 20, 129) == np.asarray(grid.cells)[3:20, 61:129]).all()
+
+
+def test_randomize_is_seeded(tmp_path):
+    first = diskgrid.create(tmp_path / "a.bin", 30, 100)
+    second = diskgrid.create(tmp_path / "b.bin", 30, 100)
+    first.randomize(0.3, seed=4)
+    second.randomize(0.3, seed=4)
+    assert (first.window(0, 0, 30, 100) == second.window(0, 0, 30, 100)).all()
+    assert (first.words[:, -1] >> np.uint64(100 - 64) == 0).all()  # Rien hors de la grille
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        diskgrid.DiskGrid(path)
@@ -0,0 +1,41 @@
+"""
+Tests des moteurs : naissances et morts retournées par step_changes, et moteur incrémental
+(tuiles endormies) comparé au moteur numpy sur des grilles presque immobiles.
+"""
+import numpy as np
+import pytest
+
+from engines import ENGINES, make_engine
+from grid import Grid
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_step_changes_are_exact(engine):
+    step = make_engine(engine)
+    state = step.from_array((np.random.default_rng(0).random((33, 41)) < 0.35).astype(np.uint8))
+    for _ in range(15):
+        old = np.asarray(state, dtype=np.uint8).copy()
+        state, born, died = step.step_changes(state)
+        new = np.asarray(state, dtype=np.uint8)
+        assert sorted(born) == list(np.flatnonzero((new == 1) & (old == 0)))
+        assert sorted(died) == list(np.flatnonzero((new == 0) & (old == 1)))
+
+
+@pytest.mark.parametrize("tile", [4, 7, 16])
+def test_incremental_wakes_the_tiles_a_glider_reaches(tile):
+    incremental = Grid(160, 160, make_engine("incremental", tile=tile))
+    reference = Grid(160, 160, "numpy")
+    for grid in (incremental, reference):
+        grid.paste(GLIDER, 2, 2)
+        grid.paste(np.ones((2, 2), dtype=np.uint8), 60, 10)  # Bloc immobile : sa tuile s'endort
+        grid.paste(np.ones((1, 3), dtype=np.uint8), 20, 80)  # Clignotant : sa tuile reste active
+    for k in range(300):
+        if k == 150:
+            for grid in (incremental, reference):
+                grid.toggle(61, 12)  # Le bloc endormi est réveillé à la main
+        incremental.next_generation()
+        reference.next_generation()
+        assert (np.asarray(incremental.cells) == np.asarray(reference.cells)).all()
+    assert incremental.engine.active_cells < 160 * 160 / 4  # Le reste de la grille dort
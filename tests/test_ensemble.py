@@ -0,0 +1,66 @@
+"""
+Tests du calcul en lot : chaque grille du lot est comparée à la même grille avancée seule
+(Grid, moteur numpy), sa stabilisation étant détectée en gardant tous ses états.
+"""
+import numpy as np
+
+from ensemble import MAX_PERIOD, Ensemble, random_boards, run_ensemble
+from grid import Grid
+
+
+def reference(board, generations, rule="B3/S23", max_period=MAX_PERIOD):
+    """
+    Retourne (durée de vie, période, population finale, état final) d'une grille avancée seule.
+    """
+    grid = Grid(board.shape[0], board.shape[1], "numpy", rule)
+    grid.paste(board, 0, 0, "replace")
+    states = [np.asarray(grid.cells).tobytes()]
+    for g in range(1, generations + 1):
+        grid.next_generation()
+        cells = np.asarray(grid.cells)
+        states.append(cells.tobytes())
+        for p in range(1, min(max_period, g) + 1):
+            if states[g - p] == states[g]:
+                return g - p, p, int(cells.sum()), cells
+    return -1, 0, int(np.asarray(grid.cells).sum()), np.asarray(grid.cells)
+
+
+def test_matches_single_grids():
+    boards = random_boards(40, 12, 14, 0.4, seed=1)
+    ensemble = Ensemble(boards, "B3/S23")
+    lifespans, periods, populations = ensemble.run(200)
+    assert (periods > 0).any()
+    for k, board in enumerate(boards):
+        lifespan, period, population, final = reference(board, 200)
+        assert (lifespans[k], periods[k], populations[k]) == (lifespan, period, population)
+        assert (ensemble.boards[k] == final).all()
+
+
+def test_other_rule_and_short_window():
+    boards = random_boards(25, 10, 10, 0.5, seed=2)
+    lifespans, periods, populations = Ensemble(boards, "B36/S23", max_period=2).run(60)
+    for k, board in enumerate(boards):
+        assert (lifespans[k], periods[k], populations[k]) == reference(board, 60, "B36/S23", 2)[:3]
+
+
+def test_high_bit_changes_change_the_hash():
+    # Deux cellules changées au même bit de deux mots différents : les poids impairs
+    # d'une somme pondérée s'annulaient une fois sur deux (toujours pour le bit 63)
+    boards = np.zeros((2, 12, 64), dtype=np.uint8)
+    boards[1, 2, 56] = boards[1, 9, 56] = 1  # Bit de poids fort des mots des lignes 2 et 9
+    for seed in range(20):
+        hashes = Ensemble(boards, seed=seed)._hash(np.pad(boards, ((0, 0), (1, 1), (1, 1))))
+        assert hashes[0] != hashes[1]
+
+
+def test_seeded_boards():
+    assert (random_boards(5, 8, 8, seed=3) == random_boards(5, 8, 8, seed=3)).all()
+    assert (random_boards(5, 8, 8, seed=3) != random_boards(5, 8, 8, seed=4)).any()
+
+
+def test_workers_give_the_same_results():
+    boards = random_boards(30, 16, 16, 0.35, seed=5)
+    alone = run_ensemble(boards, 150, workers=1)
+    shared = run_ensemble(boards, 150, workers=3)
+    for a, b in zip(alone, shared):
+        assert (a == b).all()
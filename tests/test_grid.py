@@ -0,0 +1,74 @@
+"""
+Tests de Grid : collage, dessin, set_cells, comparés au moteur de référence (python).
+"""
+import numpy as np
+import pytest
+
+from engines import ENGINES, Engine
+from grid import Grid
+
+ENGINE_NAMES = sorted(ENGINES)
+
+
+def random_grid(engine, rows=40, cols=50, seed=0):
+    grid = Grid(rows, cols, engine, "B3/S23")
+    grid.randomize(0.3, seed)
+    return grid
+
+
+@pytest.mark.parametrize("engine", ENGINE_NAMES)
+def test_engines_match_python(engine):
+    reference = random_grid("python")
+    grid = random_grid(engine)
+    for _ in range(30):
+        reference.next_generation()
+        grid.next_generation()
+        assert (np.asarray(grid.cells) == np.asarray(reference.cells)).all()
+
+
+@pytest.mark.parametrize("engine", ENGINE_NAMES)
+@pytest.mark.parametrize("mode", ["or", "xor", "replace"])
+def test_paste_modes_match_python(engine, mode):
+    pattern = np.random.default_rng(1).random((7, 9)) < 0.5
+    reference = random_grid("python")
+    grid = random_grid(engine)
+    for g in (reference, grid):
+        g.paste(pattern, 36, -3, mode)
+        g.next_generation()
+    assert (np.asarray(grid.cells) == np.asarray(reference.cells)).all()
+
+
+@pytest.mark.parametrize("engine", ENGINE_NAMES)
+def test_paint_then_step_matches_python(engine):
+    rng = np.random.default_rng(2)
+    reference = random_grid("python")
+    grid = random_grid(engine)
+    for _ in range(20):
+        reference.next_generation()
+        grid.next_generation()
+    for k in range(20):
+        rows, cols = rng.integers(-2, 42, 25), rng.integers(-2, 52, 25)
+        for g in (reference, grid):
+            g.paint(rows, cols, k % 2)
+            g.next_generation()
+        assert (np.asarray(grid.cells) == np.asarray(reference.cells)).all()
+
+
+def test_set_cells_reports_only_real_changes():
+    grid = Grid(2000, 2000, "numpy", "B3/S23")
+    grid.toggle(0, 0)
+    seen = []
+    grid.cell_listeners.append(lambda born, died, step: seen.append((sorted(born), sorted(died))))
+    # (0, 0) est déjà vivante, (1999, 1999) naît ; (5, 5) naît puis meurt : elle finit morte
+    grid.set_cells([0, 1999 * 2000 + 1999, 5 * 2000 + 5], [5 * 2000 + 5])
+    assert seen == [([1999 * 2000 + 1999], [])]
+    grid.set_cells([0], [])
+    assert len(seen) == 1  # Rien n'a changé : personne n'est prévenu
+
+
+def test_base_engine_touch_region_does_not_walk_cells():
+    class Counting(Engine):
+        def touch(self, r, c):
+            raise AssertionError("touch appelé pour chaque cellule")
+
+    Counting().touch_region(0, 0, 10000, 10000)
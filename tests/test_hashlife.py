@@ -0,0 +1,129 @@
+"""
+Tests de HashLife : un saut de n générations doit donner la même chose que n générations
+calculées une à une, sur une grille assez grande pour que le motif n'en touche pas les bords.
+"""
+import numpy as np
+import pytest
+
+from engines import make_engine
+from grid import Grid
+from hashlife import HashLife
+from world import World
+
+
+def stepped(pattern, n, rule="B3/S23"):
+    """
+    Motif après n générations calculées une à une, au centre d'une grille bordée de n + 1 cellules.
+    """
+    margin = n + 1
+    grid = Grid(pattern.shape[0] + 2 * margin, pattern.shape[1] + 2 * margin, "numpy", rule)
+    grid.paste(pattern, margin, margin)
+    for _ in range(n):
+        grid.next_generation()
+    return np.asarray(grid.cells), margin
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 29, 64, 100])
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_advance_matches_stepping(n, rule):
+    pattern = (np.random.default_rng(n).random((16, 16)) < 0.4).astype(np.uint8)
+    expected, margin = stepped(pattern, n, rule)
+    universe = HashLife(rule)
+    root, top, left = universe.advance(universe.build(pattern), margin, margin, n)
+    out = np.zeros_like(expected)
+    universe.paint(root, out, top, left)
+    assert (out == expected).all()
+
+
+def test_small_node_cache():
+    pattern = (np.random.default_rng(0).random((24, 24)) < 0.35).astype(np.uint8)
+    expected, margin = stepped(pattern, 90)
+    universe = HashLife(max_nodes=2000)  # Le cache est allégé entre les pas
+    root, top, left = universe.advance(universe.build(pattern), margin, margin, 90)
+    out = np.zeros_like(expected)
+    universe.paint(root, out, top, left)
+    assert (out == expected).all()
+
+
+def test_grid_advance_is_a_window_on_the_plane():
+    grid = Grid(60, 70, "numpy")
+    grid.randomize(0.3, 2)
+    start = np.asarray(grid.cells).copy()
+    grid.advance(20, "hashlife")  # Ce qui sort de la grille pendant le saut est perdu
+    expected, margin = stepped(start, 20)
+    assert grid.generation == 20
+    assert (np.asarray(grid.cells) == expected[margin:margin + 60, margin:margin + 70]).all()
+
+
+def test_engine_step_matches_numpy():
+    cells = (np.random.default_rng(4).random((40, 50)) < 0.3).astype(np.uint8)
+    hashlife, numpy_engine = make_engine("hashlife"), make_engine("numpy")
+    for _ in range(10):
+        expected = numpy_engine.step(cells)
+        cells = hashlife.step(cells)
+        assert (np.asarray(cells) == np.asarray(expected)).all()
+
+
+def test_world_advance_matches_next_generation():
+    pattern = (np.random.default_rng(3).random((20, 20)) < 0.4).astype(np.uint8)
+    stepped_world, jumped_world = World(chunk=16), World(chunk=16)
+    for world in (stepped_world, jumped_world):
+        world.paste(pattern, -7, 5)
+    for _ in range(150):
+        stepped_world.next_generation()
+    jumped_world.advance(150)
+    assert jumped_world.generation == stepped_world.generation == 150
+    assert (np.sort(jumped_world.alive()) == np.sort(stepped_world.alive())).all()
+
+
+def test_build_blocks_is_the_inverse_of_blocks():
+    pattern = (np.random.default_rng(5).random((40, 56)) < 0.3).astype(np.uint8)
+    universe = HashLife()
+    blocks = {}
+    for r, c, block in universe.blocks(universe.build(pattern), -16, 32, 3):
+        blocks[(r // 8, c // 8)] = block
+    root, top, left = universe.build_blocks(blocks, 3)
+    out = np.zeros((40, 56), dtype=np.uint8)
+    universe.paint(root, out, top + 16, left - 32)
+    assert (out == pattern).all()
+
+
+def test_world_jumps_twice_without_the_dense_box(monkeypatch):
+    world = World()
+    glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    world.paste(glider, 0, 0)
+    world.paste(glider[::-1, ::-1], -20, -20)
+    monkeypatch.setattr(world, "window", None)  # Le carré englobant ne doit jamais être lu
+    world.advance(1 << 20)
+    world.advance(1 << 20)
+    top, left, bottom, right = world.bounding_box()
+    assert (bottom - top, right - left) == (2 ** 20 + 23, 2 ** 20 + 23)
+    assert world.population() == 10
+
+
+@pytest.mark.parametrize("chunk", [16, 24])
+def test_world_advance_with_any_chunk_size(chunk):
+    pattern = (np.random.default_rng(6).random((30, 30)) < 0.4).astype(np.uint8)
+    stepped_world, jumped_world = World(chunk=chunk), World(chunk=chunk)
+    for world in (stepped_world, jumped_world):
+        world.paste(pattern, -40, 13)
+    for _ in range(37):
+        stepped_world.next_generation()
+    jumped_world.advance(37)
+    assert (np.sort(jumped_world.alive()) == np.sort(stepped_world.alive())).all()
+
+
+def test_collect_keeps_the_root_canonical():
+    pattern = (np.random.default_rng(8).random((32, 32)) < 0.35).astype(np.uint8)
+    universe = HashLife()
+    root, top, left = universe.advance(universe.build(pattern), 0, 0, 40)
+    before = len(universe._nodes)
+    universe.collect(root)
+    assert len(universe._nodes) < before
+    assert universe.join(root.a, root.b, root.c, root.d) is root  # Toujours partagé
+    assert universe.build(np.zeros((8, 8), dtype=np.uint8)) is universe.zero(3)
+    expected, margin = stepped(pattern, 70)
+    root, top, left = universe.advance(root, top + margin, left + margin, 30)
+    out = np.zeros_like(expected)
+    universe.paint(root, out, top, left)
+    assert (out == expected).all()
@@ -0,0 +1,39 @@
+"""
+Tests du programme sans affichage (headless.py), lancé avec ses arguments.
+"""
+import numpy as np
+
+import headless
+import patterns
+from grid import Grid
+
+
+def test_pattern_run_matches_grid(tmp_path, capsys):
+    start = tmp_path / "start.rle"
+    end = tmp_path / "end.rle"
+    cells = (np.random.default_rng(0).random((20, 20)) < 0.4).astype(np.uint8)
+    cells[0, 0] = cells[-1, -1] = 1
+    patterns.save(cells, str(start))
+    headless.main(["--rows", "50", "--cols", "50", "--pattern", str(start), "--top", "15", "--left", "15",
+                   "--generations", "30", "--output", str(end), "--census"])
+    grid = Grid(50, 50, "numpy")
+    grid.paste(cells, 15, 15)
+    for _ in range(30):
+        grid.next_generation()
+    assert (patterns.load(str(end)) == patterns.crop(grid.cells)).all()
+    assert f"Population finale : {grid.population()}" in capsys.readouterr().out
+
+
+def test_stop_on_cycle(capsys):
+    headless.main(["--rows", "30", "--cols", "30", "--seed", "1", "--generations", "5000", "--stop-on-cycle"])
+    assert "Cycle détecté" in capsys.readouterr().out
+
+
+def test_ensemble_and_grid_file(tmp_path, capsys):
+    headless.main(["--ensemble", "20", "--rows", "16", "--cols", "16", "--seed", "2",
+                   "--generations", "300", "--workers", "1"])
+    assert "20 soupes 16x16" in capsys.readouterr().out
+    path = str(tmp_path / "grid.lg")
+    headless.main(["--grid-file", path, "--rows", "40", "--cols", "70", "--seed", "3", "--generations", "4"])
+    headless.main(["--grid-file", path, "--generations", "6"])
+    assert "génération 10" in capsys.readouterr().out
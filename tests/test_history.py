@@ -0,0 +1,99 @@
+"""
+Tests de l'historique : chaque retour en arrière doit redonner exactement l'état
+enregistré au moment voulu (comparé à des copies complètes de la grille).
+"""
+import numpy as np
+import pytest
+
+from grid import Grid
+from history import History
+from world import World
+
+
+def state(grid):
+    return np.sort(grid.alive())
+
+
+def make(kind):
+    if kind == "grid":
+        grid = Grid(40, 40, "numpy")
+        grid.randomize(0.35, 0)
+    else:
+        grid = World(chunk=16)
+        grid.randomize(0.35, 0, -20, -20, 20, 20)
+    return grid
+
+
+@pytest.mark.parametrize("kind", ["grid", "world"])
+@pytest.mark.parametrize("keyframe_every", [1, 4, 32])
+def test_seek_returns_recorded_states(kind, keyframe_every):
+    grid = make(kind)
+    history = History(grid, keyframe_every=keyframe_every)
+    states = {0: state(grid)}
+    for g in range(1, 60):
+        grid.next_generation()
+        states[g] = state(grid)
+    order = np.random.default_rng(1).permutation(60)
+    for g in order:
+        history.seek(int(g))
+        assert grid.generation == g
+        assert (state(grid) == states[g]).all()
+    history.seek(59)
+    history.seek(75)  # Au-delà de la fin : les générations manquantes sont calculées
+    assert grid.generation == 75
+
+
+@pytest.mark.parametrize("kind", ["grid", "world"])
+def test_undo_redo_strokes_and_generations(kind):
+    grid = make(kind)
+    history = History(grid, keyframe_every=3)
+    start = state(grid)
+    history.begin_stroke()
+    grid.paint([1, 2, 3], [4, 4, 4], 1)
+    grid.paint([5], [5], 0)
+    painted = state(grid)
+    grid.next_generation()
+    stepped = state(grid)
+    history.begin_stroke()
+    grid.toggle(0, 0)
+    assert history.undo() and (state(grid) == stepped).all()
+    assert history.undo() and (state(grid) == painted).all() and grid.generation == 0
+    assert history.undo() and (state(grid) == start).all()
+    assert not history.undo()
+    assert history.redo() and (state(grid) == painted).all()
+    assert history.redo() and (state(grid) == stepped).all() and grid.generation == 1
+    # Une modification après un retour en arrière efface la suite
+    history.undo()
+    grid.toggle(10, 10)
+    assert not history.redo()
+
+
+def test_step_back():
+    grid = make("grid")
+    history = History(grid)
+    states = [state(grid)]
+    for _ in range(5):
+        grid.next_generation()
+        states.append(state(grid))
+    for g in range(4, -1, -1):
+        assert history.step_back()
+        assert grid.generation == g and (state(grid) == states[g]).all()
+    assert not history.step_back()
+
+
+def test_oldest_entries_are_forgotten():
+    grid = Grid(64, 64, "numpy")
+    grid.randomize(0.4, 3)
+    history = History(grid, keyframe_every=8, max_bytes=20000)
+    states = {0: state(grid)}
+    for g in range(1, 200):
+        grid.next_generation()
+        states[g] = state(grid)
+    assert history.nbytes <= 20000 + 64 * 64 * 4
+    oldest = history.generation_at(history.first)
+    assert oldest > 0
+    with pytest.raises(ValueError):
+        history.seek(oldest - 1)
+    for g in (oldest, (oldest + 199) // 2, 199, oldest + 3):
+        history.seek(g)
+        assert (state(grid) == states[g]).all()
@@ -0,0 +1,81 @@
+"""
+Tests de la pyramide de densité : chaque niveau est comparé à la somme directe
+des blocs de cellules, après des modifications de la grille ou du monde.
+"""
+import numpy as np
+import pytest
+
+from grid import Grid
+from lod import DensityPyramid
+from world import World
+
+
+def block_sums(cells, k, top, left, rows, cols):
+    """
+    Comptes des blocs de niveau k [top, top + rows) x [left, left + cols), en sommant les cellules.
+    """
+    size = 1 << k
+    out = np.zeros((rows, cols), dtype=np.int64)
+    for i in range(rows):
+        for j in range(cols):
+            r, c = (top + i) * size, (left + j) * size
+            out[i, j] = cells(r, c, r + size, c + size).sum()
+    return out
+
+
+def grid_cells(grid):
+    def cells(top, left, bottom, right):
+        full = np.asarray(grid.cells)
+        return full[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)]
+    return cells
+
+
+def test_grid_levels():
+    rng = np.random.default_rng(0)
+    grid = Grid(75, 101, "numpy")
+    grid.randomize(0.4, 1)
+    pyramid = DensityPyramid(grid)
+    for step in range(8):
+        for k in (1, 2, 3, 5):
+            rows, cols = (75 >> k) + 2, (101 >> k) + 2
+            assert (pyramid.window(k, -1, -1, rows - 1, cols - 1) ==
+                    block_sums(grid_cells(grid), k, -1, -1, rows, cols)).all()
+        grid.next_generation()
+        grid.paste(rng.random((5, 7)) < 0.5, *rng.integers(0, 70, 2), "xor")
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 4, 6])
+def test_world_levels(k):
+    world = World(chunk=16)
+    world.randomize(0.4, 2, -30, -20, 25, 40)
+    pyramid = DensityPyramid(world)
+    for _ in range(3):
+        size = 1 << k
+        top, left = -40 // size - 1, -30 // size - 1
+        rows, cols = 80 // size + 3, 90 // size + 3
+        assert (pyramid.window(k, top, left, top + rows, left + cols) ==
+                block_sums(world.window, k, top, left, rows, cols)).all()
+        world.next_generation()
+        world.toggle(3, 3)
+
+
+def test_grid_generation_updates_only_changed_blocks(monkeypatch):
+    grid = Grid(64, 96, "incremental")
+    grid.randomize(0.3, 4)
+    pyramid = DensityPyramid(grid)
+    for k in (1, 2, 4, 6):
+        pyramid.window(k, 0, 0, 1, 1)  # Crée les niveaux
+    read = grid.window
+
+    def small_window(top, left, bottom, right):
+        assert (bottom - top) * (right - left) <= 1  # Les blocs ne sont plus relus dans la grille
+        return read(top, left, bottom, right)
+
+    monkeypatch.setattr(grid, "window", small_window)
+    for _ in range(6):
+        grid.next_generation()
+        grid.toggle(10, 20)
+        for k in (1, 2, 4, 6):
+            rows, cols = 64 >> k, 96 >> k
+            assert (pyramid.window(k, 0, 0, rows, cols) ==
+                    block_sums(grid_cells(grid), k, 0, 0, rows, cols)).all()
@@ -0,0 +1,40 @@
+"""
+Tests du moteur multi-coeurs, comparé au moteur python : chaque bande est calculée
+par un autre processus, les halos doivent donner exactement le même résultat.
+"""
+import numpy as np
+import pytest
+
+from engines import make_engine
+from grid import Grid
+
+
+@pytest.fixture
+def engine():
+    engine = make_engine("parallel", rule="B36/S23", workers=3)
+    yield engine
+    engine.close()
+
+
+def test_matches_python_engine(engine):
+    grid = Grid(47, 53, engine, "B36/S23")
+    reference = Grid(47, 53, "python", "B36/S23")
+    grid.randomize(0.35, 1)
+    reference.paste(np.asarray(grid.cells), 0, 0, "replace")
+    rng = np.random.default_rng(2)
+    for k in range(30):
+        if k % 5 == 0:
+            # Modification entre deux générations, à cheval sur les bandes
+            pattern = (rng.random((20, 8)) < 0.5).astype(np.uint8)
+            top, left = rng.integers(0, 40), rng.integers(0, 50)
+            grid.paste(pattern, top, left, "xor")
+            reference.paste(pattern, top, left, "xor")
+        grid.next_generation()
+        reference.next_generation()
+        assert (np.asarray(grid.cells) == np.asarray(reference.cells)).all()
+
+
+def test_more_workers_than_rows(engine):
+    cells = (np.random.default_rng(3).random((2, 30)) < 0.6).astype(np.uint8)
+    expected = make_engine("numpy", rule="B36/S23").step(cells)
+    assert (engine.step(cells) == expected).all()
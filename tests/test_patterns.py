@@ -0,0 +1,61 @@
+"""
+Tests de lecture et d'écriture des motifs (RLE et texte).
+"""
+import io
+
+import numpy as np
+import pytest
+
+import patterns
+
+
+def read(text):
+    return patterns.read_rle(io.BytesIO(text.encode()))
+
+
+def rle(cells):
+    out = io.StringIO()
+    patterns.write_rle(cells, out)
+    return out.getvalue()
+
+
+def test_glider():
+    expected = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    assert (read("#N Glider\nx = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n") == expected).all()
+
+
+def test_count_separated_from_tag_by_whitespace():
+    # "3\no" et "1 2o" : le nombre continue après le blanc
+    assert (read("x = 12, y = 2\n3\no$1 2o!") == np.array([[1] * 3 + [0] * 9, [1] * 12])).all()
+    assert (read("x = 5, y = 1\n2 b\r\n3o!") == [[0, 0, 1, 1, 1]]).all()
+
+
+def test_chunk_ending_with_digits_then_whitespace(monkeypatch):
+    monkeypatch.setattr(patterns, "CHUNK_SIZE", 4)
+    # Blocs de 4 octets : "bo$2" finit par un nombre suivi de blancs, "12 \n o" est coupé en deux
+    cells = read("x = 14, y = 3\nbo$2\n\nbo$12 \n o!")
+    expected = np.zeros((3, 14), dtype=np.uint8)
+    expected[0, 1] = 1
+    expected[1, 2] = 1
+    expected[2, :12] = 1
+    assert (cells == expected).all()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+@pytest.mark.parametrize("seed", range(5))
+def test_rle_round_trip(monkeypatch, chunk_size, seed):
+    monkeypatch.setattr(patterns, "CHUNK_SIZE", chunk_size)
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((60, 150)) < rng.uniform(0.05, 0.95)).astype(np.uint8)
+    cells[0, 0] = cells[-1, -1] = 1  # Pas de recadrage
+    cells[20:23] = 0                 # Lignes vides consécutives
+    cells[30, :] = 1                 # Longue suite, sur plusieurs lignes du fichier
+    assert (read(rle(cells)) == cells).all()
+
+
+def test_plaintext_round_trip():
+    cells = (np.random.default_rng(0).random((20, 30)) < 0.4).astype(np.uint8)
+    cells[0, 0] = cells[-1, -1] = 1
+    out = io.StringIO()
+    patterns.write_plaintext(cells, out, "test")
+    assert (patterns.read_plaintext(io.BytesIO(out.getvalue().encode())) == cells).all()
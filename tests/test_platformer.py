@@ -0,0 +1,94 @@
+"""
+Tests du jeu de plateformes : recherche des cases touchées par un rectangle, regroupement
+des cases en plateformes et niveau pré-dessiné, comparés à un parcours de toutes les cases
+ou de toutes les plateformes.
+"""
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("grid_platformer", os.path.join(ROOT, "grid platformer.py"))
+platformer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(platformer)
+
+TILE = platformer.TILE_SIZE
+
+
+def random_level(seed, rows=15, cols=40):
+    rng = np.random.default_rng(seed)
+    tiles = rng.choice([0, 0, 0, 1, 2, 3, 7, 5], size=(rows, cols))  # 5 : numéro inconnu
+    # Lignes de longueurs différentes, comme dans les niveaux écrits à la main
+    return [list(map(int, row[:cols - rng.integers(0, 5)])) for row in tiles]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tiles_in_rect_matches_every_tile(seed):
+    grid = random_level(seed)
+    rng = np.random.default_rng(100 + seed)
+    for _ in range(200):
+        rect = pygame.Rect(*rng.integers(-100, 1700, 1), *rng.integers(-100, 650, 1),
+                           *rng.integers(1, 200, 2))
+        expected = [(r, c, platformer.TILE_PROPERTIES[tile])
+                    for r, row in enumerate(grid) for c, tile in enumerate(row)
+                    if platformer.TILE_PROPERTIES.get(tile) is not None
+                    and rect.colliderect(pygame.Rect(c * TILE, r * TILE, TILE, TILE))]
+        assert platformer.tiles_in_rect(grid, rect) == expected
+
+
+def test_player_lands_on_first_row_even_when_falling_fast():
+    grid = [[0] * 5 for _ in range(10)]
+    grid[6][2] = 3  # Lave
+    grid[8][2] = 1
+    player = platformer.Player(2 * TILE, 4 * TILE, 30, 40)
+    player.vel_y = 84  # Plus que la hauteur d'une case en une image : les pieds finissent sous la lave
+    player.apply_gravity()
+    player.check_collision(grid)
+    assert player.on_ground and player.rect.bottom == 6 * TILE
+    assert player.speed_multiplier == platformer.BLOCK_TYPES["lave"]["speed_multiplier"]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_merge_tiles_covers_each_tile_once(seed):
+    grid = random_level(seed)
+    if seed % 2:
+        # Grands aplats, pour que les rectangles s'étendent sur plusieurs lignes
+        grid = [[row[0]] * len(row) if r % 3 else row for r, row in enumerate(grid)]
+    covered = {}
+    for x, y, w, h, tile in platformer.merge_tiles(grid):
+        for r in range(y, y + h):
+            for c in range(x, x + w):
+                assert grid[r][c] == tile
+                assert (r, c) not in covered
+                covered[(r, c)] = tile
+    solid = {(r, c) for r, row in enumerate(grid) for c, tile in enumerate(row)
+             if platformer.TILE_PROPERTIES.get(tile) is not None}
+    assert set(covered) == solid
+
+
+def test_merge_tiles_merges_a_floor():
+    grid = [[0] * 6, [0, 1, 1, 1, 0, 0], [2] * 6, [2] * 6]
+    assert sorted(platformer.merge_tiles(grid)) == [(0, 2, 6, 2, 2), (1, 1, 3, 1, 1)]
+
+
+@pytest.mark.parametrize("offset", [(0, 0), (-130, 45), (613, 277), (1500, -300)])
+def test_static_layer_matches_drawing_each_platform(tmp_path, monkeypatch, offset):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    level = random_level(9, rows=30, cols=60)
+    path = tmp_path / "level.json"
+    path.write_text(json.dumps(level))
+    game = platformer.Game()
+    game.load_level(str(path))
+    game.camera_offset = list(offset)
+    game.draw()
+    expected = pygame.Surface(game.screen.get_size())
+    expected.fill(platformer.BACKGROUND)
+    for plat in game.platforms:
+        pygame.draw.rect(expected, plat.properties["color"], game.apply_camera(plat.rect))
+    pygame.draw.rect(expected, (255, 0, 0), game.apply_camera(game.player.rect))
+    assert (pygame.surfarray.array3d(game.screen) == pygame.surfarray.array3d(expected)).all()
+    pygame.quit()
@@ -0,0 +1,79 @@
+"""
+Tests du chronomètre des phases d'une image, avec une horloge simulée.
+"""
+import csv
+import json
+
+import numpy as np
+import pytest
+
+import profiler
+from profiler import Profiler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 0.0}
+    monkeypatch.setattr(profiler.time, "perf_counter", lambda: state["now"])
+    return state
+
+
+def frame(prof, clock, durations, **extra):
+    prof.start_frame()
+    for phase, seconds in durations:
+        clock["now"] += seconds
+        prof.mark(phase)
+    prof.end_frame(**extra)
+
+
+def test_disabled_measures_nothing(clock):
+    prof = Profiler()
+    frame(prof, clock, [("step", 0.01)])
+    assert prof.frames == 0 and prof.percentiles() == {}
+
+
+def test_percentiles_over_the_window(clock):
+    prof = Profiler(phases=("step", "draw"), window=100)
+    prof.enable()
+    for k in range(150):
+        # Deux marques pour la même phase s'additionnent
+        frame(prof, clock, [("step", 0.001 * (k % 100)), ("draw", 0.002), ("step", 0.001)])
+    result = prof.percentiles((0, 100))
+    assert prof.frames == 150
+    assert np.allclose(result["draw"], [2, 2])
+    assert np.allclose(result["step"], [1, 100])
+    assert np.allclose(result["total"], [3, 102])
+
+
+@pytest.mark.parametrize("name", ["frames.csv", "frames.jsonl"])
+def test_export(tmp_path, clock, name):
+    path = tmp_path / name
+    prof = Profiler(phases=("step", "draw"), path=path)
+    for k in range(3):
+        frame(prof, clock, [("step", 0.004), ("draw", 0.001)], generations=k)
+    prof.close()
+    if name.endswith(".csv"):
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+    else:
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [int(row["generations"]) for row in rows] == [0, 1, 2]
+    assert all(float(row["step"]) == 4.0 and float(row["draw"]) == 1.0 for row in rows)
+
+
+def test_enable_mid_frame(clock):
+    prof = Profiler(phases=("events", "step"))
+    clock["now"] = 4000.0  # Temps passé désactivé : ne doit compter nulle part
+    prof.start_frame()
+    clock["now"] += 0.003
+    prof.enable()  # Par exemple la touche F3, pendant la phase des événements
+    clock["now"] += 0.002
+    prof.mark("events")
+    clock["now"] += 0.005
+    prof.mark("step")
+    prof.end_frame()
+    result = prof.percentiles((100,))
+    assert np.allclose(result["events"], [2]) and np.allclose(result["step"], [5])
+    prof.enable(False)
+    frame(prof, clock, [("step", 0.01)])
+    assert prof.frames == 1
@@ -0,0 +1,99 @@
+"""
+Tests de l'affichage : l'image dessinée est comparée, pixel par pixel, à la couleur
+attendue de la cellule sous chaque pixel.
+"""
+import numpy as np
+import pygame
+import pytest
+
+from camera import Camera
+from grid import Grid
+from render import DirtyTracker, GridRenderer, visible_window
+from world import World
+
+ALIVE, DEAD = (0, 255, 0), (0, 0, 0)
+VIEW = (120, 90)
+
+
+def pixels(surface):
+    return pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+
+
+def expected_image(grid, cam):
+    """
+    Couleur de chaque pixel de la vue : celle de la cellule qui le contient (fond hors de la grille).
+    """
+    w, h = VIEW
+    ys, xs = np.mgrid[0:h, 0:w]
+    rows = np.floor((ys + cam.y) / cam.cell_size).astype(int)
+    cols = np.floor((xs + cam.x) / cam.cell_size).astype(int)
+    alive = np.array([[grid.get(r, c) if not grid.bounded or (0 <= r < grid.rows and 0 <= c < grid.cols) else 0
+                       for r, c in zip(row_r, row_c)] for row_r, row_c in zip(rows, cols)])
+    return np.where(alive[..., None] == 1, ALIVE, DEAD)
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+@pytest.mark.parametrize("x, y", [(0, 0), (13, 29), (500, 400)])
+def test_grid_image(size, x, y):
+    grid = Grid(80, 100, "numpy")
+    grid.randomize(0.4, 1)
+    cam = Camera(100, 80, *VIEW, size)
+    cam.x, cam.y = x, y
+    cam.clamp()
+    surface = pygame.Surface(VIEW)
+    surface.fill((1, 2, 3))
+    GridRenderer(ALIVE, DEAD).draw(surface, grid, cam)
+    view = pixels(surface)
+    expected = expected_image(grid, cam)
+    # Une grille plus petite que la vue laisse le fond intact autour d'elle
+    inside = np.zeros(view.shape[:2], dtype=bool)
+    inside[max(-int(cam.y), 0):int(grid.rows * size - cam.y), max(-int(cam.x), 0):int(grid.cols * size - cam.x)] = True
+    assert (view[inside] == expected[inside]).all()
+
+
+@pytest.mark.parametrize("x, y", [(-200, -150), (37, -11)])
+def test_world_image(x, y):
+    world = World(chunk=16)
+    world.randomize(0.4, 2, -40, -40, 40, 40)
+    cam = Camera(None, None, *VIEW, 4)
+    cam.x, cam.y = x, y
+    surface = pygame.Surface(VIEW)
+    GridRenderer(ALIVE, DEAD).draw(surface, world, cam)
+    assert (pixels(surface) == expected_image(world, cam)).all()
+
+
+def test_visible_window_is_clipped_to_the_grid():
+    grid = Grid(20, 30, "numpy")
+    cam = Camera(30, 20, *VIEW, 10)
+    cam.x, cam.y = 200, 150
+    r0, c0, window = visible_window(grid, cam)
+    assert (r0, c0) == (15, 20) and window.shape == (5, 10)
+
+
+@pytest.mark.parametrize("kind", ["grid", "world"])
+def test_dirty_rects_give_the_full_image(kind):
+    rng = np.random.default_rng(3)
+    if kind == "grid":
+        grid = Grid(60, 60, "numpy")
+        grid.randomize(0.3, 0)
+        cam = Camera(60, 60, *VIEW, 3)
+    else:
+        grid = World(chunk=16)
+        grid.randomize(0.3, 0, 0, 0, 40, 40)
+        cam = Camera(None, None, *VIEW, 3)
+    tracker = DirtyTracker(grid)
+    renderer, reference = GridRenderer(ALIVE, DEAD), GridRenderer(ALIVE, DEAD)
+    partial, full = pygame.Surface(VIEW), pygame.Surface(VIEW)
+    for k in range(40):
+        if k % 4 == 0:
+            grid.toggle(*rng.integers(0, 30, 2))  # Petite modification
+        elif k % 4 == 1:
+            grid.next_generation()
+        elif k % 4 == 2:
+            grid.paint(rng.integers(0, 30, 5), rng.integers(0, 40, 5))
+        if k % 10 == 9:
+            cam.move(7, 5)
+        rects = tracker.collect(grid, cam)
+        renderer.draw(partial, grid, cam, rects)
+        reference.draw(full, grid, cam)
+        assert (pixels(partial) == pixels(full)).all()
@@ -0,0 +1,65 @@
+"""
+Tests des règles B/S : la table compilée est comparée à la définition de la règle,
+et chaque moteur à un calcul naïf, cellule par cellule.
+"""
+import numpy as np
+import pytest
+
+from engines import ENGINES, make_engine
+from rules import RULES, Rule, parse_rule
+
+
+def naive_step(cells, births, survivals):
+    rows, cols = cells.shape
+    out = np.zeros_like(cells)
+    for r in range(rows):
+        for c in range(cols):
+            n = int(cells[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2].sum()) - int(cells[r, c])
+            out[r, c] = n in (survivals if cells[r, c] else births)
+    return out
+
+
+@pytest.mark.parametrize("text, births, survivals", [
+    ("B3/S23", {3}, {2, 3}),
+    ("b36/s23", {3, 6}, {2, 3}),
+    ("23/3", {3}, {2, 3}),
+    ("highlife", {3, 6}, {2, 3}),
+    ("B2/S", {2}, set()),
+    (" B3678 / S34678 ", {3, 6, 7, 8}, {3, 4, 6, 7, 8}),
+])
+def test_parse(text, births, survivals):
+    rule = parse_rule(text)
+    assert rule.births == births and rule.survivals == survivals
+    assert parse_rule(str(rule)) == rule
+
+
+@pytest.mark.parametrize("text", ["B9/S23", "B3S23", "conway2", ""])
+def test_invalid_rules(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+@pytest.mark.parametrize("name", sorted(RULES))
+def test_table_matches_definition(name):
+    rule = parse_rule(name)
+    cells = np.repeat(np.array([0, 1], dtype=np.uint8), 9)
+    n = np.tile(np.arange(9, dtype=np.uint8), 2)
+    expected = [int(k in (rule.survivals if s else rule.births)) for s, k in zip(cells, n)]
+    assert rule.apply(cells, n).tolist() == expected
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("name", ["highlife", "seeds", "daynight", "maze", "2x2"])
+def test_engines_match_naive_step(engine, name):
+    rule = parse_rule(name)
+    step = make_engine(engine, rule=rule)
+    cells = (np.random.default_rng(0).random((17, 23)) < 0.4).astype(np.uint8)
+    state = step.from_array(cells)
+    for _ in range(6):
+        cells = naive_step(cells, rule.births, rule.survivals)
+        state = step.step(state)
+        assert (np.asarray(state) == cells).all()
+
+
+def test_rules_are_hashable_values():
+    assert {Rule([3], [2, 3]), parse_rule("conway")} == {parse_rule("B3/S23")}
@@ -0,0 +1,73 @@
+"""
+Tests du rythme de la boucle de jeu, avec une horloge simulée.
+"""
+import pytest
+
+import scheduler
+from scheduler import MAX_SPEED, MIN_SPEED, Scheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counter:
+    def __init__(self, clock=None, cost=0.0):
+        self.generation = 0
+        self.clock, self.cost = clock, cost
+
+    def next_generation(self):
+        self.generation += 1
+        if self.clock is not None:
+            self.clock.now += self.cost
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler.time, "perf_counter", clock)
+    return clock
+
+
+@pytest.mark.parametrize("speed", [1, 10, 30, 600])
+def test_generations_follow_speed(clock, speed):
+    sched = Scheduler(fps=60, speed=speed)
+    grid = Counter()
+    for _ in range(120):  # Deux secondes
+        clock.now += 1 / 60
+        sched.run(grid, True)
+    assert abs(grid.generation - 2 * speed) <= 1
+
+
+def test_paused_does_not_accumulate(clock):
+    sched = Scheduler(fps=60, speed=100)
+    grid = Counter()
+    clock.now += 5
+    assert sched.run(grid, False) == 0
+    clock.now += 1 / 60
+    assert sched.run(grid, True) == 1
+
+
+def test_slow_generations_drop_the_backlog(clock):
+    sched = Scheduler(fps=60, speed=1000, budget=0.5)
+    grid = Counter(clock, cost=0.004)  # 4 ms par génération : 2 tiennent dans le budget (8,3 ms)
+    for _ in range(30):
+        clock.now += 1 / 60
+        done = sched.run(grid, True)
+        assert done <= 3
+    assert sched._due <= 1.0
+
+
+def test_speed_limits():
+    sched = Scheduler(speed=MAX_SPEED // 2)
+    sched.faster()
+    sched.faster()
+    assert sched.speed == MAX_SPEED
+    sched.speed = 3
+    for _ in range(5):
+        sched.slower()
+    assert sched.speed == MIN_SPEED
@@ -0,0 +1,43 @@
+"""
+Tests du remplissage aléatoire : reproductibilité, densités et profils.
+"""
+import numpy as np
+import pytest
+
+from grid import Grid
+from soups import linear_gradient, make_rng, radial_gradient, random_cells
+from world import World
+
+
+@pytest.mark.parametrize("density", [0, 0.1, 0.5, 0.9, 1])
+def test_density(density):
+    cells = random_cells(300, 300, density, seed=0)
+    assert cells.dtype == np.uint8 and set(np.unique(cells)) <= {0, 1}
+    assert abs(cells.mean() - density) < 0.01
+
+
+def test_same_seed_same_cells():
+    assert (random_cells(50, 60, 0.3, 4) == random_cells(50, 60, 0.3, 4)).all()
+    assert (random_cells(50, 60, 0.3, 4) != random_cells(50, 60, 0.3, 5)).any()
+    rng = make_rng(6)
+    assert make_rng(rng) is rng
+    # Un générateur enchaîne des tirages différents
+    assert (random_cells(20, 20, 0.5, rng) != random_cells(20, 20, 0.5, rng)).any()
+
+
+def test_profiles():
+    cells = random_cells(400, 400, linear_gradient(400, 400, 0, 1), seed=1)
+    assert cells[:, :40].mean() < 0.1 and cells[:, -40:].mean() > 0.9
+    cells = random_cells(400, 400, radial_gradient(400, 400, 1, 0), seed=1)
+    assert cells[180:220, 180:220].mean() > 0.9 and cells[:30, :30].mean() < 0.15
+
+
+def test_grid_and_world_use_the_same_soup():
+    grid = Grid(40, 50, "numpy")
+    grid.randomize(0.35, seed=3)
+    world = World()
+    world.randomize(0.35, 3, 0, 0, 40, 50)
+    assert (np.asarray(grid.cells) == world.window(0, 0, 40, 50)).all()
+    grid.soup(5, 5, 15, 25, 0.8, seed=9)
+    world.soup(5, 5, 15, 25, 0.8, seed=9)
+    assert (np.asarray(grid.cells) == world.window(0, 0, 40, 50)).all()
@@ -0,0 +1,42 @@
+"""
+Tests des statistiques tenues à jour (GridStats), comparées à un recomptage complet.
+"""
+import numpy as np
+import pytest
+
+from engines import ENGINES
+from grid import Grid
+
+
+def check(grid):
+    cells = np.asarray(grid.cells, dtype=np.uint8)
+    stats = grid.stats
+    assert stats.population == grid.population() == int(cells.sum())
+    assert (stats.row_counts == cells.sum(axis=1)).all()
+    assert (stats.col_counts == cells.sum(axis=0)).all()
+    rows, cols = np.nonzero(cells)
+    expected = None if len(rows) == 0 else (rows.min(), cols.min(), rows.max() + 1, cols.max() + 1)
+    assert grid.bounding_box() == expected
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_stats_follow_every_change(engine):
+    rng = np.random.default_rng(1)
+    grid = Grid(30, 40, engine)
+    grid.randomize(0.3, 0)
+    check(grid)
+    for k in range(40):
+        before = np.asarray(grid.cells, dtype=np.uint8).copy()
+        grid.next_generation()
+        after = np.asarray(grid.cells, dtype=np.uint8)
+        assert grid.stats.births == int(((after == 1) & (before == 0)).sum())
+        assert grid.stats.deaths == int(((after == 0) & (before == 1)).sum())
+        if k % 6 == 0:
+            grid.paste(rng.random((6, 9)) < 0.5, *rng.integers(-3, 35, 2), "xor")
+        if k % 9 == 0:
+            grid.paint(rng.integers(0, 30, 12), rng.integers(0, 40, 12), k % 2)
+        if k % 13 == 0:
+            grid.clear(0, 0, 30, 20)
+        check(grid)
+    grid.reset()
+    check(grid)
@@ -0,0 +1,98 @@
+"""
+Tests du monde sans bords (World), comparé à une grille (Grid) assez grande pour ne pas toucher ses bords.
+"""
+import numpy as np
+
+from cycles import CycleDetector
+from grid import Grid
+from history import History
+from world import World
+
+
+def test_world_matches_grid():
+    pattern = np.random.default_rng(3).random((30, 30)) < 0.4
+    world = World(chunk=16)
+    world.paste(pattern, -5, -7)
+    grid = Grid(200, 200, "numpy", "B3/S23")
+    grid.paste(pattern, 95, 93)
+    for _ in range(40):
+        world.next_generation()
+        grid.next_generation()
+    assert (world.window(-100, -100, 100, 100) == np.asarray(grid.cells)).all()
+    assert world.population() == grid.population()
+
+
+def test_empty_world_step_is_recorded():
+    world = World()
+    world.toggle(0, 0)
+    history = History(world)
+    detector = CycleDetector(world)
+    world.next_generation()  # La cellule seule meurt
+    world.next_generation()  # Monde vide
+    world.next_generation()
+    assert world.generation == 3
+    assert detector.found == ("extinction",)
+    assert len(history.entries) == 3  # Une entrée par génération, même vide
+    assert history.step_back()
+    assert world.generation == 2 and world.population() == 0
+    history.seek(0)
+    assert world.get(0, 0) == 1
+    history.seek(3)
+    assert world.generation == 3 and world.population() == 0
+
+
+def exact_box(world):
+    """
+    Boîte englobante des cellules vivantes, calculée en parcourant toutes les cellules.
+    """
+    if not world.chunks:
+        return None
+    c = world.chunk
+    top, left = min(ci for ci, _ in world.chunks) * c, min(cj for _, cj in world.chunks) * c
+    bottom, right = (max(ci for ci, _ in world.chunks) + 1) * c, (max(cj for _, cj in world.chunks) + 1) * c
+    rows, cols = np.nonzero(world.window(top, left, bottom, right))
+    return top + rows.min(), left + cols.min(), top + rows.max() + 1, left + cols.max() + 1
+
+
+def test_stats_follow_every_change():
+    rng = np.random.default_rng(5)
+    world = World(chunk=16)
+    world.paste(rng.random((20, 20)) < 0.4, -10, -10)
+    stats = world.stats
+    for k in range(60):
+        if k % 7 == 0:
+            world.paste(rng.random((5, 5)) < 0.5, *rng.integers(-40, 40, 2), "xor")
+        if k % 11 == 0:
+            world.paint(rng.integers(-30, 30, 10), rng.integers(-30, 30, 10), k % 2)
+        if k % 13 == 0:
+            world.toggle(*rng.integers(-50, 50, 2))
+        world.next_generation()
+        assert world.population() == stats.population == sum(int(b.sum()) for b in world.chunks.values())
+        assert world.bounding_box() == exact_box(world)
+    world.advance(1000)
+    assert world.population() == len(world.alive())
+    assert world.bounding_box() == exact_box(world)
+    world.reset()
+    assert world.population() == 0 and world.bounding_box() is None
+
+
+def test_stats_stay_small_when_gliders_travel_far():
+    world = World()
+    glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    world.paste(glider, 0, 0)
+    world.paste(glider[::-1, ::-1], -20, -20)
+    stats = world.stats
+    world.advance(4 * 10 ** 6)
+    top, left, bottom, right = world.bounding_box()
+    assert (bottom - top, right - left) == (2 * 10 ** 6 + 23, 2 * 10 ** 6 + 23)
+    assert len(stats.rows) == len(stats.cols) == 6
+    assert world.population() == 10
+
+
+def test_advance_notifies_the_new_box():
+    world = World()
+    world.paste(np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8), 0, 0)
+    regions = []
+    world.listeners.append(lambda *box: regions.append(box))
+    world.advance(8)  # Le planeur s'est déplacé de (2, 2)
+    assert regions == [(0, 0, 3, 3), (2, 2, 5, 5)]
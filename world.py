@@ -0,0 +1,484 @@
+import numpy as np
+
+from engines import make_engine
+from grid import paste_mode
+from soups import random_cells
+from rules import parse_rule
+
+CHUNK = 64          # Côté d'un morceau de monde en cellules
+DEFAULT_SIZE = 100  # Côté de la zone remplie par randomize par défaut
+
+# Voisins d'un morceau : (décalage de morceau, tranche lue dans le voisin, tranche écrite dans le bloc)
+# Le bloc d'un morceau fait chunk + 2 cellules de côté : le morceau au centre, ses voisins autour
+_SIDE = {-1: 0, 0: slice(None), 1: -1}  # Bord d'un morceau tourné vers le voisin -1, 0 ou 1
+
+_EDGES = [
+    ((-1, -1), (-1, -1), (0, 0)),
+    ((-1, 0), (-1, slice(None)), (0, slice(1, -1))),
+    ((-1, 1), (-1, 0), (0, -1)),
+    ((0, -1), (slice(None), -1), (slice(1, -1), 0)),
+    ((0, 1), (slice(None), 0), (slice(1, -1), -1)),
+    ((1, -1), (0, -1), (-1, 0)),
+    ((1, 0), (0, slice(None)), (-1, slice(1, -1))),
+    ((1, 1), (0, 0), (-1, -1)),
+]
+
+
+def flat_index(rows, cols):
+    """
+    Retourne l'indice à plat des cellules (rows, cols) du monde sans bords :
+    la ligne dans les 32 bits de poids fort, la colonne dans les 32 bits de poids faible.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    return (rows << 32) | (cols & 0xFFFFFFFF)
+
+
+def split_index(index):
+    """
+    Inverse de flat_index : retourne (lignes, colonnes) des indices à plat donnés.
+    """
+    index = np.asarray(index, dtype=np.int64)
+    return index >> 32, (index << 32) >> 32  # Décalage arithmétique : garde le signe de la colonne
+
+
+def _recount(keys, counts, added, removed):
+    """
+    Met à jour des comptes creux : keys (triées) et counts, les comptes non nuls de chaque clé,
+    après l'ajout des clés added et le retrait des clés removed (une unité par occurrence).
+    Retourne (clés, comptes), sans les clés dont le compte tombe à 0.
+    """
+    merged = np.concatenate((keys, added, removed))
+    weights = np.concatenate((counts, np.ones(len(added), dtype=np.int64), -np.ones(len(removed), dtype=np.int64)))
+    keys, inverse = np.unique(merged, return_inverse=True)
+    counts = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(keys)).astype(np.int64)
+    keep = counts != 0
+    return keys[keep], counts[keep]
+
+
+class WorldStats:
+    """
+    Statistiques d'un monde sans bords (World), abonnées à ses changements, comme GridStats :
+    - population : nombre de cellules vivantes
+    - rows, row_counts : lignes qui contiennent des cellules vivantes (triées) et leur nombre de cellules
+    - cols, col_counts : de même pour les colonnes
+    - box : boîte englobante (top, left, bottom, right) des cellules vivantes, None si le monde est vide
+    - births, deaths : naissances et morts de la dernière génération calculée
+    Les comptes sont creux (seules les lignes et colonnes vivantes sont gardées) : leur taille
+    ne dépend pas de la distance parcourue par les vaisseaux.
+    """
+
+    def __init__(self, world):
+        """
+        Compte une fois les cellules du monde, puis suit ses changements.
+        """
+        rows, cols = split_index(world.alive())
+        self.rows, self.row_counts = np.unique(rows, return_counts=True)
+        self.cols, self.col_counts = np.unique(cols, return_counts=True)
+        self.population = len(rows)
+        self.births = 0
+        self.deaths = 0
+        self.box = None
+        self._update_box()
+        world.cell_listeners.append(self.cells_changed)
+
+    def cells_changed(self, born, died, step):
+        """
+        Met à jour les statistiques avec les cellules nées et mortes (appelé par le monde).
+        """
+        if step:
+            self.births, self.deaths = len(born), len(died)
+        if len(born) == 0 and len(died) == 0:
+            return
+        born_rows, born_cols = split_index(born)
+        died_rows, died_cols = split_index(died)
+        self.rows, self.row_counts = _recount(self.rows, self.row_counts, born_rows, died_rows)
+        self.cols, self.col_counts = _recount(self.cols, self.col_counts, born_cols, died_cols)
+        self.population += len(born) - len(died)
+        self._update_box()
+
+    def _update_box(self):
+        """
+        Recalcule la boîte englobante à partir des lignes et colonnes vivantes.
+        """
+        if self.population == 0:
+            self.box = None
+        else:
+            self.box = (int(self.rows[0]), int(self.cols[0]), int(self.rows[-1]) + 1, int(self.cols[-1]) + 1)
+
+
+class World:
+    """
+    Monde du Jeu de la vie sans bords.
+    Le plan est découpé en morceaux de chunk x chunk cellules, rangés dans un dictionnaire
+    (ligne de morceau, colonne de morceau) -> tableau uint8. Seuls les morceaux qui
+    contiennent des cellules vivantes existent : ils sont créés quand une cellule y naît
+    et supprimés quand ils se vident. Le calcul, l'affichage et le dessin ne parcourent
+    que ces morceaux : un planeur peut voyager indéfiniment pour le prix d'un seul morceau.
+    Même interface que Grid (toggle, paste, next_generation, advance, listeners...),
+    les coordonnées des cellules pouvant être négatives.
+    """
+    bounded = False  # Pas de bords
+
+    def __init__(self, rule="B3/S23", chunk=CHUNK):
+        """
+        - rule : règle de l'automate (les règles avec B0 ne sont pas possibles sur un plan infini)
+        - chunk : côté d'un morceau en cellules
+        """
+        self.rule = parse_rule(rule)
+        if 0 in self.rule.births:
+            raise ValueError(f"Un monde sans bords ne gère pas les règles avec B0 : {self.rule}")
+        self.chunk = chunk
+        self.listeners = []       # Comme Grid.listeners
+        self.cell_listeners = []  # Comme Grid.cell_listeners, avec les indices de flat_index
+        self._jumper = None       # Moteur HashLife, créé au premier saut
+        self._stats = None        # Statistiques tenues à jour, créées à la première lecture (voir stats)
+        self.generation = 0
+        self.chunks = {}
+
+    def reset(self):
+        """
+        Vide le monde.
+        """
+        died = self.alive()
+        box = self.bounding_box()
+        self.chunks = {}
+        self.generation = 0
+        if box is not None:
+            self._notify(*box)
+        self._notify_cells(died[:0], died, False)
+
+    def randomize(self, prob=0.2, seed=None, top=0, left=0, bottom=DEFAULT_SIZE, right=DEFAULT_SIZE):
+        """
+        Vide le monde puis remplit la zone [top, bottom) x [left, right) aléatoirement.
+        - prob : probabilité qu'une cellule soit vivante (entre 0 et 1), ou profil de densité
+        - seed : graine ou générateur NumPy ; la même graine redonne le même monde
+        """
+        self.reset()
+        self.soup(top, left, bottom, right, prob, seed)
+
+    def soup(self, top, left, bottom, right, prob=0.5, seed=None):
+        """
+        Remplit aléatoirement la zone [top, bottom) x [left, right) seulement ("soupe"),
+        le reste du monde étant gardé. prob et seed : comme pour randomize.
+        """
+        cells = random_cells(max(bottom - top, 0), max(right - left, 0), prob, seed)
+        self.paste(cells, top, left, "replace")
+
+    def get(self, r, c):
+        """
+        Retourne l'état (0 ou 1) de la cellule (r, c).
+        """
+        block = self.chunks.get((r // self.chunk, c // self.chunk))
+        return 0 if block is None else int(block[r % self.chunk, c % self.chunk])
+
+    def toggle(self, r, c, value=None):
+        """
+        Change l'état d'une cellule (vivante/morte).
+        - Si value est None : inverse l'état (vivant <-> mort).
+        - Si value vaut 0 ou 1 : force la cellule à cette valeur.
+        """
+        old = self.get(r, c)
+        new = 1 - old if value is None else int(value)
+        if new == old:
+            return
+        key = (r // self.chunk, c // self.chunk)
+        block = self.chunks.get(key)
+        if block is None:
+            block = self.chunks[key] = np.zeros((self.chunk, self.chunk), dtype=np.uint8)
+        block[r % self.chunk, c % self.chunk] = new
+        if not new and not block.any():
+            del self.chunks[key]  # Morceau vide : on le libère
+        self._notify(r, c, r + 1, c + 1)
+        index = flat_index([r], [c])
+        self._notify_cells(index if new else index[:0], index[:0] if new else index, False)
+
+    def paste(self, pattern, top=0, left=0, mode="or"):
+        """
+        Colle un motif (tableau 2D de 0/1) dans le monde, son coin haut-gauche en (top, left).
+        - mode : "or" = ajoute les cellules vivantes du motif, "xor" = inverse les cellules
+          sous les cellules vivantes du motif, "replace" = remplace la zone par le motif
+        """
+        op = paste_mode(mode)
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        h, w = pattern.shape
+        if h == 0 or w == 0:
+            return
+        before = self.window(top, left, top + h, left + w) if self.cell_listeners else None
+        self._paste(pattern, top, left, op)
+        self._notify(top, left, top + h, left + w)
+        if before is not None:
+            after = self.window(top, left, top + h, left + w)
+            a, b = np.nonzero(before != after)
+            index = flat_index(a + top, b + left)
+            alive = after[a, b] == 1
+            self._notify_cells(index[alive], index[~alive], False)
+
+    def _paste(self, pattern, top, left, op=np.bitwise_or):
+        """
+        Combine le motif avec les morceaux qu'il recouvre, sans prévenir personne.
+        Les morceaux ne sont créés que si le motif y apporte des cellules vivantes,
+        et sont libérés s'ils se vident.
+        """
+        h, w = pattern.shape
+        c = self.chunk
+        for ci in range(top // c, (top + h - 1) // c + 1):
+            for cj in range(left // c, (left + w - 1) // c + 1):
+                # Partie du motif qui tombe dans le morceau (ci, cj)
+                r0, r1 = max(ci * c, top), min((ci + 1) * c, top + h)
+                c0, c1 = max(cj * c, left), min((cj + 1) * c, left + w)
+                part = pattern[r0 - top:r1 - top, c0 - left:c1 - left]
+                block = self.chunks.get((ci, cj))
+                if block is None:
+                    if not part.any():
+                        continue
+                    block = self.chunks[(ci, cj)] = np.zeros((c, c), dtype=np.uint8)
+                region = block[r0 - ci * c:r1 - ci * c, c0 - cj * c:c1 - cj * c]
+                region[...] = op(region, part)
+                if not block.any():
+                    del self.chunks[(ci, cj)]  # Morceau vide : on le libère
+
+    def fill(self, top, left, bottom, right, value=1):
+        """
+        Met toutes les cellules de la zone [top, bottom) x [left, right) à value (1 = vivantes).
+        """
+        shape = (max(bottom - top, 0), max(right - left, 0))
+        self.paste(np.broadcast_to(np.uint8(value), shape), top, left, "replace")
+
+    def clear(self, top, left, bottom, right):
+        """
+        Tue toutes les cellules de la zone [top, bottom) x [left, right).
+        """
+        self.fill(top, left, bottom, right, 0)
+
+    def copy(self, top, left, bottom, right):
+        """
+        Retourne une copie des cellules de la zone [top, bottom) x [left, right) (tableau uint8).
+        À recoller avec paste.
+        """
+        return self.window(top, left, bottom, right)
+
+    def paint(self, rows, cols, value=1):
+        """
+        Met à value les cellules données par leurs lignes et colonnes (par exemple un trait
+        de souris, voir grid.line_cells), en une seule opération.
+        """
+        index = flat_index(rows, cols)
+        if value:
+            self.set_cells(index, index[:0])
+        else:
+            self.set_cells(index[:0], index)
+
+    def set_cells(self, born, died):
+        """
+        Rend vivantes les cellules born et mortes les cellules died (indices à plat, voir flat_index).
+        Seules les cellules qui changent vraiment sont signalées.
+        """
+        index = np.concatenate((np.asarray(born, dtype=np.int64), np.asarray(died, dtype=np.int64)))
+        if len(index) == 0:
+            return
+        values = np.zeros(len(index), dtype=np.uint8)
+        values[:len(born)] = 1
+        rows, cols = split_index(index)
+        c = self.chunk
+        keys, group = np.unique(np.stack((rows // c, cols // c), axis=1), axis=0, return_inverse=True)
+        group = group.reshape(-1)
+        order = np.argsort(group, kind='stable')
+        bounds = np.searchsorted(group[order], np.arange(len(keys) + 1))
+        changed = []
+        for g, (ci, cj) in enumerate(keys.tolist()):
+            part = order[bounds[g]:bounds[g + 1]]
+            block = self.chunks.get((ci, cj))
+            if block is None:
+                block = np.zeros((c, c), dtype=np.uint8)
+            a, b = rows[part] % c, cols[part] % c
+            changed.append(part[block[a, b] != values[part]])
+            block[a, b] = values[part]
+            if block.any():
+                self.chunks[(ci, cj)] = block
+            else:
+                self.chunks.pop((ci, cj), None)  # Morceau vide : on le libère
+        self._notify(int(rows.min()), int(cols.min()), int(rows.max()) + 1, int(cols.max()) + 1)
+        changed = np.concatenate(changed)
+        alive = values[changed] == 1
+        self._notify_cells(index[changed][alive], index[changed][~alive], False)
+
+    def window(self, top, left, bottom, right):
+        """
+        Retourne les cellules de la zone [top, bottom) x [left, right) (nouveau tableau uint8).
+        Seuls les morceaux existants qui touchent la zone sont recopiés.
+        """
+        out = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint8)
+        if out.size == 0:
+            return out
+        c = self.chunk
+        ci0, ci1 = top // c, (bottom - 1) // c + 1
+        cj0, cj1 = left // c, (right - 1) // c + 1
+        if (ci1 - ci0) * (cj1 - cj0) <= len(self.chunks):
+            keys = [(ci, cj) for ci in range(ci0, ci1) for cj in range(cj0, cj1) if (ci, cj) in self.chunks]
+        else:
+            keys = [(ci, cj) for ci, cj in self.chunks if ci0 <= ci < ci1 and cj0 <= cj < cj1]
+        for ci, cj in keys:
+            r0, r1 = max(ci * c, top), min((ci + 1) * c, bottom)
+            c0, c1 = max(cj * c, left), min((cj + 1) * c, right)
+            out[r0 - top:r1 - top, c0 - left:c1 - left] = \
+                self.chunks[(ci, cj)][r0 - ci * c:r1 - ci * c, c0 - cj * c:c1 - cj * c]
+        return out
+
+    @property
+    def stats(self):
+        """
+        Statistiques du monde (population, boîte englobante, naissances et morts, voir WorldStats),
+        tenues à jour à chaque changement à partir de la première lecture.
+        """
+        if self._stats is None:
+            self._stats = WorldStats(self)
+        return self._stats
+
+    def bounding_box(self):
+        """
+        Retourne la boîte englobante (top, left, bottom, right) des cellules vivantes,
+        None si le monde est vide.
+        """
+        return self.stats.box
+
+    def alive(self):
+        """
+        Retourne les indices à plat (voir flat_index) des cellules vivantes.
+        """
+        parts = []
+        for (ci, cj), block in self.chunks.items():
+            a, b = np.nonzero(block)
+            parts.append(flat_index(a + ci * self.chunk, b + cj * self.chunk))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def population(self):
+        """
+        Retourne le nombre de cellules vivantes (sans parcourir les morceaux si les statistiques sont suivies).
+        """
+        if self._stats is not None:
+            return self._stats.population
+        return sum(int(np.count_nonzero(block)) for block in self.chunks.values())
+
+    def next_generation(self):
+        """
+        Calcule la prochaine génération.
+        Sont recalculés les morceaux existants, plus les morceaux voisins vers lesquels
+        des cellules vivantes touchent le bord (des cellules peuvent y naître).
+        Chaque morceau est lu avec une bordure d'une cellule prise dans ses voisins,
+        puis tous les morceaux sont calculés ensemble en une seule passe vectorisée.
+        """
+        if not self.chunks:
+            # Monde vide : rien ne change, mais c'est une génération comme une autre
+            empty = np.zeros(0, dtype=np.int64)
+            self._notify_cells(empty, empty, True)
+            self.generation += 1
+            return
+        resident = list(self.chunks)
+        stack = np.stack([self.chunks[key] for key in resident])
+        count = len(resident)
+        keys = list(resident)
+        position = {key: k for k, key in enumerate(keys)}
+        for (di, dj), _, _ in _EDGES:
+            # Des cellules peuvent naître chez le voisin si notre bord tourné vers lui est vivant
+            border = stack[:, _SIDE[di], _SIDE[dj]].reshape(count, -1)
+            for k in np.flatnonzero(border.any(axis=1)):
+                ci, cj = resident[k]
+                key = (ci + di, cj + dj)
+                if key not in position:
+                    position[key] = len(keys)
+                    keys.append(key)
+
+        # Blocs de chunk + 2 cellules de côté : le morceau (s'il existe) et la bordure de ses voisins
+        c = self.chunk
+        blocks = np.zeros((len(keys), c + 2, c + 2), dtype=np.uint8)
+        blocks[:count, 1:-1, 1:-1] = stack
+        for (di, dj), source, target in _EDGES:
+            pairs = [(k, position.get((ci + di, cj + dj), count)) for k, (ci, cj) in enumerate(keys)]
+            pairs = np.array([pair for pair in pairs if pair[1] < count], dtype=np.intp).reshape(-1, 2)
+            blocks[(pairs[:, 0],) + target] = stack[(pairs[:, 1],) + source]
+        old = blocks[:, 1:-1, 1:-1]
+        n = (blocks[:, :-2, :-2] + blocks[:, :-2, 1:-1] + blocks[:, :-2, 2:] +
+             blocks[:, 1:-1, :-2]                      + blocks[:, 1:-1, 2:] +
+             blocks[:, 2:, :-2]  + blocks[:, 2:, 1:-1]  + blocks[:, 2:, 2:])
+        new = self.rule.apply(old, n)
+
+        # Les morceaux vides sont libérés
+        self.chunks = {keys[k]: new[k] for k in np.flatnonzero(new.any(axis=(1, 2)))}
+        if self.cell_listeners:
+            k, a, b = np.nonzero(old != new)
+            origin = np.array(keys, dtype=np.int64).reshape(-1, 2) * c
+            index = flat_index(origin[k, 0] + a, origin[k, 1] + b)
+            alive = new[k, a, b] == 1
+            self._notify_cells(index[alive], index[~alive], True)
+        self.generation += 1
+        ci = [key[0] for key in keys]
+        cj = [key[1] for key in keys]
+        self._notify(min(ci) * c, min(cj) * c, (max(ci) + 1) * c, (max(cj) + 1) * c)
+
+    def advance(self, n, engine=None):
+        """
+        Avance de n générations d'un coup.
+        - engine : moteur (ou nom de moteur) à utiliser pour le saut, par défaut HashLife.
+        Avec HashLife, le motif est construit et relu morceau par morceau et avancé sur un plan infini :
+        rien n'est perdu, même si le motif s'étend très loin.
+        """
+        if engine is None:
+            if self._jumper is None:
+                self._jumper = make_engine("hashlife", rule=self.rule)
+            engine = self._jumper
+        jumper = make_engine(engine, rule=self.rule)
+        universe = getattr(jumper, "universe", None)
+        if universe is None:
+            for _ in range(n):
+                self.next_generation()
+            return
+        box = self.bounding_box()
+        if box is None:
+            self.generation += n
+            return
+        before = self.alive() if self.cell_listeners else None
+        # Un noeud par morceau (ou par carré de côté puissance de 2 si chunk n'en est pas une) :
+        # le carré englobant du motif n'est jamais alloué, il peut être immense après un saut
+        chunk = self.chunk
+        size = chunk & -chunk
+        level = size.bit_length() - 1
+        parts = {}
+        for (ci, cj), block in self.chunks.items():
+            for i in range(0, chunk, size):
+                for j in range(0, chunk, size):
+                    part = block[i:i + size, j:j + size]
+                    if part.any():
+                        parts[((ci * chunk + i) // size, (cj * chunk + j) // size)] = part
+        root, top, left = universe.build_blocks(parts, level)
+        root, top, left = universe.advance(root, top, left, n)
+        self.chunks = {}
+        for r, c, block in universe.blocks(root, top, left, level):
+            self._paste(block, r, c)
+        self.generation += n
+        if before is not None:
+            after = self.alive()
+            self._notify_cells(np.setdiff1d(after, before), np.setdiff1d(before, after), False)
+        self._notify(*box)
+        after_box = self.bounding_box()  # Lue après la mise à jour des statistiques
+        if after_box is not None:
+            self._notify(*after_box)
+
+    def close(self):
+        """
+        Rien à libérer (même interface que Grid).
+        """
+
+    def _notify(self, top, left, bottom, right):
+        """
+        Prévient les fonctions de self.listeners que la zone [top, bottom) x [left, right) a changé.
+        """
+        for listener in self.listeners:
+            listener(top, left, bottom, right)
+
+    def _notify_cells(self, born, died, step):
+        """
+        Prévient les fonctions de self.cell_listeners des naissances et des morts.
+        """
+        for listener in self.cell_listeners:
+            listener(born, died, step)